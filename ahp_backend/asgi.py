@@ -3,6 +3,9 @@ ASGI config for ahp_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Under ASGI, set ``DB_POOL=true`` so requests borrow PostgreSQL connections
+from the in-process pool instead of opening one per request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -68,6 +68,7 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.common.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -106,10 +107,42 @@ WSGI_APPLICATION = 'ahp_backend.wsgi.application'
 # DATABASE_URL must be set in environment variables or .env file
 database_url = config('DATABASE_URL')
 
+# Persistent connections: reuse a connection for DB_CONN_MAX_AGE seconds (0 = close after each request)
+# and verify it with a cheap query before reuse after errors / between requests.
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
 DATABASES = {
-    'default': dj_database_url.parse(database_url)
+    'default': dj_database_url.parse(
+        database_url,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+    )
 }
 
+# Optional in-process connection pool (apps.common.db_backends.postgresql_pool), e.g. for the ASGI
+# server where Django connections are not kept across requests. Connections are returned to the pool
+# at the end of each request instead of being kept per thread.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+if DB_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['ENGINE'] = 'apps.common.db_backends.postgresql_pool'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['POOL'] = {
+        'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        'timeout': config('DB_POOL_TIMEOUT', default=10.0, cast=float),
+    }
+
+# Cache: throttle windows and cached stats. Without REDIS_URL each worker process has its own
+# local-memory cache (per-worker rate limits); REDIS_URL shares them (redis client in requirements.txt).
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -172,6 +205,13 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'apps.common.throttling.APIKeyRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        # ScopedSlidingWindowThrottle (views with throttle_scope)
+        'analysis': config('ANALYSIS_THROTTLE_RATE', default='60/min'),
+    },
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
@@ -183,7 +223,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.common.renderers.FastJSONRenderer',
     ],
 }
 
@@ -234,6 +274,47 @@ CORS_ALLOW_HEADERS = [
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 
+# Bulk invitation delivery (apps.evaluations.tasks)
+INVITATION_BASE_URL = config('INVITATION_BASE_URL', default='https://aebonlee.github.io')
+INVITATION_EMAIL_BATCH_SIZE = config('INVITATION_EMAIL_BATCH_SIZE', default=100, cast=int)
+INVITATION_EMAIL_RATE_LIMIT = config('INVITATION_EMAIL_RATE_LIMIT', default=50, cast=float)  # messages per second, 0 = unlimited
+INVITATION_EMAIL_MAX_RETRIES = config('INVITATION_EMAIL_MAX_RETRIES', default=5, cast=int)
+INVITATION_EMAIL_RETRY_BASE_SECONDS = config('INVITATION_EMAIL_RETRY_BASE_SECONDS', default=60, cast=int)
+INVITATION_EMAIL_RETRY_MAX_SECONDS = config('INVITATION_EMAIL_RETRY_MAX_SECONDS', default=6 * 60 * 60, cast=int)
+# How long a claimed email row (bulk send or retry) is hidden from other workers while it is being sent
+INVITATION_EMAIL_RETRY_LEASE_SECONDS = config('INVITATION_EMAIL_RETRY_LEASE_SECONDS', default=10 * 60, cast=int)
+# Resend due retries from a background thread of each web worker (or run `manage.py process_email_retries --loop`)
+INVITATION_EMAIL_RETRY_SCHEDULER = config('INVITATION_EMAIL_RETRY_SCHEDULER', default=False, cast=bool)
+INVITATION_EMAIL_RETRY_INTERVAL_SECONDS = config('INVITATION_EMAIL_RETRY_INTERVAL_SECONDS', default=30.0, cast=float)
+
+# Worker startup (apps.common.startup)
+# Schema changes run in the pre-deploy step `manage.py migrate_locked`; set true to restore per-process auto-migration
+AUTO_MIGRATE_ON_STARTUP = config('AUTO_MIGRATE_ON_STARTUP', default=False, cast=bool)
+MIGRATION_LOCK_ID = config('MIGRATION_LOCK_ID', default=4_247_001, cast=int)  # pg_advisory_lock key
+WARM_URLCONF_ON_STARTUP = config('WARM_URLCONF_ON_STARTUP', default=True, cast=bool)
+
+# Request instrumentation (apps.common.middleware.RequestMetricsMiddleware, /metrics)
+REQUEST_METRICS_SAMPLE_RATE = config('REQUEST_METRICS_SAMPLE_RATE', default=1.0, cast=float)  # 0 = off
+REQUEST_METRICS_SERVER_TIMING = config('REQUEST_METRICS_SERVER_TIMING', default=False, cast=bool)  # staff users only (everyone under DEBUG)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# API usage counters (apps.common.usage), flushed with F() increments
+API_USAGE_FLUSH_INTERVAL_SECONDS = config('API_USAGE_FLUSH_INTERVAL_SECONDS', default=10.0, cast=float)
+API_USAGE_BACKGROUND_FLUSH = config('API_USAGE_BACKGROUND_FLUSH', default=True, cast=bool)  # false = flush() only
+
+# Activity log pipeline (apps.common.activity); prune with `manage.py prune_activity_logs`
+ACTIVITY_LOG_ASYNC = config('ACTIVITY_LOG_ASYNC', default=True, cast=bool)  # false = INSERT inside the request
+ACTIVITY_LOG_BATCH_SIZE = config('ACTIVITY_LOG_BATCH_SIZE', default=200, cast=int)
+ACTIVITY_LOG_FLUSH_INTERVAL_MS = config('ACTIVITY_LOG_FLUSH_INTERVAL_MS', default=1000, cast=int)
+ACTIVITY_LOG_BUFFER_SIZE = config('ACTIVITY_LOG_BUFFER_SIZE', default=10000, cast=int)  # entries beyond this are dropped
+ACTIVITY_LOG_BACKGROUND_WRITER = config('ACTIVITY_LOG_BACKGROUND_WRITER', default=True, cast=bool)  # false = write on flush() only
+ACTIVITY_LOG_RETENTION_DAYS = config('ACTIVITY_LOG_RETENTION_DAYS', default=90, cast=int)
+
+# Subscription statistics (apps.subscriptions.stats)
+SUBSCRIPTION_STATS_CACHE_SECONDS = config('SUBSCRIPTION_STATS_CACHE_SECONDS', default=60, cast=int)  # 0 = no cache
+# true = revenue from the monthly_revenue rollup kept by payment signals; run `manage.py rebuild_revenue_rollup` after enabling
+SUBSCRIPTION_REVENUE_ROLLUP = config('SUBSCRIPTION_REVENUE_ROLLUP', default=False, cast=bool)
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -3,13 +3,38 @@ WSGI config for ahp_backend project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
 
+Each worker process imports this module once; the time from here until the
+application (and, with WARM_URLCONF_ON_STARTUP, the URLconf) is loaded is
+logged as the worker's cold start. No schema work happens at import. With
+INVITATION_EMAIL_RETRY_SCHEDULER each worker also polls for due invitation
+email retries on a daemon thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 """
 
 import os
-from django.core.wsgi import get_wsgi_application
+import time
+
+_started = time.perf_counter()
+
+from django.conf import settings  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ahp_backend.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+from apps.common import startup  # noqa: E402
+
+_django_seconds = time.perf_counter() - _started
+startup.record_worker_ready(
+    _started,
+    _django_seconds,
+    startup.warm_up() if settings.WARM_URLCONF_ON_STARTUP else None,
+)
+
+if settings.INVITATION_EMAIL_RETRY_SCHEDULER:
+    from apps.evaluations.tasks import start_retry_scheduler  # noqa: E402
+
+    start_retry_scheduler()
@@ -216,22 +216,16 @@ class EvaluatorStatsSerializer(serializers.Serializer):
     
     def to_representation(self, user):
         """Build evaluator statistics"""
-        from apps.evaluations.models import Evaluation, EvaluationInvitation
+        from apps.evaluations.stats import get_evaluator_stats
         
-        evaluations = Evaluation.objects.filter(evaluator=user)
+        stats = get_evaluator_stats(user)
         
         return {
-            'total_evaluations': evaluations.count(),
-            'completed_evaluations': evaluations.filter(status='completed').count(),
-            'active_evaluations': evaluations.filter(status__in=['pending', 'in_progress']).count(),
-            'pending_invitations': EvaluationInvitation.objects.filter(
-                evaluator=user, status='pending'
-            ).count(),
-            'average_consistency': evaluations.filter(
-                consistency_ratio__isnull=False
-            ).aggregate(
-                avg=models.Avg('consistency_ratio')
-            )['avg'] or 0.0,
-            'total_projects': evaluations.values('project').distinct().count(),
+            'total_evaluations': stats['total_evaluations'],
+            'completed_evaluations': stats['completed_evaluations'],
+            'active_evaluations': stats['active_evaluations'],
+            'pending_invitations': stats['pending_invitations'],
+            'average_consistency': stats['average_consistency'],
+            'total_projects': stats['total_projects'],
             'recent_activity': []  # TODO: Implement recent activity tracking
         }
\ No newline at end of file
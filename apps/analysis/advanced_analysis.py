@@ -3,12 +3,12 @@ Advanced AHP Analysis Module
 고급 분석 알고리즘 및 통계적 검증
 """
 import numpy as np
-from scipy import stats
 from typing import Dict, List, Tuple, Optional
-import pandas as pd
 from dataclasses import dataclass
 import json
 
+from .clustering import cluster_evaluators
+
 
 @dataclass
 class SensitivityResult:
@@ -30,6 +30,7 @@ class GroupConsensusResult:
     outliers: List[str]
     weighted_priorities: np.ndarray
     confidence_interval: Tuple[float, float]
+    clusters: Optional[Dict] = None
 
 
 class AdvancedAHPAnalyzer:
@@ -103,7 +104,9 @@ class AdvancedAHPAnalyzer:
     def group_decision_integration(self, 
                                   individual_matrices: List[np.ndarray],
                                   aggregation_method: str = "geometric_mean",
-                                  weights: List[float] = None) -> GroupConsensusResult:
+                                  weights: List[float] = None,
+                                  evaluator_ids: List[str] = None,
+                                  cluster_scope: Tuple[str, str] = None) -> GroupConsensusResult:
         """
         그룹 의사결정 통합
         
@@ -111,6 +114,8 @@ class AdvancedAHPAnalyzer:
             individual_matrices: 개인별 쌍대비교 행렬 리스트
             aggregation_method: 통합 방법 (geometric_mean, arithmetic_mean, weighted)
             weights: 개인별 가중치 (weighted 방법일 때 사용)
+            evaluator_ids: 개인별 식별자 (군집 결과 표시용)
+            cluster_scope: 군집 결과 캐시 범위 ('project', id)
             
         Returns:
             GroupConsensusResult: 그룹 통합 결과
@@ -146,18 +151,27 @@ class AdvancedAHPAnalyzer:
         # 이상치 탐지
         outliers = self._detect_outliers(individual_matrices)
         
+        # 개인별 우선순위 (신뢰구간 및 군집 분석 공용)
+        individual_priorities = self._individual_priorities(individual_matrices)
+        
         # 신뢰구간 계산
         confidence_interval = self._calculate_confidence_interval(
-            individual_matrices, priorities
+            individual_matrices, priorities, individual_priorities
         )
         
+        # 평가자 군집 분석
+        clusters = cluster_evaluators(
+            individual_priorities, evaluator_ids, scope=cluster_scope
+        ).to_dict()
+        
         return GroupConsensusResult(
             aggregation_method=aggregation_method,
             consensus_level=consensus_level,
             disagreement_index=disagreement_index,
             outliers=outliers,
             weighted_priorities=priorities,
-            confidence_interval=confidence_interval
+            confidence_interval=confidence_interval,
+            clusters=clusters
         )
     
     def statistical_significance_test(self, 
@@ -175,6 +189,9 @@ class AdvancedAHPAnalyzer:
         Returns:
             검정 결과 딕셔너리
         """
+        # SciPy는 첫 사용 시 로드 (URLconf 임포트 시점에 불러오지 않음)
+        from scipy import stats
+        
         # 행렬을 벡터로 변환
         vec1 = matrix1.flatten()
         vec2 = matrix2.flatten()
@@ -375,22 +392,24 @@ class AdvancedAHPAnalyzer:
         distances = [np.linalg.norm(m - mean_matrix, 'fro') for m in matrices]
         
         # Z-score 기반 이상치 탐지
+        from scipy import stats
         z_scores = stats.zscore(distances)
         outlier_indices = np.where(np.abs(z_scores) > 2)[0]
         
         return [f"Individual_{i}" for i in outlier_indices]
     
+    def _individual_priorities(self, matrices: List[np.ndarray]) -> np.ndarray:
+        """개인별 우선순위 벡터를 (k, n) 행렬로 계산"""
+        return np.array([self._calculate_priorities(matrix) for matrix in matrices])
+    
     def _calculate_confidence_interval(self, matrices: List[np.ndarray],
                                       priorities: np.ndarray,
+                                      all_priorities: np.ndarray = None,
                                       confidence: float = 0.95) -> Tuple[float, float]:
         """신뢰구간 계산"""
         # 각 행렬에서 우선순위 계산
-        all_priorities = []
-        for matrix in matrices:
-            p = self._calculate_priorities(matrix)
-            all_priorities.append(p)
-            
-        all_priorities = np.array(all_priorities)
+        if all_priorities is None:
+            all_priorities = self._individual_priorities(matrices)
         
         # 부트스트랩 방법으로 신뢰구간 계산
         n_bootstrap = 1000
@@ -427,6 +446,7 @@ class AdvancedAHPAnalyzer:
         # Cohen's d와 샘플 크기를 기반으로 한 근사
         z_alpha = 1.96  # 유의수준 0.05
         z_beta = effect_size * np.sqrt(n / 2) - z_alpha
+        from scipy import stats
         power = stats.norm.cdf(z_beta)
         
         return min(max(power, 0.05), 0.99)
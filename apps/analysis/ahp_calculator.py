@@ -3,13 +3,10 @@ AHP 계산 엔진 - 완전한 AHP 분석 알고리즘 구현
 """
 
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from scipy.stats import kendalltau, spearmanr
-from scipy.optimize import minimize_scalar
 
 logger = logging.getLogger(__name__)
 
@@ -392,6 +389,9 @@ class AHPCalculator:
     
     def _calculate_average_spearman(self, weights: np.ndarray) -> float:
         """평균 Spearman 상관계수 계산"""
+        # SciPy는 첫 사용 시 로드 (URLconf 임포트 시점에 불러오지 않음)
+        from scipy.stats import spearmanr
+        
         n_evaluators = weights.shape[0]
         correlations = []
         
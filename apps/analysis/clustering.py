@@ -0,0 +1,261 @@
+"""
+평가자 군집 분석 모듈
+평가자별 가중치 벡터를 k-medoids로 군집화하고 실루엣 점수로 군집 수를 자동 선택
+"""
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 군집 결과 캐시 유효 시간 (초)
+CLUSTER_CACHE_TIMEOUT = 60 * 60
+
+
+@dataclass
+class ClusteringResult:
+    """평가자 군집 분석 결과"""
+    n_clusters: int
+    labels: List[int]
+    medoids: List[int]
+    silhouette: float
+    evaluators: List[str]
+    clusters: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'n_clusters': self.n_clusters,
+            'labels': self.labels,
+            'medoids': self.medoids,
+            'silhouette': self.silhouette,
+            'evaluators': self.evaluators,
+            'clusters': self.clusters,
+        }
+
+
+def pairwise_distance_matrix(weights: np.ndarray) -> np.ndarray:
+    """
+    가중치 행렬 (k, n)의 유클리드 거리 행렬 (k, k) 계산
+
+    Args:
+        weights: 평가자별 가중치 벡터를 행으로 갖는 행렬
+
+    Returns:
+        np.ndarray: 대칭 거리 행렬
+    """
+    sq_norms = np.einsum('ij,ij->i', weights, weights)
+    sq_dist = sq_norms[:, None] + sq_norms[None, :] - 2.0 * (weights @ weights.T)
+    np.maximum(sq_dist, 0.0, out=sq_dist)
+    np.fill_diagonal(sq_dist, 0.0)
+    return np.sqrt(sq_dist)
+
+
+def k_medoids(distances: np.ndarray, k: int, max_iter: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    사전 계산된 거리 행렬에 대한 k-medoids (교대 최적화)
+
+    Args:
+        distances: (m, m) 거리 행렬
+        k: 군집 수
+        max_iter: 최대 반복 횟수
+
+    Returns:
+        Tuple[labels, medoids]: 군집 레이블과 medoid 인덱스
+    """
+    m = distances.shape[0]
+    if k >= m:
+        return np.arange(m), np.arange(m)
+
+    # 결정적 초기화: 총거리 최소 지점에서 시작해 가장 먼 지점을 순차 선택
+    medoids = np.empty(k, dtype=int)
+    medoids[0] = int(np.argmin(distances.sum(axis=1)))
+    nearest = distances[medoids[0]].copy()
+    for c in range(1, k):
+        medoids[c] = int(np.argmax(nearest))
+        np.minimum(nearest, distances[medoids[c]], out=nearest)
+
+    labels = np.argmin(distances[:, medoids], axis=1)
+    for _ in range(max_iter):
+        new_medoids = medoids.copy()
+        for c in range(k):
+            members = np.flatnonzero(labels == c)
+            if members.size == 0:
+                continue
+            within = distances[np.ix_(members, members)].sum(axis=1)
+            new_medoids[c] = members[np.argmin(within)]
+
+        new_labels = np.argmin(distances[:, new_medoids], axis=1)
+        if np.array_equal(new_medoids, medoids):
+            break
+        medoids, labels = new_medoids, new_labels
+
+    return labels, medoids
+
+
+def silhouette_score(distances: np.ndarray, labels: np.ndarray) -> float:
+    """
+    사전 계산된 거리 행렬 기반 평균 실루엣 점수 (벡터화)
+
+    Args:
+        distances: (m, m) 거리 행렬
+        labels: 군집 레이블
+
+    Returns:
+        float: 평균 실루엣 점수 (-1~1)
+    """
+    m = distances.shape[0]
+    n_labels = int(labels.max()) + 1
+    if n_labels < 2 or n_labels >= m:
+        return 0.0
+
+    one_hot = np.zeros((m, n_labels))
+    one_hot[np.arange(m), labels] = 1.0
+    counts = one_hot.sum(axis=0)
+    sums = distances @ one_hot
+
+    own_counts = counts[labels]
+    own_sums = sums[np.arange(m), labels]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = np.where(own_counts > 1, own_sums / (own_counts - 1), 0.0)
+        mean_other = sums / np.where(counts > 0, counts, np.inf)
+    mean_other[np.arange(m), labels] = np.inf
+    mean_other[:, counts == 0] = np.inf
+    b = mean_other.min(axis=1)
+
+    denom = np.maximum(a, b)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where((own_counts > 1) & (denom > 0), (b - a) / denom, 0.0)
+    return float(s.mean())
+
+
+def cluster_weight_vectors(weights: np.ndarray,
+                           evaluators: Optional[Sequence[str]] = None,
+                           max_clusters: int = 8) -> ClusteringResult:
+    """
+    평가자 가중치 벡터 군집화 (실루엣 기반 k 자동 선택)
+
+    Args:
+        weights: (k, n) 평가자별 가중치 행렬
+        evaluators: 평가자 식별자 (행 순서)
+        max_clusters: 탐색할 최대 군집 수
+
+    Returns:
+        ClusteringResult: 군집 분석 결과
+    """
+    weights = np.asarray(weights, dtype=float)
+    m = weights.shape[0]
+    evaluators = [str(e) for e in evaluators] if evaluators is not None else [
+        f"Individual_{i}" for i in range(m)
+    ]
+
+    if m < 3:
+        labels = np.zeros(m, dtype=int)
+        medoids = np.zeros(1 if m else 0, dtype=int)
+        best_score = 0.0
+    else:
+        distances = pairwise_distance_matrix(weights)
+        labels, medoids, best_score = np.zeros(m, dtype=int), np.array([0]), -1.0
+        for k in range(2, min(max_clusters, m - 1) + 1):
+            k_labels, k_medoids_idx = k_medoids(distances, k)
+            score = silhouette_score(distances, k_labels)
+            if score > best_score:
+                labels, medoids, best_score = k_labels, k_medoids_idx, score
+        # 군집 구조가 뚜렷하지 않으면 단일 군집으로 취급
+        if best_score <= 0:
+            labels = np.zeros(m, dtype=int)
+            medoids = np.array([int(np.argmin(distances.sum(axis=1)))])
+            best_score = 0.0
+
+    # 빈 군집 제거 후 레이블 재부여
+    used, labels = np.unique(labels, return_inverse=True)
+    medoids = np.asarray(medoids)[used]
+
+    clusters = []
+    for c, medoid in enumerate(medoids):
+        members = np.flatnonzero(labels == c)
+        clusters.append({
+            'cluster': c,
+            'size': int(members.size),
+            'medoid': evaluators[int(medoid)],
+            'members': [evaluators[i] for i in members],
+            'mean_weights': weights[members].mean(axis=0).tolist() if members.size else [],
+        })
+
+    return ClusteringResult(
+        n_clusters=len(medoids),
+        labels=labels.tolist(),
+        medoids=[int(i) for i in medoids],
+        silhouette=float(best_score),
+        evaluators=evaluators,
+        clusters=clusters,
+    )
+
+
+def cluster_evaluators(weights: np.ndarray,
+                       evaluators: Optional[Sequence[str]] = None,
+                       scope: Optional[Tuple[str, Any]] = None,
+                       max_clusters: int = 8) -> ClusteringResult:
+    """
+    평가자 군집화 (워크숍/프로젝트 단위 캐시)
+
+    Args:
+        weights: (k, n) 평가자별 가중치 행렬
+        evaluators: 평가자 식별자
+        scope: 캐시 범위 ('workshop' | 'project', id). None이면 캐시 미사용
+        max_clusters: 탐색할 최대 군집 수
+
+    Returns:
+        ClusteringResult: 군집 분석 결과
+    """
+    weights = np.ascontiguousarray(weights, dtype=float)
+    if scope is None:
+        return cluster_weight_vectors(weights, evaluators, max_clusters)
+
+    from django.core.cache import cache
+
+    digest = hashlib.sha1(weights.tobytes())
+    digest.update(repr((weights.shape, list(evaluators or []), max_clusters)).encode())
+    cache_key = f"evaluator_clusters:{scope[0]}:{scope[1]}:{digest.hexdigest()}"
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return ClusteringResult(**cached)
+
+    result = cluster_weight_vectors(weights, evaluators, max_clusters)
+    cache.set(cache_key, result.to_dict(), CLUSTER_CACHE_TIMEOUT)
+    return result
+
+
+def weight_matrix_from_json(individual_weights: Any) -> Tuple[np.ndarray, List[str]]:
+    """
+    GroupConsensusResult.individual_weights JSON을 (k, n) 행렬로 변환
+
+    지원 형식:
+        {participant: {criterion: weight, ...}, ...}
+        {participant: [weight, ...], ...}
+        [[weight, ...], ...]
+
+    길이가 다른 행이나 숫자가 아닌 값이 있으면 ValueError
+    """
+    if isinstance(individual_weights, dict):
+        evaluators = [str(key) for key in individual_weights.keys()]
+        rows = list(individual_weights.values())
+    else:
+        rows = list(individual_weights or [])
+        evaluators = [f"Individual_{i}" for i in range(len(rows))]
+
+    if not rows:
+        return np.zeros((0, 0)), evaluators
+    try:
+        if isinstance(rows[0], dict):
+            criteria = sorted({str(key) for row in rows for key in row.keys()})
+            rows = [[float(row.get(c, 0.0)) for c in criteria] for row in rows]
+        weights = np.array(rows, dtype=float)
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f'Invalid individual weights: {e}') from e
+    if weights.ndim != 2:
+        raise ValueError('Individual weights must be one row of weights per participant')
+    return weights, evaluators
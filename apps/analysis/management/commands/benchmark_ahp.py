@@ -0,0 +1,329 @@
+"""
+Micro-benchmarks for the AHP numerical core
+
+Sweeps the number of criteria (n) and evaluators (k) over the public methods
+of AHPCalculator and AdvancedAHPAnalyzer with seeded synthetic matrices, and
+optionally compares the timings against a previous JSON run:
+
+    python manage.py benchmark_ahp --output bench.json
+    python manage.py benchmark_ahp --baseline bench.json --threshold 0.2
+
+Regressions are judged on the best sample of each point and make the command
+exit with an error, so it can gate changes to ahp_calculator.py and
+advanced_analysis.py. Slowdowns below ``--min-delta-ms`` (default 0.1 ms) are
+treated as timer noise, whatever their ratio.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import timeit
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analysis.advanced_analysis import AdvancedAHPAnalyzer
+from apps.analysis.ahp_calculator import AggregationMethod, AHPCalculator, ComparisonMatrix
+
+DEFAULT_N = (3, 5, 10, 20, 50)
+DEFAULT_K = (1, 10, 100, 500, 2000)
+
+
+def random_matrix(rng, n, noise=0.2):
+    """거의 일관된 n x n 상반행렬 (Saaty 1/9~9 범위)"""
+    weights = rng.uniform(1, 9, n)
+    matrix = np.outer(weights, 1.0 / weights) * rng.lognormal(0.0, noise, (n, n))
+    matrix = np.clip(matrix, 1 / 9, 9)
+    upper = np.triu_indices(n, 1)
+    matrix[(upper[1], upper[0])] = 1.0 / matrix[upper]
+    np.fill_diagonal(matrix, 1.0)
+    return matrix
+
+
+def criteria_names(n):
+    return [f'C{i + 1}' for i in range(n)]
+
+
+# 케이스별 입력 생성: (rng, n, k) -> 인자 없는 호출 가능 객체
+def _create_comparison_matrix(rng, n, k):
+    calculator = AHPCalculator()
+    criteria = criteria_names(n)
+    matrix = random_matrix(rng, n)
+    comparisons = [
+        {'criteria_1': criteria[i], 'criteria_2': criteria[j], 'value': matrix[i, j]}
+        for i in range(n) for j in range(i + 1, n)
+    ]
+    return lambda: calculator.create_comparison_matrix(comparisons, criteria)
+
+
+def _eigenvector(rng, n, k):
+    calculator = AHPCalculator()
+    matrix = random_matrix(rng, n)
+    return lambda: calculator.calculate_weights_eigenvector(matrix)
+
+
+def _geometric_mean(rng, n, k):
+    calculator = AHPCalculator()
+    matrix = random_matrix(rng, n)
+    return lambda: calculator.calculate_weights_geometric_mean(matrix)
+
+
+def _analyze_single_matrix(rng, n, k):
+    calculator = AHPCalculator()
+    comparison = ComparisonMatrix(matrix=random_matrix(rng, n), criteria=criteria_names(n))
+    return lambda: calculator.analyze_single_matrix(comparison)
+
+
+def _comparison_matrices(rng, n, k):
+    criteria = criteria_names(n)
+    return [ComparisonMatrix(matrix=random_matrix(rng, n), criteria=criteria, evaluator_id=str(i))
+            for i in range(k)]
+
+
+def _aggregate(method):
+    def setup(rng, n, k):
+        calculator = AHPCalculator()
+        matrices = _comparison_matrices(rng, n, k)
+        weights = rng.uniform(0.5, 1.5, k).tolist()
+        return lambda: calculator.aggregate_group_matrices(matrices, method, weights)
+    return setup
+
+
+def _consensus_metrics(rng, n, k):
+    calculator = AHPCalculator()
+    matrices = _comparison_matrices(rng, n, k)
+    return lambda: calculator.calculate_consensus_metrics(matrices)
+
+
+def _perform_sensitivity_analysis(rng, n, k):
+    calculator = AHPCalculator()
+    comparison = ComparisonMatrix(matrix=random_matrix(rng, n), criteria=criteria_names(n))
+    return lambda: calculator.perform_sensitivity_analysis(comparison, 'C1')
+
+
+def _calculate_final_priorities(rng, n, k):
+    calculator = AHPCalculator()
+    criteria = criteria_names(n)
+    criteria_weights = dict(zip(criteria, calculator.calculate_weights_geometric_mean(random_matrix(rng, n))[0]))
+    alternatives = [f'A{i + 1}' for i in range(n)]
+    alternative_matrices = {
+        criterion: ComparisonMatrix(matrix=random_matrix(rng, n), criteria=alternatives)
+        for criterion in criteria
+    }
+    return lambda: calculator.calculate_final_priorities(criteria_weights, alternative_matrices)
+
+
+def _analyzer(rng, n):
+    weights = rng.dirichlet(np.ones(n))
+    return AdvancedAHPAnalyzer({'criteria': random_matrix(rng, n)}, weights)
+
+
+def _advanced_sensitivity(rng, n, k):
+    analyzer = _analyzer(rng, n)
+    return lambda: analyzer.sensitivity_analysis(0)
+
+
+def _group_decision_integration(method):
+    def setup(rng, n, k):
+        analyzer = _analyzer(rng, n)
+        matrices = [random_matrix(rng, n) for _ in range(k)]
+        weights = rng.uniform(0.5, 1.5, k).tolist()
+        evaluator_ids = [str(i) for i in range(k)]
+        return lambda: analyzer.group_decision_integration(
+            matrices, method, weights=weights, evaluator_ids=evaluator_ids
+        )
+    return setup
+
+
+def _significance_test(rng, n, k):
+    analyzer = _analyzer(rng, n)
+    first, second = random_matrix(rng, n), random_matrix(rng, n)
+    return lambda: analyzer.statistical_significance_test(first, second, 't_test')
+
+
+def _monte_carlo(rng, n, k):
+    analyzer = _analyzer(rng, n)
+    return lambda: analyzer.monte_carlo_simulation()
+
+
+# (이름, 입력 생성 함수, 평가자 수 k 사용 여부)
+CASES = [
+    ('AHPCalculator.create_comparison_matrix', _create_comparison_matrix, False),
+    ('AHPCalculator.calculate_weights_eigenvector', _eigenvector, False),
+    ('AHPCalculator.calculate_weights_geometric_mean', _geometric_mean, False),
+    ('AHPCalculator.analyze_single_matrix', _analyze_single_matrix, False),
+    ('AHPCalculator.aggregate_group_matrices[geometric_mean]', _aggregate(AggregationMethod.GEOMETRIC_MEAN), True),
+    ('AHPCalculator.aggregate_group_matrices[arithmetic_mean]', _aggregate(AggregationMethod.ARITHMETIC_MEAN), True),
+    ('AHPCalculator.aggregate_group_matrices[weighted_geometric_mean]',
+     _aggregate(AggregationMethod.WEIGHTED_GEOMETRIC_MEAN), True),
+    ('AHPCalculator.calculate_consensus_metrics', _consensus_metrics, True),
+    ('AHPCalculator.perform_sensitivity_analysis', _perform_sensitivity_analysis, False),
+    ('AHPCalculator.calculate_final_priorities', _calculate_final_priorities, False),
+    ('AdvancedAHPAnalyzer.sensitivity_analysis', _advanced_sensitivity, False),
+    ('AdvancedAHPAnalyzer.group_decision_integration[geometric_mean]',
+     _group_decision_integration('geometric_mean'), True),
+    ('AdvancedAHPAnalyzer.group_decision_integration[arithmetic_mean]',
+     _group_decision_integration('arithmetic_mean'), True),
+    ('AdvancedAHPAnalyzer.group_decision_integration[weighted]', _group_decision_integration('weighted'), True),
+    ('AdvancedAHPAnalyzer.statistical_significance_test', _significance_test, False),
+    ('AdvancedAHPAnalyzer.monte_carlo_simulation', _monte_carlo, False),
+]
+
+
+def result_key(result):
+    return result['case'], result['n'], result['k']
+
+
+def result_label(result):
+    size = f"n={result['n']}" + (f", k={result['k']}" if result['k'] is not None else '')
+    return f"{result['case']} [{size}]"
+
+
+class Command(BaseCommand):
+    help = 'Benchmark AHPCalculator / AdvancedAHPAnalyzer over n criteria and k evaluators'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--n', type=int, nargs='+', default=list(DEFAULT_N), help='Criteria counts to sweep')
+        parser.add_argument('--k', type=int, nargs='+', default=list(DEFAULT_K), help='Evaluator counts to sweep')
+        parser.add_argument('--case', action='append', default=[],
+                            help='Only run cases whose name contains this text (repeatable)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timing samples per point')
+        parser.add_argument('--max-seconds', type=float, default=5.0,
+                            help='Skip larger n/k for a case once one call takes longer than this')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--baseline', help='Compare against a JSON file written by --output')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Relative slowdown vs. baseline reported as a regression (0.2 = 20%%)')
+        parser.add_argument('--min-delta-ms', type=float, default=0.1,
+                            help='Ignore slowdowns smaller than this many milliseconds (timer noise)')
+        parser.add_argument('--list', action='store_true', help='List case names and exit')
+
+    def handle(self, *args, **options):
+        cases = [case for case in CASES
+                 if not options['case'] or any(text in case[0] for text in options['case'])]
+        if options['list']:
+            for name, _, uses_k in cases:
+                self.stdout.write(f"{name}{' (n, k)' if uses_k else ' (n)'}")
+            return
+        if not cases:
+            raise CommandError('No benchmark case matches --case')
+
+        baseline = self._load_baseline(options['baseline']) if options['baseline'] else None
+        results = []
+        for name, setup, uses_k in cases:
+            results.extend(self._run_case(name, setup, uses_k, options))
+
+        report = {'meta': self._meta(options), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fp:
+                json.dump(report, fp, indent=2)
+            self.stdout.write(f"results written to {options['output']}")
+
+        if baseline is not None:
+            self._compare(results, baseline, options['threshold'], options['min_delta_ms'])
+
+    def _run_case(self, name, setup, uses_k, options):
+        points = [(n, k) for n in sorted(options['n']) for k in (sorted(options['k']) if uses_k else [None])]
+        too_slow = []
+        results = []
+        for n, k in points:
+            result = {'case': name, 'n': n, 'k': k}
+            # 더 작은 크기에서 이미 상한을 넘었으면 더 큰 크기는 건너뜀
+            if any(n >= slow_n and (k is None or k >= slow_k) for slow_n, slow_k in too_slow):
+                result['skipped'] = f"slower than {options['max_seconds']}s at a smaller size"
+                results.append(result)
+                self._write_result(result)
+                continue
+
+            rng = np.random.default_rng(options['seed'])
+            np.random.seed(options['seed'])
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    result.update(self._time(setup(rng, n, k or 1), options))
+            except Exception as exc:
+                result['error'] = f'{type(exc).__name__}: {exc}'
+            else:
+                if result['median_ms'] / 1000 > options['max_seconds']:
+                    too_slow.append((n, k or 0))
+            results.append(result)
+            self._write_result(result)
+        return results
+
+    def _time(self, func, options):
+        timer = timeit.Timer(func)
+        # 한 샘플이 0.2초 이상이 되도록 반복 횟수 자동 결정 (첫 호출은 워밍업 겸용)
+        loops, elapsed = timer.autorange()
+        if elapsed / loops > options['max_seconds']:
+            samples = [elapsed / loops]
+        else:
+            samples = [total / loops for total in timer.repeat(options['repeat'], loops)]
+        return {
+            'loops': loops,
+            'samples': len(samples),
+            'best_ms': min(samples) * 1000,
+            'median_ms': statistics.median(samples) * 1000,
+        }
+
+    def _write_result(self, result):
+        if 'skipped' in result:
+            detail = f"skipped ({result['skipped']})"
+        elif 'error' in result:
+            detail = f"error: {result['error']}"
+        else:
+            detail = f"{result['median_ms']:.3f} ms (best {result['best_ms']:.3f}, {result['loops']} loops)"
+        self.stdout.write(f'{result_label(result)}: {detail}')
+
+    def _meta(self, options):
+        import scipy
+
+        return {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'seed': options['seed'],
+            'repeat': options['repeat'],
+        }
+
+    def _load_baseline(self, path):
+        try:
+            with open(path, encoding='utf-8') as fp:
+                report = json.load(fp)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+        return {result_key(result): result for result in report.get('results', []) if 'best_ms' in result}
+
+    def _compare(self, results, baseline, threshold, min_delta_ms=0.0):
+        regressions = []
+        # 잡음이 적은 최솟값(best)으로 비교
+        self.stdout.write('\ncomparison with baseline (best of samples):')
+        for result in results:
+            previous = baseline.get(result_key(result))
+            if previous is None or 'best_ms' not in result:
+                continue
+            ratio = result['best_ms'] / previous['best_ms'] if previous['best_ms'] else 1.0
+            line = (f"{result_label(result)}: "
+                    f"{previous['best_ms']:.3f} -> {result['best_ms']:.3f} ms ({ratio:.2f}x)")
+            slower_ms = result['best_ms'] - previous['best_ms']
+            if ratio > 1 + threshold and slower_ms < min_delta_ms:
+                # 수십 마이크로초 단위의 차이는 타이머 잡음으로 간주
+                self.stdout.write(f"{line} within {min_delta_ms:g} ms noise floor")
+            elif ratio > 1 + threshold:
+                regressions.append(line)
+                self.stdout.write(self.style.ERROR(line))
+            elif ratio < 1 - threshold:
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f'{len(regressions)} benchmark(s) slower than baseline by more than {threshold:.0%}')
+        self.stdout.write(self.style.SUCCESS('no regressions'))
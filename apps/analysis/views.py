@@ -5,9 +5,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from django.db import transaction, models as db_models
 import numpy as np
-from scipy import stats
 
 from .models import (
     AnalysisResult, WeightVector, ConsensusMetrics, 
@@ -15,11 +15,16 @@ from .models import (
 )
 from apps.projects.models import Project, Criteria
 from apps.evaluations.models import Evaluation, PairwiseComparison
+from apps.common.access import ProjectAccess
+from apps.common.throttling import ScopedSlidingWindowThrottle
+from apps.common.renderers import to_columnar, wants_columnar
 
 
 class AnalysisViewSet(viewsets.ViewSet):
     """ViewSet for AHP analysis operations"""
     permission_classes = [IsAuthenticated]
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES + [ScopedSlidingWindowThrottle]
+    throttle_scope = 'analysis'
 
     # ------------------------------------------------------------------ #
     # Flat endpoints referenced by urls.py                                 #
@@ -44,8 +49,7 @@ class AnalysisViewSet(viewsets.ViewSet):
         project = evaluation.project
 
         # Permission check
-        user = request.user
-        if not (project.owner == user or project.collaborators.filter(pk=user.pk).exists() or user.is_superuser):
+        if not ProjectAccess.for_request(request).can_view(project):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
         weights = self._calculate_evaluation_weights(evaluation)
@@ -59,19 +63,7 @@ class AnalysisViewSet(viewsets.ViewSet):
         # Compute consistency ratio
         cr = evaluation.calculate_consistency_ratio()
 
-        result = []
-        for criteria_id, w in weights.items():
-            try:
-                criteria = Criteria.objects.get(pk=criteria_id)
-                result.append({
-                    'criteria_id': criteria_id,
-                    'criteria_name': criteria.name,
-                    'weight': round(w['weight'], 6),
-                    'normalized_weight': round(w['normalized'], 6),
-                    'rank': w['rank'],
-                })
-            except Criteria.DoesNotExist:
-                pass
+        result = self._weight_rows(weights)
 
         return Response({
             'evaluation_id': str(evaluation.id),
@@ -81,6 +73,22 @@ class AnalysisViewSet(viewsets.ViewSet):
             'weights': result,
         })
 
+    @staticmethod
+    def _weight_rows(weights):
+        """Weight rows with criteria names (single name lookup; unknown criteria are skipped)"""
+        names = dict(Criteria.objects.filter(pk__in=list(weights)).values_list('pk', 'name'))
+        return [
+            {
+                'criteria_id': criteria_id,
+                'criteria_name': names[criteria_id],
+                'weight': round(w['weight'], 6),
+                'normalized_weight': round(w['normalized'], 6),
+                'rank': w['rank'],
+            }
+            for criteria_id, w in weights.items()
+            if criteria_id in names
+        ]
+
     def calculate_group(self, request):
         """Aggregate weights across all completed evaluations for a project.
 
@@ -95,15 +103,18 @@ class AnalysisViewSet(viewsets.ViewSet):
         except (Project.DoesNotExist, ValueError, Exception):
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        user = request.user
-        if not (project.owner == user or project.collaborators.filter(pk=user.pk).exists() or user.is_superuser):
+        if not ProjectAccess.for_request(request).can_view(project):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
         evaluations = project.evaluations.filter(status='completed')
-        if not evaluations.exists():
+        rows = self._comparison_rows_by_evaluation(evaluations)
+        if not rows:
             return Response({'error': 'No completed evaluations found'}, status=status.HTTP_400_BAD_REQUEST)
 
-        all_weights = [self._calculate_evaluation_weights(ev) for ev in evaluations]
+        all_weights = [
+            self._calculate_evaluation_weights(evaluation_id, evaluation_rows)
+            for evaluation_id, evaluation_rows in rows.items()
+        ]
         all_weights = [w for w in all_weights if w]
 
         if not all_weights:
@@ -111,23 +122,11 @@ class AnalysisViewSet(viewsets.ViewSet):
 
         group_weights = all_weights[0] if len(all_weights) == 1 else self._aggregate_weights(all_weights)
 
-        result = []
-        for criteria_id, w in group_weights.items():
-            try:
-                criteria = Criteria.objects.get(pk=criteria_id)
-                result.append({
-                    'criteria_id': criteria_id,
-                    'criteria_name': criteria.name,
-                    'weight': round(w['weight'], 6),
-                    'normalized_weight': round(w['normalized'], 6),
-                    'rank': w['rank'],
-                })
-            except Criteria.DoesNotExist:
-                pass
+        result = self._weight_rows(group_weights)
 
         return Response({
             'project_id': str(project.id),
-            'evaluation_count': evaluations.count(),
+            'evaluation_count': len(rows),
             'weights': result,
         })
 
@@ -153,8 +152,7 @@ class AnalysisViewSet(viewsets.ViewSet):
         except (Project.DoesNotExist, ValueError, Exception):
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        user = request.user
-        if not (project.owner == user or project.collaborators.filter(pk=user.pk).exists() or user.is_superuser):
+        if not ProjectAccess.for_request(request).can_view(project):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
         evaluations = project.evaluations.all()
@@ -200,23 +198,23 @@ class AnalysisViewSet(viewsets.ViewSet):
                 created_by=request.user
             )
             
-            # Calculate weights for each evaluation
+            # Calculate weights for each evaluation (comparisons loaded with one query)
             all_weights = []
-            for evaluation in evaluations:
-                weights = self._calculate_evaluation_weights(evaluation)
+            weight_vectors = []
+            for evaluation_id, rows in self._comparison_rows_by_evaluation(evaluations).items():
+                weights = self._calculate_evaluation_weights(evaluation_id, rows)
                 all_weights.append(weights)
                 
                 # Store individual weights
                 for criteria_id, weight in weights.items():
-                    criteria = Criteria.objects.get(id=criteria_id)
-                    WeightVector.objects.create(
+                    weight_vectors.append(WeightVector(
                         project=project,
-                        criteria=criteria,
-                        evaluation=evaluation,
+                        criteria_id=criteria_id,
+                        evaluation_id=evaluation_id,
                         weight=weight['weight'],
                         normalized_weight=weight['normalized'],
                         rank=weight['rank']
-                    )
+                    ))
             
             # Calculate group weights if multiple evaluations
             if len(all_weights) > 1:
@@ -224,15 +222,16 @@ class AnalysisViewSet(viewsets.ViewSet):
                 
                 # Store final weights
                 for criteria_id, weight in group_weights.items():
-                    criteria = Criteria.objects.get(id=criteria_id)
-                    WeightVector.objects.create(
+                    weight_vectors.append(WeightVector(
                         project=project,
-                        criteria=criteria,
+                        criteria_id=criteria_id,
                         weight=weight['weight'],
                         normalized_weight=weight['normalized'],
                         rank=weight['rank'],
                         is_final=True
-                    )
+                    ))
+            
+            WeightVector.objects.bulk_create(weight_vectors, batch_size=1000)
             
             analysis.status = 'completed'
             analysis.mark_completed()
@@ -288,6 +287,14 @@ class AnalysisViewSet(viewsets.ViewSet):
             chart_data=sensitivity_data['chart_data']
         )
         
+        # ?shape=columnar: 단계별 dict 목록 대신 열 단위 숫자 배열로 응답
+        if wants_columnar(request):
+            sensitivity_data = {
+                **sensitivity_data,
+                'chart_data': to_columnar(sensitivity_data['chart_data']),
+                'shape': 'columnar',
+            }
+        
         return Response({
             'message': 'Sensitivity analysis completed',
             'sensitivity_id': sensitivity.id,
@@ -306,29 +313,29 @@ class AnalysisViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get individual weight vectors
-        weight_vectors = []
-        for evaluation in evaluations:
-            weights = WeightVector.objects.filter(
-                project=project,
-                evaluation=evaluation
-            ).values_list('criteria_id', 'normalized_weight')
-            weight_vectors.append(dict(weights))
+        # Get individual weight vectors (single query, grouped per evaluation)
+        vectors = {evaluation_id: {} for evaluation_id in evaluations.values_list('pk', flat=True)}
+        for evaluation_id, criteria_id, weight in WeightVector.objects.filter(
+            project=project, evaluation__in=evaluations
+        ).values_list('evaluation_id', 'criteria_id', 'normalized_weight'):
+            vectors[evaluation_id][criteria_id] = weight
+        weight_vectors = list(vectors.values())
         
         # Calculate consensus metrics
         consensus_data = self._calculate_consensus_metrics(weight_vectors)
         
         # Store results
+        summary = evaluations.aggregate(
+            count=db_models.Count('pk'), avg=db_models.Avg('consistency_ratio')
+        )
         metrics = ConsensusMetrics.objects.create(
             project=project,
             kendall_w=consensus_data['kendall_w'],
             spearman_rho=consensus_data['spearman_rho'],
             consensus_index=consensus_data['consensus_index'],
-            total_evaluators=evaluations.count(),
-            completed_evaluations=evaluations.count(),
-            average_consistency=evaluations.aggregate(
-                avg=db_models.Avg('consistency_ratio')
-            )['avg'],
+            total_evaluators=summary['count'],
+            completed_evaluations=summary['count'],
+            average_consistency=summary['avg'],
             high_disagreement_criteria=consensus_data['disagreements'],
             outlier_evaluators=consensus_data['outliers'],
             consensus_level=consensus_data['level']
@@ -339,17 +346,32 @@ class AnalysisViewSet(viewsets.ViewSet):
             'metrics': consensus_data
         })
     
-    def _calculate_evaluation_weights(self, evaluation):
-        """Calculate weights from pairwise comparisons"""
-        comparisons = evaluation.pairwise_comparisons.all()
+    # 비교 행: (criteria_a_id, criteria_b_id, value, 상위 기준 ID)
+    COMPARISON_ROW_FIELDS = ('criteria_a_id', 'criteria_b_id', 'value', 'criteria_a__parent_id')
+
+    def _comparison_rows_by_evaluation(self, evaluations):
+        """Comparison rows of several evaluations with one query, keyed by evaluation ID"""
+        rows = {pk: [] for pk in evaluations.values_list('pk', flat=True)}
+        for evaluation_id, *row in PairwiseComparison.objects.filter(
+            evaluation__in=evaluations
+        ).values_list('evaluation_id', *self.COMPARISON_ROW_FIELDS):
+            rows[evaluation_id].append(row)
+        return rows
+
+    def _calculate_evaluation_weights(self, evaluation, rows=None):
+        """Calculate weights from pairwise comparisons (``rows`` are loaded when not given)"""
+        if rows is None:
+            rows = PairwiseComparison.objects.filter(
+                evaluation=evaluation
+            ).values_list(*self.COMPARISON_ROW_FIELDS)
         
         # Group by parent criteria for hierarchical analysis
         criteria_groups = {}
-        for comp in comparisons:
-            parent = comp.criteria_a.parent_id or 'root'
+        for criteria_a_id, criteria_b_id, value, parent_id in rows:
+            parent = parent_id or 'root'
             if parent not in criteria_groups:
                 criteria_groups[parent] = []
-            criteria_groups[parent].append(comp)
+            criteria_groups[parent].append((criteria_a_id, criteria_b_id, value))
         
         weights = {}
         for parent, group_comps in criteria_groups.items():
@@ -359,25 +381,21 @@ class AnalysisViewSet(viewsets.ViewSet):
         return weights
     
     def _calculate_group_weights(self, comparisons):
-        """Calculate weights for a group of comparisons using eigenvector method"""
+        """Calculate weights for (criteria_a_id, criteria_b_id, value) comparisons using eigenvector method"""
         if not comparisons:
             return {}
         
         # Get unique criteria
-        criteria_set = set()
-        for comp in comparisons:
-            criteria_set.add(comp.criteria_a)
-            criteria_set.add(comp.criteria_b)
-        criteria_list = list(criteria_set)
+        criteria_list = sorted({cid for a, b, _ in comparisons for cid in (a, b)})
+        index = {cid: i for i, cid in enumerate(criteria_list)}
         n = len(criteria_list)
         
         # Build comparison matrix
         matrix = np.ones((n, n))
-        for comp in comparisons:
-            i = criteria_list.index(comp.criteria_a)
-            j = criteria_list.index(comp.criteria_b)
-            matrix[i][j] = comp.value
-            matrix[j][i] = 1.0 / comp.value
+        for a, b, value in comparisons:
+            i, j = index[a], index[b]
+            matrix[i][j] = value
+            matrix[j][i] = 1.0 / value
         
         # Calculate eigenvector
         eigenvalues, eigenvectors = np.linalg.eig(matrix)
@@ -389,8 +407,7 @@ class AnalysisViewSet(viewsets.ViewSet):
         weights = {}
         sorted_indices = np.argsort(eigenvector)[::-1]
         for rank, idx in enumerate(sorted_indices, 1):
-            criteria = criteria_list[idx]
-            weights[criteria.id] = {
+            weights[criteria_list[idx]] = {
                 'weight': float(eigenvector[idx]),
                 'normalized': float(eigenvector[idx]),
                 'rank': rank
@@ -539,19 +556,21 @@ class AnalysisViewSet(viewsets.ViewSet):
             matrix.append(row)
         matrix = np.array(matrix)
         
+        # SciPy는 합의도 계산 시에만 로드 (워커 기동 시간 단축)
+        from scipy import stats
+        
         # Calculate Kendall's W
-        rankings = np.array([stats.rankdata(row) for row in matrix])
+        rankings = stats.rankdata(matrix, axis=1)
         mean_rank = np.mean(rankings, axis=0)
         ss_total = np.sum((rankings - mean_rank) ** 2)
         kendall_w = (12 * ss_total) / (n_evaluators ** 2 * (n_criteria ** 3 - n_criteria))
         
         # Calculate average Spearman correlation
-        correlations = []
-        for i in range(n_evaluators):
-            for j in range(i + 1, n_evaluators):
-                rho, _ = stats.spearmanr(matrix[i], matrix[j])
-                correlations.append(rho)
-        spearman_rho = np.mean(correlations) if correlations else 0
+        # (spearmanr is the Pearson correlation of average ranks, so one
+        # corrcoef over the rank rows gives every evaluator pair at once)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlations = np.corrcoef(rankings)
+        spearman_rho = np.mean(correlations[np.triu_indices(n_evaluators, k=1)])
         
         # Calculate consensus index (custom metric)
         consensus_index = (kendall_w + spearman_rho) / 2
@@ -591,6 +610,8 @@ class AnalysisViewSet(viewsets.ViewSet):
 class SensitivityAnalysisViewSet(viewsets.ViewSet):
     """ViewSet for sensitivity analysis operations"""
     permission_classes = [IsAuthenticated]
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES + [ScopedSlidingWindowThrottle]
+    throttle_scope = 'analysis'
     
     @action(detail=False, methods=['post'])
     def tornado_chart(self, request):
@@ -6,6 +6,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from django.db import transaction
 from django.utils import timezone
 import numpy as np
@@ -19,11 +20,18 @@ from .advanced_analysis import (
 )
 from apps.projects.models import Project
 from apps.evaluations.models import Evaluation, PairwiseComparison
+from apps.evaluations.matrix_format import MatrixParser, is_matrix_request, reciprocal_matrix, values_in_scale
+from apps.common.access import ProjectAccess
+from apps.common.throttling import ScopedSlidingWindowThrottle
+from apps.common.renderers import to_columnar, wants_columnar
 
 
 class AdvancedAnalysisViewSet(viewsets.ViewSet):
     """고급 분석 API ViewSet"""
     permission_classes = [IsAuthenticated]
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES + [ScopedSlidingWindowThrottle]
+    throttle_scope = 'analysis'
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [MatrixParser]
     
     @action(detail=True, methods=['post'])
     def sensitivity_analysis(self, request, pk=None):
@@ -41,7 +49,7 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             project = Project.objects.get(id=pk)
             
             # 권한 확인
-            if not self._has_permission(request.user, project):
+            if not self._has_permission(request, project):
                 return Response(
                     {'error': '권한이 없습니다.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -51,8 +59,12 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             target_criteria = request.data.get('target_criteria', [])
             variation_range = request.data.get('variation_range', 0.3)
             
+            error = self._matrix_payload_error(project, request)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+            
             # 비교 행렬 및 가중치 계산
-            matrices, weights = self._get_project_matrices(project)
+            matrices, weights = self._get_project_matrices(project, request)
             
             # 분석기 초기화
             analyzer = AdvancedAHPAnalyzer(matrices, weights)
@@ -80,7 +92,7 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
                 'project_id': project.id,
                 'project_title': project.title,
                 'analysis_type': 'sensitivity',
-                'results': sensitivity_results,
+                'results': to_columnar(sensitivity_results) if wants_columnar(request) else sensitivity_results,
                 'overall_stability': overall_stability,
                 'interpretation': self._interpret_sensitivity(overall_stability)
             })
@@ -111,7 +123,7 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             project = Project.objects.get(id=pk)
             
             # 권한 확인
-            if not self._has_permission(request.user, project):
+            if not self._has_permission(request, project):
                 return Response(
                     {'error': '권한이 없습니다.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -152,7 +164,9 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             result = analyzer.group_decision_integration(
                 individual_matrices,
                 aggregation_method,
-                evaluator_weights
+                evaluator_weights,
+                evaluator_ids=[str(info['id']) for info in evaluator_info],
+                cluster_scope=('project', project.id)
             )
             
             return Response({
@@ -165,6 +179,7 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
                 'consensus_level': result.consensus_level,
                 'disagreement_index': result.disagreement_index,
                 'outliers': result.outliers,
+                'clusters': result.clusters,
                 'weighted_priorities': result.weighted_priorities.tolist(),
                 'confidence_interval': result.confidence_interval,
                 'interpretation': self._interpret_consensus(result.consensus_level)
@@ -197,7 +212,7 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             project = Project.objects.get(id=pk)
             
             # 권한 확인
-            if not self._has_permission(request.user, project):
+            if not self._has_permission(request, project):
                 return Response(
                     {'error': '권한이 없습니다.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -264,7 +279,7 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             project = Project.objects.get(id=pk)
             
             # 권한 확인
-            if not self._has_permission(request.user, project):
+            if not self._has_permission(request, project):
                 return Response(
                     {'error': '권한이 없습니다.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -274,8 +289,12 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             n_simulations = request.data.get('n_simulations', 1000)
             uncertainty_level = request.data.get('uncertainty_level', 0.1)
             
+            error = self._matrix_payload_error(project, request)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+            
             # 비교 행렬 및 가중치 계산
-            matrices, weights = self._get_project_matrices(project)
+            matrices, weights = self._get_project_matrices(project, request)
             
             # 분석기 초기화 및 시뮬레이션 수행
             analyzer = AdvancedAHPAnalyzer(matrices, weights)
@@ -313,12 +332,16 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             project = Project.objects.get(id=pk)
             
             # 권한 확인
-            if not self._has_permission(request.user, project):
+            if not self._has_permission(request, project):
                 return Response(
                     {'error': '권한이 없습니다.'},
                     status=status.HTTP_403_FORBIDDEN
                 )
             
+            error = self._matrix_payload_error(project, request)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+            
             # 모든 분석 수행
             analysis_results = {}
             
@@ -332,7 +355,7 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             }
             
             # 2. 민감도 분석
-            matrices, weights = self._get_project_matrices(project)
+            matrices, weights = self._get_project_matrices(project, request)
             if weights is not None and len(weights) > 0:
                 analyzer = AdvancedAHPAnalyzer(matrices, weights)
                 sensitivity_results = []
@@ -398,16 +421,36 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             )
     
     # Helper methods
-    def _has_permission(self, user, project):
-        """사용자 권한 확인"""
-        return (
-            user == project.owner or 
-            user in project.members.all() or
-            user.is_superuser
-        )
+    def _has_permission(self, request, project):
+        """사용자 권한 확인 (요청 단위로 멤버십 캐시)"""
+        return ProjectAccess.for_request(request).can_view(project)
+    
+    def _matrix_payload_error(self, project, request):
+        """업로드된 압축 행렬의 오류 메시지 (정상이거나 행렬 요청이 아니면 None)"""
+        if not is_matrix_request(request):
+            return None
+        matrices = request.data['matrices']
+        # 분석은 단일 기준 행렬(main)만 다룸
+        if len(matrices) != 1:
+            return 'Exactly one matrix is required for analysis'
+        criteria = matrices[0]['criteria']
+        if len(criteria) < 2:
+            return 'The matrix needs at least two criteria'
+        if not values_in_scale(matrices[0]['upper']):
+            return 'Comparison values must be between 1/9 and 9'
+        if project.criteria.filter(pk__in=criteria, is_active=True).count() != len(criteria):
+            return 'The matrix refers to criteria outside this project'
+        return None
     
-    def _get_project_matrices(self, project):
+    def _get_project_matrices(self, project, request=None):
         """프로젝트의 비교 행렬 및 가중치 계산"""
+        # 압축 행렬 페이로드로 전달된 경우 DB 대신 업로드된 행렬 사용
+        # (_matrix_payload_error로 먼저 검증)
+        if request is not None and is_matrix_request(request):
+            uploaded = request.data['matrices'][0]
+            matrix = reciprocal_matrix(len(uploaded['criteria']), uploaded['upper'])
+            return {'main': matrix}, self._principal_weights(matrix)
+        
         # 기본 평가 또는 첫 번째 완료된 평가 사용
         evaluation = Evaluation.objects.filter(
             project=project,
@@ -435,12 +478,14 @@ class AdvancedAnalysisViewSet(viewsets.ViewSet):
             matrix[j, i] = 1 / comp.value if comp.value != 0 else 0
         
         # 가중치 계산 (고유벡터 방법)
+        return {'main': matrix}, self._principal_weights(matrix)
+    
+    def _principal_weights(self, matrix):
+        """주고유벡터 기반 가중치"""
         eigenvalues, eigenvectors = np.linalg.eig(matrix)
         max_idx = np.argmax(eigenvalues.real)
         weights = np.abs(eigenvectors[:, max_idx].real)
-        weights = weights / weights.sum()
-        
-        return {'main': matrix}, weights
+        return weights / weights.sum()
     
     def _build_comparison_matrix(self, evaluation):
         """평가에서 비교 행렬 구성"""
@@ -0,0 +1,80 @@
+"""
+Request-scoped project access resolver
+"""
+
+
+class ProjectAccess:
+    """
+    Resolve a user's access to projects, memoized for one request.
+
+    The user's ``ProjectMember`` row (role and can_* flags) is loaded at most
+    once per project; views and permission classes handling the same request
+    share the resolver through ``ProjectAccess.for_request``.
+    """
+
+    REQUEST_ATTR = '_project_access'
+
+    def __init__(self, user):
+        self.user = user
+        self._memberships = {}
+
+    @classmethod
+    def for_request(cls, request):
+        """Resolver attached to the underlying HttpRequest (shared by DRF views and permissions)"""
+        http_request = getattr(request, '_request', request)
+        resolver = getattr(http_request, cls.REQUEST_ATTR, None)
+        if resolver is None or resolver.user != request.user:
+            resolver = cls(request.user)
+            setattr(http_request, cls.REQUEST_ATTR, resolver)
+        return resolver
+
+    def preload(self, project_ids):
+        """Load memberships for several projects with one query"""
+        from apps.projects.models import ProjectMember
+
+        missing = [pk for pk in project_ids if pk not in self._memberships]
+        if not missing or not self.user.is_authenticated:
+            return
+        self._memberships.update({pk: None for pk in missing})
+        for member in ProjectMember.objects.filter(project_id__in=missing, user=self.user):
+            self._memberships[member.project_id] = member
+
+    def membership(self, project):
+        """The user's ProjectMember row for ``project`` or None"""
+        project_id = getattr(project, 'pk', project)
+        if project_id not in self._memberships:
+            self.preload([project_id])
+        return self._memberships.get(project_id)
+
+    def is_owner(self, project):
+        return self.user.is_authenticated and project.owner_id == self.user.pk
+
+    def is_member(self, project):
+        """Owner or any project member"""
+        return self.is_owner(project) or self.membership(project) is not None
+
+    def can_view(self, project):
+        """Owner, member or superuser"""
+        return self.user.is_superuser or self.is_member(project)
+
+    def _has_flag(self, project, flag):
+        if self.is_owner(project):
+            return True
+        member = self.membership(project)
+        return bool(member and getattr(member, flag))
+
+    def can_edit_structure(self, project):
+        return self._has_flag(project, 'can_edit_structure')
+
+    def can_manage_evaluators(self, project):
+        return self._has_flag(project, 'can_manage_evaluators')
+
+    def can_view_results(self, project):
+        return self._has_flag(project, 'can_view_results')
+
+    def role(self, project):
+        """'owner' for the project owner, otherwise the member role (or None)"""
+        if self.is_owner(project):
+            return 'owner'
+        member = self.membership(project)
+        return member.role if member else None
@@ -0,0 +1,224 @@
+"""
+Buffered ActivityLog writer
+
+Request threads only build an unsaved ``ActivityLog`` and put it on a bounded
+in-process queue; a daemon thread per worker process writes the queue with
+``bulk_create`` every ``ACTIVITY_LOG_BATCH_SIZE`` entries or
+``ACTIVITY_LOG_FLUSH_INTERVAL_MS`` milliseconds, whichever comes first. When
+the buffer is full new entries are dropped and counted rather than blocking
+the request. Whatever is still queued is written at interpreter exit.
+
+With ``ACTIVITY_LOG_BACKGROUND_WRITER=False`` no thread is started and queued
+entries are written only by ``get_writer().flush()`` (tests, one-off scripts).
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """Bounded queue of ActivityLog rows drained by a background thread"""
+
+    def __init__(self, batch_size=200, flush_interval=1.0, max_buffer=10000, background=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.background = background
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+        self._counts = {'enqueued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+
+    def submit(self, entry):
+        """Queue an unsaved ActivityLog; returns False if it was dropped"""
+        if self.background:
+            self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('enqueued')
+        return True
+
+    def flush(self):
+        """Write everything queued so far from the calling thread"""
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return
+            self._write(batch)
+
+    def shutdown(self, timeout=5.0):
+        """Stop the writer thread and write what is left (registered with atexit)"""
+        self._stopping.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval + timeout)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts)
+        stats.update({
+            'queued': self._queue.qsize(),
+            'max_buffer': self.max_buffer,
+            'batch_size': self.batch_size,
+            'flush_interval_ms': int(self.flush_interval * 1000),
+            'thread_alive': bool(self._thread and self._thread.is_alive() and self._pid == os.getpid()),
+        })
+        return stats
+
+    def render_metrics(self, base_labels):
+        stats = self.stats()
+        entries = Counter('ahp_activity_log_entries_total', 'Activity log entries by outcome', ('outcome',))
+        for outcome in ('enqueued', 'written', 'dropped', 'failed'):
+            entries.inc((outcome,), stats[outcome])
+        queued = Gauge('ahp_activity_log_queue_size', 'Activity log entries waiting to be written', ())
+        queued.set((), stats['queued'])
+        return entries.render(base_labels) + queued.render(base_labels)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != pid:
+                # fork 이후: 부모 프로세스에서 상속된 항목은 부모가 기록함
+                self._queue = queue.Queue(maxsize=self.max_buffer)
+            if self._pid is None:
+                atexit.register(self.shutdown)
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self):
+        """Wait for the first entry, then gather until the batch is full or the interval is over"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        from .models import ActivityLog
+
+        with self._write_lock:
+            try:
+                # 이 스레드 전용 연결: 끊긴 연결 정리, 풀 사용 시 반환
+                close_old_connections()
+                ActivityLog.objects.bulk_create(batch, batch_size=self.batch_size)
+            except Exception:
+                logger.exception('Failed to write %d activity log entries', len(batch))
+                self._count('failed', len(batch))
+            else:
+                self._count('written', len(batch))
+                self._count('batches')
+            finally:
+                close_old_connections()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ActivityLogWriter(
+                    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+                    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL_MS / 1000,
+                    max_buffer=settings.ACTIVITY_LOG_BUFFER_SIZE,
+                    background=settings.ACTIVITY_LOG_BACKGROUND_WRITER,
+                )
+    return _writer
+
+
+def log_activity(action, message='', *, request=None, user=None, target=None, level='info', details=None):
+    """
+    Record an activity without a database write in the calling thread
+
+    Args:
+        action: ActivityLog.ACTION_CHOICES 값 ('view', 'export', ...)
+        message: 사람이 읽을 수 있는 설명
+        request: 사용자/IP/User-Agent/경로를 채울 요청
+        user: 요청이 없을 때의 사용자
+        target: 대상 모델 인스턴스 (content_type/object_id)
+        details: 추가 JSON 데이터
+
+    Returns:
+        bool: 기록(또는 큐 등록) 여부. 버퍼가 가득 차면 False
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from .models import ActivityLog
+
+    if user is None and request is not None and request.user.is_authenticated:
+        user = request.user
+    entry = ActivityLog(
+        user=user,
+        action=action,
+        level=level,
+        message=message,
+        details=details or {},
+        timestamp=timezone.now(),
+    )
+    if target is not None:
+        # ContentType 조회는 프로세스 캐시를 사용하므로 첫 호출 이후 쿼리 없음
+        entry.content_type = ContentType.objects.get_for_model(target)
+        entry.object_id = str(target.pk)
+    if request is not None:
+        entry.ip_address = request.META.get('REMOTE_ADDR') or None
+        entry.user_agent = request.META.get('HTTP_USER_AGENT', '')[:1000]
+        entry.request_path = request.get_full_path()[:500]
+
+    if not settings.ACTIVITY_LOG_ASYNC:
+        entry.save()
+        return True
+    return get_writer().submit(entry)
+
+
+def activity_log_stats():
+    if not settings.ACTIVITY_LOG_ASYNC:
+        return {'async': False}
+    return {'async': True, **get_writer().stats()}
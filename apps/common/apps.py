@@ -1,5 +1,8 @@
 from django.apps import AppConfig
-import os
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class CommonConfig(AppConfig):
@@ -9,27 +12,23 @@ class CommonConfig(AppConfig):
     
     def ready(self):
         """Run when Django starts up"""
-        # Only run auto-migration in production
-        if not os.environ.get('DEBUG', '').lower() == 'true':
+        # 스키마 작업은 배포 전 단계(manage.py migrate_locked)에서 수행.
+        # AUTO_MIGRATE_ON_STARTUP=true 일 때만 기존처럼 프로세스 기동 시 실행
+        if settings.AUTO_MIGRATE_ON_STARTUP and not settings.DEBUG:
             self.run_auto_migration()
     
     def run_auto_migration(self):
-        """Automatically run migrations on startup"""
+        """Automatically run migrations on startup (serialized across workers)"""
         try:
             from django.core.management import call_command
-            from django.db import connection
-            
-            # Test database connection first
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
+            from .startup import migration_lock
             
-            # Run migrations
-            call_command('makemigrations', verbosity=0, interactive=False)
-            call_command('migrate', verbosity=0, interactive=False)
+            with migration_lock():
+                call_command('makemigrations', verbosity=0, interactive=False)
+                call_command('migrate', verbosity=0, interactive=False)
             
-            print("✓ Auto-migration completed successfully")
+            logger.info("Auto-migration completed successfully")
             
         except Exception as e:
-            print(f"Auto-migration failed: {e}")
             # Don't break the app startup, just log the error
-            pass
\ No newline at end of file
+            logger.error("Auto-migration failed: %s", e)
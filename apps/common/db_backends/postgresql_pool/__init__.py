@@ -0,0 +1,6 @@
+"""
+PostgreSQL backend with an in-process connection pool
+
+Enable with ``DB_POOL=true`` (see settings). Closing a Django connection
+returns it to the pool instead of tearing down the TCP/TLS session.
+"""
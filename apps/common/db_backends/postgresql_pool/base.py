@@ -0,0 +1,175 @@
+"""
+PostgreSQL backend that borrows connections from an in-process pool
+"""
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+from django.db.backends.postgresql import base
+
+DEFAULT_POOL_OPTIONS = {
+    'max_size': 10,       # 프로세스당 최대 연결 수
+    'timeout': 10.0,      # 빈 연결을 기다리는 최대 시간(초)
+    'check_idle': 30.0,   # 이보다 오래 쉰 연결은 재사용 전 SELECT 1로 확인
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of raw psycopg connections.
+
+    ``acquire`` hands out an idle connection, opens a new one while below
+    ``max_size``, or waits up to ``timeout`` seconds for a release. Wait time
+    and usage counters feed the health endpoints.
+    """
+
+    def __init__(self, max_size, timeout, check_idle):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_idle = check_idle
+        self._idle = deque()  # (connection, released_at)
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+        self.connections_created = 0
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def acquire(self, connect):
+        """Borrow a connection; ``connect()`` opens a new one when the pool has room"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        with self._condition:
+            while not self._idle and self._in_use >= self.max_size:
+                waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    if not self._idle and self._in_use >= self.max_size:
+                        self.timeouts += 1
+                        raise OperationalError(
+                            f'Connection pool exhausted ({self.max_size} in use for {self.timeout}s)'
+                        )
+            entry = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            self.acquired += 1
+            if waited:
+                wait = time.monotonic() - started
+                self.waits += 1
+                self.wait_seconds_total += wait
+                self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+        try:
+            connection = self._revive(entry) if entry else None
+            if connection is None:
+                connection = connect()
+                with self._condition:
+                    self.connections_created += 1
+            return connection
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def _revive(self, entry):
+        """Return the idle connection if it still works, otherwise None"""
+        connection, released_at = entry
+        if connection.closed:
+            return None
+        if time.monotonic() - released_at >= self.check_idle:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            except Exception:
+                self._discard(connection)
+                return None
+        return connection
+
+    def release(self, connection):
+        """Put a connection back; broken or mid-transaction connections are dropped"""
+        reusable = not connection.closed
+        if reusable:
+            try:
+                # 열린 트랜잭션이 남지 않도록 정리
+                connection.rollback()
+            except Exception:
+                reusable = False
+        with self._condition:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+        if not reusable:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'connections_created': self.connections_created,
+                'acquired': self.acquired,
+                'waits': self.waits,
+                'wait_ms_total': round(self.wait_seconds_total * 1000, 1),
+                'wait_ms_max': round(self.wait_seconds_max * 1000, 1),
+                'wait_ms_avg': round(self.wait_seconds_total * 1000 / self.waits, 2) if self.waits else 0.0,
+                'timeouts': self.timeouts,
+            }
+
+
+def get_pool(alias):
+    return _pools.get(alias)
+
+
+def pool_stats():
+    """Stats of every pool created in this process, keyed by database alias"""
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Django's PostgreSQL wrapper whose connect/close go through ``ConnectionPool``"""
+
+    def _pool(self):
+        pool = _pools.get(self.alias)
+        if pool is None:
+            with _pools_lock:
+                pool = _pools.get(self.alias)
+                if pool is None:
+                    options = {**DEFAULT_POOL_OPTIONS, **self.settings_dict.get('POOL', {})}
+                    pool = _pools[self.alias] = ConnectionPool(
+                        max_size=int(options['max_size']),
+                        timeout=float(options['timeout']),
+                        check_idle=float(options['check_idle']),
+                    )
+        return pool
+
+    def get_new_connection(self, conn_params):
+        # 새 연결일 때만 부모 구현이 실행되므로, 재사용 연결에도 격리 수준을 맞춰 둠
+        self.isolation_level = base.IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', base.IsolationLevel.READ_COMMITTED)
+        )
+        return self._pool().acquire(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            pool = _pools.get(self.alias)
+            with self.wrap_database_errors:
+                if pool is None:
+                    return self.connection.close()
+                return pool.release(self.connection)
@@ -11,11 +11,31 @@ from django.db import connection
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.conf import settings
+from django.http import HttpResponse
+import hmac
 import os
 
+from .activity import activity_log_stats, get_writer
+from .metrics import request_metrics
+from .startup import worker_startup_info
+from .usage import get_usage_buffer
+
 User = get_user_model()
 
 
+def database_connection_info():
+    """Connection reuse settings and, with DB_POOL, in-process pool stats (in use, idle, wait time)"""
+    info = {
+        'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+        'health_checks': connection.settings_dict.get('CONN_HEALTH_CHECKS'),
+        'pooled': connection.settings_dict['ENGINE'].endswith('postgresql_pool'),
+    }
+    if info['pooled']:
+        from .db_backends.postgresql_pool.base import pool_stats
+        info['pools'] = pool_stats()
+    return info
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def health_check(request):
@@ -31,12 +51,16 @@ def health_check(request):
             'service': 'AHP Django Backend',
             'version': getattr(settings, 'API_VERSION', '1.0.0'),
             'environment': os.getenv('DJANGO_ENV', 'production'),
+            'worker': worker_startup_info(),
         }
         
         # 간단한 DB 연결 테스트
         with connection.cursor() as cursor:
             cursor.execute("SELECT 1")
             health_status['database'] = 'connected'
+        health_status['connections'] = database_connection_info()
+        health_status['activity_log'] = activity_log_stats()
+        health_status['api_usage_pending'] = get_usage_buffer().pending()
         
         return Response(health_status, status=status.HTTP_200_OK)
         
@@ -88,6 +112,8 @@ def db_status(request):
             except:
                 pass
         
+        db_info['connections'] = database_connection_info()
+        
         # 테이블 통계
         try:
             from apps.projects.models import Project
@@ -176,4 +202,23 @@ def api_status(request):
             'timestamp': timezone.now().isoformat(),
             'error': str(e),
             'message': 'System status check failed'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def metrics(request):
+    """
+    Prometheus 텍스트 형식의 요청 메트릭 (RequestMetricsMiddleware 수집)
+    METRICS_TOKEN Bearer 토큰, 스태프 세션 또는 DEBUG 모드에서만 접근 가능
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorization = request.headers.get('Authorization', '')
+    allowed = (
+        settings.DEBUG
+        or (token and hmac.compare_digest(authorization, f'Bearer {token}'))
+        or getattr(request.user, 'is_staff', False)
+    )
+    if not allowed:
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+    body = request_metrics.render()
+    if settings.ACTIVITY_LOG_ASYNC:
+        body += '\n'.join(get_writer().render_metrics((('pid', os.getpid()),))) + '\n'
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
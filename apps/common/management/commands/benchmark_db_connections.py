@@ -0,0 +1,96 @@
+"""
+Load benchmark for database connection reuse
+
+Replays GET requests through the full Django stack, closing connections at
+request boundaries the way the WSGI handler does, once with a fresh
+connection per request (CONN_MAX_AGE=0) and once with the configured reuse
+(persistent connections or the in-process pool).
+"""
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+
+class Command(BaseCommand):
+    help = 'Compare request latency with per-request vs reused database connections'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Worker threads')
+        parser.add_argument('--path', default='/api/common/health/', help='Endpoint to request')
+
+    def handle(self, *args, **options):
+        configured_age = settings.DATABASES['default'].get('CONN_MAX_AGE', 0)
+        engine = settings.DATABASES['default']['ENGINE']
+        self.stdout.write(f"engine: {engine}, path: {options['path']}, "
+                          f"{options['requests']} requests x {options['concurrency']} threads")
+
+        scenarios = [('per-request', 0), ('reused', configured_age)]
+        if engine.endswith('postgresql_pool'):
+            # 풀 사용 시 CONN_MAX_AGE=0 이어도 연결은 풀로 반환되어 재사용됨
+            scenarios = [('pooled', 0)]
+        elif not configured_age:
+            scenarios[1] = ('reused', None)
+
+        for name, max_age in scenarios:
+            result = self._run(max_age, options)
+            self.stdout.write(
+                f"{name:>12}: p50 {result['p50']:.1f} ms, p95 {result['p95']:.1f} ms, "
+                f"mean {result['mean']:.1f} ms, {result['rps']:.0f} req/s, "
+                f"new connections {result['connections']}"
+            )
+
+    def _run(self, max_age, options):
+        for connection in connections.all():
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connections.close_all()
+
+        opened = []
+        lock = threading.Lock()
+
+        def on_connect(sender, connection, **kwargs):
+            with lock:
+                opened.append(connection.alias)
+
+        def request(_):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client()
+            # WSGIHandler와 동일하게 요청 경계에서 오래된 연결 정리
+            close_old_connections()
+            started = time.perf_counter()
+            response = client.get(options['path'])
+            elapsed = (time.perf_counter() - started) * 1000
+            close_old_connections()
+            if response.status_code >= 500:
+                raise CommandError(f"{options['path']} returned {response.status_code}")
+            return elapsed
+
+        local = threading.local()
+        connection_created.connect(on_connect)
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency'], initializer=close_old_connections) as pool:
+                latencies = list(pool.map(request, range(options['requests'])))
+            total = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(on_connect)
+            connections.close_all()
+
+        latencies.sort()
+        return {
+            'p50': statistics.median(latencies),
+            'p95': latencies[int(len(latencies) * 0.95) - 1],
+            'mean': statistics.fmean(latencies),
+            'rps': len(latencies) / total,
+            'connections': len(opened),
+        }
@@ -0,0 +1,86 @@
+"""
+Measure worker cold start: WSGI import time and resident memory per process
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+HEAVY_MODULES = ('numpy', 'scipy', 'pandas', 'openpyxl', 'reportlab', 'matplotlib')
+
+# 새 인터프리터에서 WSGI 애플리케이션을 임포트하고 측정값을 JSON으로 출력
+WORKER_SCRIPT = """
+import json, os, resource, sys, time
+started = time.perf_counter()
+for module in {preload!r}:
+    __import__(module)
+import ahp_backend.wsgi
+from apps.common.startup import worker_startup_info
+info = worker_startup_info()
+print(json.dumps({{
+    'import_ms': (time.perf_counter() - started) * 1000,
+    'urlconf_ms': info.get('urlconf_ms'),
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'loaded': [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+# 분석 의존성을 즉시 로드하던 이전 동작 재현용
+EAGER_ANALYSIS_MODULES = ('pandas', 'scipy.stats', 'scipy.optimize')
+
+
+class Command(BaseCommand):
+    help = 'Start fresh worker processes and report import time and RSS (optionally vs. eager SciPy/pandas)'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Processes to start per scenario')
+        parser.add_argument(
+            '--compare-eager',
+            action='store_true',
+            help='Also measure workers that import SciPy/pandas up front (previous behaviour)',
+        )
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        scenarios = [('lazy', ())]
+        if options['compare_eager']:
+            scenarios.append(('eager', EAGER_ANALYSIS_MODULES))
+
+        results = {name: self._measure(preload, options['runs']) for name, preload in scenarios}
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:>6}: import {result['import_ms']:.0f} ms (median of {result['runs']}), "
+                f"urlconf {result['urlconf_ms']:.0f} ms, RSS {result['rss_mb']:.0f} MB, "
+                f"loaded: {', '.join(result['loaded']) or '-'}"
+            )
+
+    def _measure(self, preload, runs):
+        script = WORKER_SCRIPT.format(preload=tuple(preload), heavy=HEAVY_MODULES)
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'ahp_backend.settings'))
+        samples = []
+        for _ in range(runs):
+            completed = subprocess.run(
+                [sys.executable, '-c', script],
+                cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                raise CommandError(completed.stderr.strip().splitlines()[-1] if completed.stderr else 'worker failed')
+            samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+        return {
+            'runs': runs,
+            'import_ms': statistics.median(s['import_ms'] for s in samples),
+            'urlconf_ms': statistics.median(s['urlconf_ms'] or 0 for s in samples),
+            'rss_mb': statistics.median(s['rss_mb'] for s in samples),
+            'loaded': samples[-1]['loaded'],
+        }
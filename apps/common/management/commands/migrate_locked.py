@@ -0,0 +1,36 @@
+"""
+Pre-deploy schema step: migrate under an advisory lock
+"""
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from apps.common.startup import migration_lock
+
+
+class Command(BaseCommand):
+    help = 'Apply committed migrations once, serialized with a database advisory lock'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--makemigrations',
+            action='store_true',
+            help='Also generate migrations for model changes first (development only)',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to migrate',
+        )
+
+    def handle(self, *args, **options):
+        verbosity = options['verbosity']
+        database = options['database']
+
+        with migration_lock(database):
+            # 배포 시에는 저장소에 커밋된 마이그레이션만 적용
+            if options['makemigrations']:
+                call_command('makemigrations', interactive=False, verbosity=verbosity)
+            call_command('migrate', database=database, interactive=False, verbosity=verbosity)
+
+        self.stdout.write(self.style.SUCCESS('✓ Migrations applied'))
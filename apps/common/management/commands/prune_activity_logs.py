@@ -0,0 +1,49 @@
+"""
+Delete activity log entries older than the retention period
+
+Deletes in primary-key batches so each statement stays short and does not hold
+locks on ``activity_logs`` for long. Intended to run daily (cron / scheduled job).
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.common.models import ActivityLog
+
+
+class Command(BaseCommand):
+    help = 'Delete activity_logs rows older than ACTIVITY_LOG_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Retention in days (default: ACTIVITY_LOG_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows deleted per statement')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be deleted')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.ACTIVITY_LOG_RETENTION_DAYS
+        if days < 1:
+            raise CommandError('Retention must be at least one day')
+
+        cutoff = timezone.now() - timedelta(days=days)
+        expired = ActivityLog.objects.filter(timestamp__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} entries older than {cutoff:%Y-%m-%d %H:%M} would be deleted')
+            return
+
+        deleted = 0
+        while True:
+            ids = list(expired.order_by().values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            count, _ = ActivityLog.objects.filter(id__in=ids).delete()
+            deleted += count
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} entries older than {cutoff:%Y-%m-%d %H:%M}'))
@@ -0,0 +1,138 @@
+"""
+In-process request metrics in Prometheus text format
+
+Histograms live in this worker's memory (no external service); with several
+gunicorn workers each process reports its own series, labelled with ``pid``.
+"""
+import bisect
+import os
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a label tuple"""
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self, base_labels):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            label_text = _format_labels(base_labels + tuple(zip(self.label_names, labels)))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {series[-1]:.6f}')
+            lines.append(f'{self.name}_count{{{label_text}}} {cumulative}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a label tuple"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+
+    def inc(self, labels, amount=1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self, base_labels):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._series.items()):
+            label_text = _format_labels(base_labels + tuple(zip(self.label_names, labels)))
+            lines.append(f'{self.name}{{{label_text}}} {value}')
+        return lines
+
+
+class Gauge:
+    """Point-in-time value keyed by a label tuple"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+
+    def set(self, labels, value):
+        self._series[labels] = value
+
+    def render(self, base_labels):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} gauge']
+        for labels, value in sorted(self._series.items()):
+            label_text = _format_labels(base_labels + tuple(zip(self.label_names, labels)))
+            lines.append(f'{self.name}{{{label_text}}} {value}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+class RequestMetrics:
+    """Per-view request counters and histograms guarded by one lock"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._create_series()
+
+    def _create_series(self):
+        self.requests = Counter('ahp_http_requests_total', 'Sampled HTTP requests', ('view', 'method', 'status'))
+        self.duration = Histogram(
+            'ahp_http_request_duration_seconds', 'Request latency', ('view', 'method'), LATENCY_BUCKETS
+        )
+        self.db_duration = Histogram(
+            'ahp_db_time_per_request_seconds', 'Database time per request', ('view',), LATENCY_BUCKETS
+        )
+        self.queries = Histogram(
+            'ahp_db_queries_per_request', 'SQL queries per request', ('view',), QUERY_COUNT_BUCKETS
+        )
+        self.response_size = Histogram(
+            'ahp_http_response_size_bytes', 'Response body size', ('view',), SIZE_BUCKETS
+        )
+
+    def record(self, view, method, status, duration, queries, db_time, size=None):
+        with self._lock:
+            self.requests.inc((view, method, str(status)))
+            self.duration.observe((view, method), duration)
+            self.db_duration.observe((view,), db_time)
+            self.queries.observe((view,), queries)
+            if size is not None:
+                self.response_size.observe((view,), size)
+
+    def render(self):
+        base_labels = (('pid', os.getpid()),)
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.duration, self.db_duration, self.queries, self.response_size):
+                lines.extend(metric.render(base_labels))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._create_series()
+
+
+request_metrics = RequestMetrics()
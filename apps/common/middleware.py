@@ -0,0 +1,81 @@
+"""
+Middleware for AHP Platform
+"""
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .metrics import request_metrics
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` hook that counts queries and their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB time, total time and response size per view.
+
+    A ``REQUEST_METRICS_SAMPLE_RATE`` fraction of requests is measured and
+    feeds the in-process histograms served at ``/metrics``. Unsampled requests
+    pass through untouched. With ``REQUEST_METRICS_SERVER_TIMING`` on, sampled
+    responses to staff users (any user under DEBUG) also get a
+    ``Server-Timing`` header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 1.0)
+        self.server_timing = getattr(settings, 'REQUEST_METRICS_SERVER_TIMING', False)
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        size = None if response.streaming else len(response.content)
+        request_metrics.record(
+            self._view_label(request), request.method, response.status_code,
+            duration, counter.count, counter.duration, size,
+        )
+        if self.server_timing and self._may_see_timing(request):
+            response['Server-Timing'] = (
+                f'db;dur={counter.duration * 1000:.1f};desc="{counter.count} queries", '
+                f'app;dur={duration * 1000:.1f}'
+            )
+        return response
+
+    @staticmethod
+    def _may_see_timing(request):
+        # DB 시간/쿼리 수는 내부 정보이므로 익명 사용자에게 노출하지 않음
+        if settings.DEBUG:
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+    @staticmethod
+    def _view_label(request):
+        # URL 패턴 단위로 집계 (경로 파라미터별로 시계열이 늘어나지 않도록)
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        return match.view_name or match.route or 'unresolved'
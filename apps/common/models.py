@@ -64,6 +64,7 @@ class ActivityLog(models.Model):
         indexes = [
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['action', 'timestamp']),
+            models.Index(fields=['timestamp']),  # 보존 기간 정리 (prune_activity_logs)
         ]
         
     def __str__(self):
@@ -135,12 +136,14 @@ class FileUpload(models.Model):
     
     STATUS_CHOICES = [
         ('uploading', '업로드 중'),
+        ('processing', '처리 중'),
         ('completed', '완료'),
         ('failed', '실패'),
     ]
     
     TYPE_CHOICES = [
         ('project_import', '프로젝트 가져오기'),
+        ('comparison_import', '쌍대비교 가져오기'),
         ('data_export', '데이터 내보내기'),
         ('user_avatar', '사용자 아바타'),
         ('document', '문서'),
@@ -227,6 +230,7 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['recipient', 'is_read']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['recipient', 'created_at']),
         ]
         
     def __str__(self):
@@ -276,8 +280,9 @@ class APIKey(models.Model):
             return timezone.now() > self.expires_at
         return False
         
-    def record_usage(self):
-        """Record API key usage"""
-        self.last_used_at = timezone.now()
-        self.usage_count += 1
-        self.save(update_fields=['last_used_at', 'usage_count'])
\ No newline at end of file
+    def record_usage(self, count=1, used_at=None):
+        """Record API key usage (atomic increment, no read-modify-write)"""
+        self.last_used_at = used_at or timezone.now()
+        APIKey.objects.filter(pk=self.pk).update(
+            usage_count=models.F('usage_count') + count, last_used_at=self.last_used_at
+        )
@@ -0,0 +1,70 @@
+"""
+Pagination classes for AHP Platform
+"""
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on ``(timestamp, id)``.
+
+    Pages are fetched with ``WHERE timestamp < :position ORDER BY timestamp, id``
+    against an index instead of OFFSET, and no COUNT(*) is run, so every page
+    costs the same no matter how deep it is. The ordering comes from the view's
+    ``cursor_ordering`` and ignores ``?ordering=``.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, 'cursor_ordering', self.ordering))
+
+
+class OptInCursorPagination(BasePagination):
+    """
+    Page-number pagination by default; keyset cursor pagination on request.
+
+    Clients opt in with ``?pagination=cursor`` (the ``next``/``previous`` links
+    then carry ``cursor=``). Existing clients keep the ``count``/page response.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self.paginator = PageNumberPagination()
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = KeysetCursorPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return data['results']
+
+    def get_schema_operation_parameters(self, view):
+        parameters = PageNumberPagination().get_schema_operation_parameters(view)
+        parameters += KeysetCursorPagination().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.mode_query_param,
+            'required': False,
+            'in': 'query',
+            'description': "'cursor' for keyset pagination without a total count",
+            'schema': {'type': 'string', 'enum': ['cursor']},
+        })
+        return parameters
@@ -3,6 +3,8 @@ Custom permissions for AHP Platform
 """
 from rest_framework import permissions
 
+from .access import ProjectAccess
+
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """
@@ -34,11 +36,7 @@ class IsEvaluatorOrProjectMember(permissions.BasePermission):
         
         # Allow project owners and members to view evaluations
         if hasattr(obj, 'project'):
-            project = obj.project
-            if project.owner == user:
-                return True
-            if project.projectmember_set.filter(user=user).exists():
-                return True
+            return ProjectAccess.for_request(request).is_member(obj.project)
         
         return False
 
@@ -49,27 +47,23 @@ class IsProjectMemberOrReadOnly(permissions.BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
-        user = request.user
-        
         # Read permissions for authenticated users
         if request.method in permissions.SAFE_METHODS:
             return True
         
         # Check if user is project owner
         if hasattr(obj, 'project'):
-            project = obj.project
-            if project.owner == user:
+            access = ProjectAccess.for_request(request)
+            if access.is_owner(obj.project):
                 return True
             
             # Check member permissions
-            try:
-                member = project.projectmember_set.get(user=user)
+            member = access.membership(obj.project)
+            if member is not None:
                 if request.method in ['POST', 'PUT', 'PATCH']:
                     return member.can_edit_structure
                 elif request.method == 'DELETE':
                     return member.role in ['owner', 'manager']
-            except:
-                pass
         
         return False
 
@@ -114,20 +108,8 @@ class CanManageEvaluators(permissions.BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
-        user = request.user
-        
+        # Project owner or members with evaluator management permission
         if hasattr(obj, 'project'):
-            project = obj.project
-            
-            # Project owner can manage evaluators
-            if project.owner == user:
-                return True
-            
-            # Members with evaluator management permission
-            try:
-                member = project.projectmember_set.get(user=user)
-                return member.can_manage_evaluators
-            except:
-                pass
+            return ProjectAccess.for_request(request).can_manage_evaluators(obj.project)
         
         return False
\ No newline at end of file
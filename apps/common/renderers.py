@@ -0,0 +1,91 @@
+"""
+Renderers for AHP Platform
+"""
+import numbers
+
+import numpy as np
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 DRF 기본 JSON 렌더러로 동작
+    orjson = None
+
+COLUMNAR_QUERY_PARAM = 'shape'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    NumPy arrays and scalars, UUIDs and non-string dict keys are serialized
+    natively in C; datetimes, Decimals and anything else orjson does not know
+    go through DRF's encoder, and U+2028/U+2029 are escaped as DRF does.
+    The output parses to the same values as ``JSONRenderer`` but is not
+    byte-identical:
+
+    - NaN and +/-Infinity render as ``null``; ``JSONRenderer`` raises
+      ValueError for them (STRICT_JSON).
+    - Float exponents are written without ``+`` or zero padding (``1e16``,
+      ``1e-7``).
+
+    Indented output (browsable API, ``; indent=``) and integers beyond 64 bits
+    use the stock renderer.
+    """
+    options = 0 if orjson is None else (
+        orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=self.options)
+        except orjson.JSONEncodeError:
+            # 64비트를 넘는 정수 등 orjson이 처리하지 못하는 값
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer와 동일하게 JavaScript 줄 구분 문자 이스케이프
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+def wants_columnar(request):
+    """True when the client asked for ``?shape=columnar``"""
+    return request.query_params.get(COLUMNAR_QUERY_PARAM) == 'columnar'
+
+
+def _is_number(value):
+    # 흔한 int/float는 ABC 검사 없이 바로 판정
+    return type(value) in (int, float) or (
+        isinstance(value, numbers.Real) and not isinstance(value, bool)
+    )
+
+
+def to_columnar(rows):
+    """
+    Turn a list of dicts into a dict of columns.
+
+    ``[{'weight': 0.1, 'rankings': {'A': 1}}, ...]`` becomes
+    ``{'weight': [0.1, ...], 'rankings': {'A': [1, ...]}}``. Nested dicts are
+    columnarized recursively, and purely numeric columns become float64 arrays
+    that the renderer writes without per-element Python work (integer arrays
+    when every value is integral).
+    """
+    rows = list(rows)
+    keys = list(dict.fromkeys(key for row in rows for key in row))
+    columns = {}
+    for key in keys:
+        values = [row.get(key) for row in rows]
+        if values and all(isinstance(value, dict) for value in values):
+            columns[key] = to_columnar(values)
+        elif values and all(_is_number(value) for value in values):
+            column = np.asarray(values)
+            columns[key] = column if column.dtype.kind in 'iu' else column.astype(np.float64, copy=False)
+        else:
+            columns[key] = values
+    return columns
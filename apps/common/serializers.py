@@ -0,0 +1,29 @@
+"""
+Serializers for Common API
+"""
+from rest_framework import serializers
+
+from .models import ActivityLog, Notification
+
+
+class ActivityLogSerializer(serializers.ModelSerializer):
+    user_username = serializers.CharField(source='user.username', read_only=True, default=None)
+
+    class Meta:
+        model = ActivityLog
+        fields = [
+            'id', 'user', 'user_username', 'action', 'level', 'object_id',
+            'message', 'details', 'request_path', 'timestamp'
+        ]
+        read_only_fields = fields
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Notification
+        fields = [
+            'id', 'title', 'message', 'type', 'is_read', 'is_important',
+            'action_url', 'action_label', 'object_id', 'created_at', 'expires_at', 'read_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,76 @@
+"""
+Worker startup helpers
+
+Schema changes run once per deploy (``manage.py migrate_locked``) under a
+database advisory lock instead of inside every process that imports Django.
+Workers only load code, optionally warm the URLconf, and record how long
+their cold start took.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 워커별 기동 측정값 (헬스체크에서 노출)
+_worker_startup = {}
+
+
+@contextmanager
+def migration_lock(using='default'):
+    """
+    Hold a session-level advisory lock while schema work runs.
+
+    Concurrent deploy steps or workers wait for the first one to finish and
+    then find nothing left to migrate. Only PostgreSQL has advisory locks;
+    other backends run unguarded.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        yield
+        return
+
+    lock_id = settings.MIGRATION_LOCK_ID
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_lock(%s)', [lock_id])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s)', [lock_id])
+
+
+def warm_up():
+    """Import the URLconf (and with it every view module) before the first request"""
+    from django.urls import get_resolver
+
+    started = time.perf_counter()
+    get_resolver().url_patterns
+    return time.perf_counter() - started
+
+
+def record_worker_ready(started, django_seconds, urlconf_seconds=None):
+    """Log and keep the cold-start timings of this worker process"""
+    total = time.perf_counter() - started
+    _worker_startup.update({
+        'pid': os.getpid(),
+        'ready_at': timezone.now().isoformat(),
+        'cold_start_ms': round(total * 1000, 1),
+        'django_setup_ms': round(django_seconds * 1000, 1),
+        'urlconf_ms': round(urlconf_seconds * 1000, 1) if urlconf_seconds is not None else None,
+    })
+    logger.info(
+        'Worker %s ready in %.0f ms (django setup %.0f ms, urlconf %s)',
+        os.getpid(), total * 1000, django_seconds * 1000,
+        f'{urlconf_seconds * 1000:.0f} ms' if urlconf_seconds is not None else 'deferred',
+    )
+
+
+def worker_startup_info():
+    """Cold-start timings of the current process, empty when not started through WSGI"""
+    return dict(_worker_startup)
@@ -0,0 +1,173 @@
+"""
+Sliding-window request throttles backed by the Django cache
+
+The estimate for the last ``duration`` seconds is the current fixed window's
+count plus the previous window's count weighted by how much of it still
+overlaps. This needs two cache keys per client and one atomic ``incr`` per
+admitted request, and no database access. Limits are shared across workers
+when CACHES points at a shared backend (REDIS_URL); with the default
+local-memory cache each worker enforces its own copy of the limit.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .models import APIKey
+from .usage import get_usage_buffer
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'100/hour' -> (100, 3600)"""
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """Base class: subclasses provide ``get_rate`` and ``get_cache_key``"""
+
+    cache = cache
+    timer = time.time
+
+    def get_rate(self, request, view):
+        """(requests, seconds) or None for no limit"""
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self._wait = None
+        rate = self.get_rate(request, view)
+        if rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        limit, duration = rate
+        now = self.timer()
+        window = int(now // duration)
+        elapsed = (now % duration) / duration
+        current_key, previous_key = f'{key}:{window}', f'{key}:{window - 1}'
+        counts = self.cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+
+        if previous * (1 - elapsed) + current >= limit:
+            self._wait = self._wait_time(limit, duration, previous, current, elapsed)
+            return False
+
+        # add()는 키가 없을 때만 생성하고 incr()은 백엔드에서 원자적으로 증가
+        self.cache.add(current_key, 0, timeout=duration * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, timeout=duration * 2)
+        return True
+
+    @staticmethod
+    def _wait_time(limit, duration, previous, current, elapsed):
+        remaining = (1 - elapsed) * duration
+        if limit <= 0:
+            # rate_limit=0 / '0/min': 모든 요청 거부, 현재 윈도우가 끝날 때 다시 확인
+            return remaining
+        if current >= limit:
+            # 다음 윈도우에서 current가 previous가 되어 가중치가 limit 아래로 내려갈 때까지
+            return remaining + (1 - limit / current) * duration
+        # previous * (1 - f) + current < limit 이 되는 시점 f
+        needed = 1 - (limit - current) / previous
+        return max(0.0, min(remaining, (needed - elapsed) * duration))
+
+    def wait(self):
+        return self._wait
+
+
+API_KEY_HEADER = 'HTTP_X_API_KEY'
+API_KEY_CACHE_SECONDS = 60
+
+
+def resolve_api_key(raw_key):
+    """
+    ``{'id', 'user_id', 'rate_limit'}`` of an active, unexpired API key, or None
+
+    Cached for API_KEY_CACHE_SECONDS under a SHA-256 digest of the key (the
+    key itself never appears in a cache key); unknown keys are cached too.
+    """
+    cache_key = f"api_key:{hashlib.sha256(raw_key.encode()).hexdigest()}"
+    entry = cache.get(cache_key)
+    if entry is None:
+        api_key = APIKey.objects.filter(key=raw_key, is_active=True).only(
+            'id', 'user_id', 'rate_limit', 'expires_at'
+        ).first()
+        entry = {} if api_key is None else {
+            'id': str(api_key.pk), 'user_id': api_key.user_id,
+            'rate_limit': api_key.rate_limit, 'expires_at': api_key.expires_at,
+        }
+        cache.set(cache_key, entry, API_KEY_CACHE_SECONDS)
+    if not entry or (entry['expires_at'] and entry['expires_at'] < timezone.now()):
+        return None
+    return entry
+
+
+class APIKeyRateThrottle(SlidingWindowThrottle):
+    """
+    ``APIKey.rate_limit`` requests per hour for requests that name an API key
+
+    The ``X-API-Key`` header only selects the quota: it does not authenticate,
+    and it counts only when the key belongs to the user the request is
+    authenticated as (JWT or session). Admitted calls are counted in the
+    in-process usage buffer and flushed to APIKey.usage_count and
+    SubscriptionUsage.monthly_api_calls. A negative rate_limit means
+    unlimited. Other requests are not affected.
+    """
+
+    def _api_key(self, request):
+        if not hasattr(request, '_throttle_api_key'):
+            raw_key = request.META.get(API_KEY_HEADER)
+            entry = resolve_api_key(raw_key) if raw_key else None
+            if entry is not None and not (request.user and entry['user_id'] == request.user.pk):
+                entry = None
+            request._throttle_api_key = entry
+        return request._throttle_api_key
+
+    def get_rate(self, request, view):
+        api_key = self._api_key(request)
+        if api_key is None or api_key['rate_limit'] < 0:
+            return None
+        return api_key['rate_limit'], DURATIONS['h']
+
+    def get_cache_key(self, request, view):
+        return f"throttle:api_key:{self._api_key(request)['id']}"
+
+    def allow_request(self, request, view):
+        allowed = super().allow_request(request, view)
+        api_key = self._api_key(request)
+        if allowed and api_key is not None:
+            get_usage_buffer().record_api_call(api_key['id'], api_key['user_id'])
+        return allowed
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Per-user (per-IP when anonymous) limit for views that set ``throttle_scope``
+
+    Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'][scope], e.g. '60/min'.
+    """
+
+    def get_rate(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        return parse_rate(rate) if rate else None
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'throttle:{view.throttle_scope}:{ident}'
@@ -1,12 +1,21 @@
 """
 URLs for Common API endpoints
 """
-from django.urls import path
-from . import health_views
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+from . import health_views, views
+
+# SimpleRouter: 이 URLconf는 루트('')에도 포함되므로 API root 뷰를 만들지 않음
+router = SimpleRouter()
+router.register(r'activity-logs', views.ActivityLogViewSet, basename='activity-log')
+router.register(r'notifications', views.NotificationViewSet, basename='notification')
 
 urlpatterns = [
     # Health check endpoints
     path('health/', health_views.health_check, name='health-check'),
     path('db-status/', health_views.db_status, name='db-status'),
     path('status/', health_views.api_status, name='api-status'),
+    
+    # Notifications / activity log
+    path('', include(router.urls)),
 ]
\ No newline at end of file
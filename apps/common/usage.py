@@ -0,0 +1,136 @@
+"""
+Buffered API usage counters
+
+Calls admitted by APIKeyRateThrottle are counted in process memory. Every
+``API_USAGE_FLUSH_INTERVAL_SECONDS`` a daemon thread writes one ``F()``
+increment per API key (``usage_count``, ``last_used_at``) and per subscriber
+(``SubscriptionUsage.monthly_api_calls``). This replaces a read-modify-write
+on every call. Counts that fail to write are kept for the next flush.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class UsageBuffer:
+    """Per-process API call counters flushed periodically with F() updates"""
+
+    def __init__(self, interval=10.0, background=True):
+        self.interval = interval
+        self.background = background
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._keys = Counter()
+        self._users = Counter()
+        self._last_used = {}
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+
+    def record_api_call(self, api_key_id, user_id):
+        if self.background:
+            self._ensure_thread()
+        with self._lock:
+            self._keys[api_key_id] += 1
+            self._users[user_id] += 1
+            self._last_used[api_key_id] = timezone.now()
+
+    def pending(self):
+        with self._lock:
+            return {'api_keys': len(self._keys), 'api_calls': sum(self._keys.values())}
+
+    def flush(self):
+        """Write the accumulated counts (calling thread)"""
+        from apps.subscriptions.models import SubscriptionUsage
+        from .models import APIKey
+
+        with self._flush_lock:
+            with self._lock:
+                keys, self._keys = self._keys, Counter()
+                users, self._users = self._users, Counter()
+                last_used, self._last_used = self._last_used, {}
+            if not keys and not users:
+                return
+
+            failed_keys, failed_users, failed_last_used = Counter(), Counter(), {}
+            error = None
+            try:
+                close_old_connections()
+                for api_key_id, count in keys.items():
+                    try:
+                        APIKey(pk=api_key_id).record_usage(count, last_used[api_key_id])
+                    except Exception as e:
+                        error = e
+                        failed_keys[api_key_id] = count
+                        failed_last_used[api_key_id] = last_used[api_key_id]
+                for user_id, count in users.items():
+                    try:
+                        SubscriptionUsage.objects.filter(subscription__user_id=user_id).update(
+                            monthly_api_calls=F('monthly_api_calls') + count
+                        )
+                    except Exception as e:
+                        error = e
+                        failed_users[user_id] = count
+            finally:
+                close_old_connections()
+
+            if error is not None:
+                logger.error(
+                    'Failed to flush API usage for %d keys / %d users; keeping them for the next flush',
+                    len(failed_keys), len(failed_users), exc_info=error,
+                )
+                # 기록하지 못한 카운트만 다음 주기에 다시 시도 (기록된 행은 다시 보내지 않음)
+                with self._lock:
+                    self._keys.update(failed_keys)
+                    self._users.update(failed_users)
+                    for api_key_id, used_at in failed_last_used.items():
+                        self._last_used.setdefault(api_key_id, used_at)
+
+    def shutdown(self):
+        self._stopping.set()
+        self.flush()
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != pid:
+                # fork 이후: 부모 프로세스의 카운트는 부모가 기록함
+                self._keys, self._users, self._last_used = Counter(), Counter(), {}
+            if self._pid is None:
+                atexit.register(self.shutdown)
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='api-usage-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.flush()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_usage_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = UsageBuffer(
+                    interval=settings.API_USAGE_FLUSH_INTERVAL_SECONDS,
+                    background=settings.API_USAGE_BACKGROUND_FLUSH,
+                )
+    return _buffer
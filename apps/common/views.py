@@ -0,0 +1,57 @@
+"""
+Views for Common API
+"""
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .models import ActivityLog, Notification
+from .pagination import OptInCursorPagination
+from .serializers import ActivityLogSerializer, NotificationSerializer
+
+
+class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
+    """Activity log (own entries; all entries for staff)"""
+
+    serializer_class = ActivityLogSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['action', 'level']
+    pagination_class = OptInCursorPagination
+    cursor_ordering = ('-timestamp', '-id')
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = ActivityLog.objects.select_related('user').order_by('-timestamp', '-id')
+        if user.is_staff or user.is_superuser:
+            return queryset
+        return queryset.filter(user=user)
+
+
+class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    """Notifications for the current user"""
+
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['is_read', 'type']
+    pagination_class = OptInCursorPagination
+    cursor_ordering = ('-created_at', '-id')
+
+    def get_queryset(self):
+        return Notification.objects.filter(recipient=self.request.user).order_by('-created_at', '-id')
+
+    @action(detail=True, methods=['post'])
+    def mark_read(self, request, pk=None):
+        """Mark a notification as read"""
+        notification = self.get_object()
+        notification.mark_read()
+        return Response(self.get_serializer(notification).data)
+
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        """Mark all unread notifications as read"""
+        updated = self.get_queryset().filter(is_read=False).update(is_read=True, read_at=timezone.now())
+        return Response({'updated': updated})
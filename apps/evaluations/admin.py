@@ -10,6 +10,7 @@ from .models import (
     Evaluation, PairwiseComparison, EvaluationSession, 
     EvaluationInvitation, DemographicSurvey
 )
+from .stats import invalidate_evaluator_stats
 
 
 class PairwiseComparisonInline(admin.TabularInline):
@@ -158,7 +159,10 @@ class EvaluationAdmin(admin.ModelAdmin):
     
     def reset_evaluations(self, request, queryset):
         """선택된 평가 초기화"""
+        evaluator_ids = list(queryset.values_list('evaluator_id', flat=True).distinct())
         updated = queryset.update(status='pending', progress=0, started_at=None, completed_at=None)
+        # queryset.update()는 시그널을 보내지 않으므로 캐시된 평가자 통계 직접 무효화
+        invalidate_evaluator_stats(*evaluator_ids)
         self.message_user(request, f'{updated}개의 평가를 초기화했습니다.')
     reset_evaluations.short_description = '선택된 평가 초기화'
     
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class EvaluationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.evaluations'
-    label = 'evaluations'
\ No newline at end of file
+    label = 'evaluations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
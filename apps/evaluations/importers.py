@@ -0,0 +1,433 @@
+"""
+Streaming import of pairwise comparisons from xlsx / CSV
+
+The workbook (first sheet) or CSV file is read in long format, one judgment
+per row::
+
+    respondent        criteria_a   criteria_b   value
+    kim@example.com   비용          품질          3
+    kim@example.com   비용          납기          1/5
+
+``respondent`` is a user's email or username; criteria are matched by name
+within the project. Rows are streamed (openpyxl ``read_only`` / ``csv.reader``)
+and written in chunks with ``bulk_create``, so memory stays bounded by the
+chunk size plus one small entry per respondent and judged pair. Progress is
+reported on the ``FileUpload`` record.
+"""
+import csv
+import logging
+import os
+from collections import Counter
+from fractions import Fraction
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from apps.common.models import FileUpload
+from apps.projects.models import Criteria
+from apps.subscriptions.entitlements import evaluator_allowance, recalculate_usage
+from .models import Evaluation, PairwiseComparison
+from .stats import invalidate_evaluator_stats
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+IMPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+RECIPROCITY_TOLERANCE = 0.01
+MIN_VALUE, MAX_VALUE = 1 / 9, 9.0
+
+# 헤더 별칭 (소문자 비교)
+COLUMN_ALIASES = {
+    'respondent': ('respondent', 'evaluator', 'email', 'username', '응답자', '평가자'),
+    'criteria_a': ('criteria_a', 'criterion_a', 'a', '기준a', '기준 a', '항목a'),
+    'criteria_b': ('criteria_b', 'criterion_b', 'b', '기준b', '기준 b', '항목b'),
+    'value': ('value', 'score', '값', '점수'),
+    'comment': ('comment', '의견', '코멘트'),
+}
+REQUIRED_COLUMNS = ('respondent', 'criteria_a', 'criteria_b', 'value')
+
+
+class ImportFormatError(ValueError):
+    """The file cannot be read as a comparison sheet (bad type or header)"""
+
+
+def iter_rows(path):
+    """Yield rows of the first sheet (xlsx) or of a CSV file as tuples, one at a time"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportFormatError('openpyxl is required to import Excel files')
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            # read_only 모드는 파일 핸들을 유지하므로 명시적으로 닫음
+            workbook.close()
+    elif extension in ('.csv', '.txt'):
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            yield from csv.reader(handle)
+    else:
+        raise ImportFormatError(f'Unsupported file type: {extension or "unknown"}')
+
+
+def parse_value(raw):
+    """Comparison value from a number or a '1/3' style fraction; None when unreadable"""
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        return float(raw)
+    if isinstance(raw, str) and raw.strip():
+        try:
+            return float(Fraction(raw.strip()))
+        except (ValueError, ZeroDivisionError):
+            return None
+    return None
+
+
+def _column_index(header):
+    labels = [str(cell).strip().lower() if cell is not None else '' for cell in header]
+    index = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        for position, label in enumerate(labels):
+            if label in aliases:
+                index[column] = position
+                break
+    missing = [column for column in REQUIRED_COLUMNS if column not in index]
+    if missing:
+        raise ImportFormatError(f"Missing column(s): {', '.join(missing)}")
+    return index
+
+
+class ComparisonImporter:
+    """
+    Import one uploaded comparison sheet into a project.
+
+    Criteria names are resolved with one query up front; respondents and
+    their evaluations are resolved per chunk (one lookup each), then the
+    chunk's comparisons are upserted with a single ``bulk_create``.
+    """
+
+    def __init__(self, upload, project, chunk_size=IMPORT_CHUNK_SIZE, create_respondents=False):
+        self.upload = upload
+        self.project = project
+        self.chunk_size = chunk_size
+        self.create_respondents = create_respondents
+
+        self.criteria = {}
+        group_sizes = Counter()
+        for pk, name, parent_id, criteria_type in Criteria.objects.filter(
+            project=project, is_active=True
+        ).values_list('pk', 'name', 'parent_id', 'type'):
+            self.criteria[name.strip().lower()] = (pk, parent_id)
+            group_sizes[parent_id, criteria_type] += 1
+        # 완료 판단 기준: 같은 부모(와 유형)를 가진 형제 항목끼리의 모든 쌍
+        self.required_pairs = sum(n * (n - 1) // 2 for n in group_sizes.values())
+        self.evaluations = {}  # respondent label -> evaluation id (None: 알 수 없는 응답자)
+        self.judged = {}       # (label, a, b) -> normalized value, 상호성 검사용
+        self.created_evaluation_ids = []
+        self.evaluator_ids = set()
+        self.over_limit = set()  # 프로젝트 평가자 한도를 넘어 가져오지 않은 응답자
+
+        self.rows_read = 0
+        self.comparisons_saved = 0
+        self.errors = []
+        self.error_count = 0
+
+    def run(self):
+        """Stream the file and import it; returns the processing summary"""
+        rows = iter_rows(self.upload.file_path)
+        header = next(rows, None)
+        if header is None:
+            raise ImportFormatError('The file is empty')
+        columns = _column_index(header)
+
+        self._set_status('processing')
+        chunk = []
+        for line_number, row in enumerate(rows, start=2):
+            if not any(cell not in (None, '') for cell in row):
+                continue
+            self.rows_read += 1
+            judgment = self._parse_row(line_number, row, columns)
+            if judgment is not None:
+                chunk.append(judgment)
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        if chunk:
+            self._flush(chunk)
+
+        self._finish_evaluations()
+        return self.summary()
+
+    def summary(self):
+        return {
+            'rows_read': self.rows_read,
+            'comparisons_saved': self.comparisons_saved,
+            'respondents': sum(1 for pk in self.evaluations.values() if pk),
+            'evaluations_created': len(self.created_evaluation_ids),
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+    def _error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': line_number, 'error': message})
+
+    def _cell(self, row, columns, name):
+        position = columns.get(name)
+        if position is None or position >= len(row):
+            return None
+        return row[position]
+
+    def _parse_row(self, line_number, row, columns):
+        """Validate one row; returns (line, respondent, a, b, value, comment) or None"""
+        respondent = str(self._cell(row, columns, 'respondent') or '').strip()
+        name_a = str(self._cell(row, columns, 'criteria_a') or '').strip().lower()
+        name_b = str(self._cell(row, columns, 'criteria_b') or '').strip().lower()
+        value = parse_value(self._cell(row, columns, 'value'))
+
+        if not respondent:
+            self._error(line_number, 'Missing respondent')
+            return None
+        criteria_a, criteria_b = self.criteria.get(name_a), self.criteria.get(name_b)
+        if criteria_a is None or criteria_b is None:
+            unknown = name_a if criteria_a is None else name_b
+            self._error(line_number, f"Unknown criteria '{unknown}'")
+            return None
+        if criteria_a[0] == criteria_b[0]:
+            self._error(line_number, 'A criterion cannot be compared with itself')
+            return None
+        if criteria_a[1] != criteria_b[1]:
+            self._error(line_number, 'Compared criteria must share the same parent')
+            return None
+        if value is None:
+            self._error(line_number, 'Value is not a number')
+            return None
+        # 부동소수 입력(0.1111 등)을 고려한 허용 오차
+        if not (MIN_VALUE - 1e-3 <= value <= MAX_VALUE + 1e-3):
+            self._error(line_number, 'Value must be between 1/9 and 9')
+            return None
+        value = min(max(value, MIN_VALUE), MAX_VALUE)
+
+        # PairwiseComparison.save()와 같은 정규화: criteria_a가 작은 ID
+        a, b = criteria_a[0], criteria_b[0]
+        if a > b:
+            a, b, value = b, a, 1.0 / value
+
+        key = (respondent.lower(), a, b)
+        previous = self.judged.get(key)
+        if previous is not None:
+            # 같은 쌍이 양방향으로 주어졌다면 a_ij * a_ji = 1 이어야 함
+            if abs(previous - value) > RECIPROCITY_TOLERANCE * max(previous, value):
+                self._error(line_number, 'Reciprocal judgment does not match an earlier row for the same pair')
+            return None
+        self.judged[key] = value
+
+        comment = self._cell(row, columns, 'comment')
+        return line_number, key[0], a, b, value, str(comment).strip() if comment else ''
+
+    def _flush(self, chunk):
+        """Resolve the chunk's respondents and upsert its comparisons"""
+        self._resolve_respondents({judgment[1] for judgment in chunk})
+
+        now = timezone.now()
+        comparisons = []
+        for line_number, label, a, b, value, comment in chunk:
+            evaluation_id = self.evaluations.get(label)
+            if evaluation_id is None:
+                if label in self.over_limit:
+                    self._error(line_number, f"Evaluator limit of the subscription plan reached for '{label}'")
+                else:
+                    self._error(line_number, f"Unknown respondent '{label}'")
+                continue
+            comparisons.append(PairwiseComparison(
+                evaluation_id=evaluation_id, criteria_a_id=a, criteria_b_id=b,
+                value=value, comment=comment, answered_at=now,
+            ))
+
+        with transaction.atomic():
+            # 재가져오기 시 기존 응답을 덮어씀
+            PairwiseComparison.objects.bulk_create(
+                comparisons,
+                update_conflicts=True,
+                unique_fields=['evaluation', 'criteria_a', 'criteria_b'],
+                update_fields=['value', 'comment', 'answered_at'],
+            )
+        self.comparisons_saved += len(comparisons)
+        self._set_status('processing')
+
+    def _resolve_respondents(self, labels):
+        """Map new respondent labels to evaluation ids (one user and one evaluation lookup)"""
+        labels = [label for label in labels if label not in self.evaluations]
+        if not labels:
+            return
+
+        users = {}
+        emails = [label for label in labels if '@' in label]
+        usernames = [label for label in labels if '@' not in label]
+        # 라벨은 소문자이므로 대소문자를 구분하지 않고 비교 (Kim@Example.com 등)
+        for email, pk in User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=emails
+        ).order_by('-is_active', 'pk').values_list('email_lower', 'pk'):
+            users.setdefault(email, pk)
+        for username, pk in User.objects.annotate(username_lower=Lower('username')).filter(
+            username_lower__in=usernames
+        ).order_by('-is_active', 'pk').values_list('username_lower', 'pk'):
+            users.setdefault(username, pk)
+
+        missing = [label for label in labels if label not in users]
+        # 한도를 넘는 응답자는 평가도, 플레이스홀더 사용자도 만들지 않음
+        self._apply_evaluator_limit(labels, users, missing)
+        if missing and self.create_respondents:
+            users.update(self._create_respondents(missing))
+
+        existing = dict(Evaluation.objects.filter(
+            project=self.project, evaluator_id__in=users.values()
+        ).values_list('evaluator_id', 'pk'))
+        new_evaluations = [
+            Evaluation(
+                project=self.project, evaluator_id=user_id,
+                title=f'{self.project.title} (imported)',
+                status='in_progress', started_at=timezone.now(),
+                metadata={'imported_from': str(self.upload.pk)},
+            )
+            for user_id in set(users.values()) if user_id not in existing
+        ]
+        Evaluation.objects.bulk_create(new_evaluations, batch_size=500)
+        for evaluation in new_evaluations:
+            existing[evaluation.evaluator_id] = evaluation.pk
+            self.created_evaluation_ids.append(evaluation.pk)
+
+        for label in labels:
+            user_id = users.get(label)
+            self.evaluations[label] = existing.get(user_id) if user_id else None
+            if user_id:
+                self.evaluator_ids.add(user_id)
+
+    def _apply_evaluator_limit(self, labels, users, missing):
+        """
+        Drop respondents that would take the project past the owner's
+        per-project evaluator limit (labels in sorted order, so re-runs agree).
+        Removes them from ``users`` / ``missing`` and records them in ``over_limit``.
+        """
+        allowance = evaluator_allowance(self.project.owner_id, self.project.pk)
+        if allowance is None:
+            return
+        limit, current = allowance
+        remaining = limit - len(current)
+        creatable = set(missing) if self.create_respondents else set()
+        for label in sorted(labels):
+            user_id = users.get(label)
+            if user_id in current or (user_id is None and label not in creatable):
+                continue  # 이미 이 프로젝트의 평가자이거나 어차피 가져오지 않는 응답자
+            if remaining > 0:
+                remaining -= 1
+                if user_id is not None:
+                    current.add(user_id)
+                continue
+            users.pop(label, None)
+            if label in creatable:
+                missing.remove(label)
+            self.over_limit.add(label)
+
+    def _create_respondents(self, labels):
+        """Create inactive placeholder users for respondents without an account"""
+        taken = set(User.objects.filter(username__in=[
+            label.split('@')[0][:150] for label in labels
+        ]).values_list('username', flat=True))
+        new_users = []
+        for label in labels:
+            username = label.split('@')[0][:150]
+            if username in taken:
+                username = f"{username[:130]}_{os.urandom(4).hex()}"
+            taken.add(username)
+            new_users.append(User(
+                username=username, email=label if '@' in label else '', is_active=False
+            ))
+        User.objects.bulk_create(new_users, batch_size=500)
+        user_ids = dict(User.objects.filter(
+            username__in=[user.username for user in new_users]
+        ).values_list('username', 'pk'))
+        return {label: user_ids[user.username] for label, user in zip(labels, new_users)}
+
+    def _finish_evaluations(self):
+        """
+        Set progress of the imported evaluations from their answered pairs
+
+        An evaluation is completed only when every sibling pair of the
+        project's active criteria has a comparison; evaluations completed
+        earlier are left as they are.
+        """
+        evaluation_ids = {pk for pk in self.evaluations.values() if pk}
+        if evaluation_ids and self.required_pairs:
+            now = timezone.now()
+            evaluations = list(Evaluation.objects.filter(
+                pk__in=evaluation_ids, status__in=['pending', 'in_progress']
+            ).annotate(answered=Count('pairwise_comparisons', filter=Q(
+                pairwise_comparisons__criteria_a__is_active=True,
+                pairwise_comparisons__criteria_b__is_active=True,
+            ))).only('pk', 'status', 'progress', 'started_at', 'completed_at'))
+            for evaluation in evaluations:
+                evaluation.progress = min(evaluation.answered / self.required_pairs, 1.0) * 100
+                if evaluation.started_at is None:
+                    evaluation.started_at = now
+                if evaluation.progress == 100:
+                    evaluation.status, evaluation.completed_at = 'completed', now
+                else:
+                    evaluation.status = 'in_progress'
+            Evaluation.objects.bulk_update(
+                evaluations, ['status', 'progress', 'started_at', 'completed_at'], batch_size=500
+            )
+        if self.evaluator_ids:
+            invalidate_evaluator_stats(*self.evaluator_ids)
+        if self.created_evaluation_ids:
+            # bulk_create로 만든 평가는 시그널을 거치지 않으므로 소유자 사용량 재집계
+            recalculate_usage(self.project.owner_id)
+
+    def _set_status(self, status):
+        FileUpload.objects.filter(pk=self.upload.pk).update(
+            status=status, processing_results=self.summary()
+        )
+
+
+def discard_upload_file(upload):
+    """Remove the stored sheet of an import that reached a final state"""
+    try:
+        os.remove(upload.file_path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.warning('Could not remove import file %s', upload.file_path, exc_info=True)
+
+
+def import_comparison_upload(upload_id, create_respondents=False):
+    """
+    Run the import for a stored FileUpload; failures are recorded on the upload.
+
+    The uploaded file is deleted once the upload is completed or failed.
+    """
+    from apps.projects.models import Project
+
+    upload = FileUpload.objects.get(pk=upload_id)
+    try:
+        project = Project.objects.get(pk=upload.metadata.get('project_id'))
+        importer = ComparisonImporter(upload, project, create_respondents=create_respondents)
+        upload.processing_results = importer.run()
+    except (ImportFormatError, Project.DoesNotExist) as e:
+        upload.refresh_from_db()
+        upload.mark_failed(str(e))
+    except Exception as e:
+        logger.exception('Comparison import %s failed', upload_id)
+        upload.refresh_from_db()
+        upload.mark_failed(f'Import failed: {e}')
+    else:
+        upload.mark_completed()
+    discard_upload_file(upload)
+    return upload
@@ -0,0 +1,48 @@
+"""
+EvaluationInvitation.bulk_invitation backfill command
+"""
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.evaluations.models import BulkInvitation, EvaluationInvitation
+
+
+class Command(BaseCommand):
+    help = 'Link invitations to their bulk invitation from metadata["bulk_invitation_id"] (batched writes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk UPDATE')
+        parser.add_argument('--dry-run', action='store_true', help='Report unlinked rows without writing')
+
+    def handle(self, *args, **options):
+        rows = EvaluationInvitation.objects.filter(
+            bulk_invitation__isnull=True, metadata__has_key='bulk_invitation_id'
+        ).values_list('pk', 'metadata__bulk_invitation_id')
+
+        links = {}
+        for pk, raw_id in rows.iterator(chunk_size=options['batch_size']):
+            try:
+                links[pk] = uuid.UUID(str(raw_id))
+            except ValueError:
+                continue
+        # 이미 삭제된 대량 초대를 가리키는 행은 건너뜀
+        existing = set(BulkInvitation.objects.filter(pk__in=set(links.values())).values_list('pk', flat=True))
+        stale = [
+            EvaluationInvitation(pk=pk, bulk_invitation_id=bulk_id)
+            for pk, bulk_id in links.items() if bulk_id in existing
+        ]
+
+        if stale and not options['dry_run']:
+            with transaction.atomic():
+                EvaluationInvitation.objects.bulk_update(
+                    stale, ['bulk_invitation'], batch_size=options['batch_size']
+                )
+            for bulk_id in {invitation.bulk_invitation_id for invitation in stale}:
+                BulkInvitation.invalidate_status_snapshot(bulk_id)
+
+        verb = 'Would link' if options['dry_run'] else 'Linked'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(stale)} invitations ({len(links) - len(stale)} point to missing bulk invitations)"
+        ))
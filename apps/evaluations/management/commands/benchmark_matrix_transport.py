@@ -0,0 +1,123 @@
+"""
+Payload size and parse/render time of the two comparison transports
+
+Builds ``--evaluators`` seeded random ``--criteria`` x ``--criteria``
+matrices and encodes them as the JSON comparison objects the frontend uploads,
+as the objects PairwiseComparisonSerializer returns, and as the compact matrix
+payload (application/vnd.ahp.matrix+json), then times the DRF parser and
+renderer used for each:
+
+    python manage.py benchmark_matrix_transport
+    python manage.py benchmark_matrix_transport --criteria 10 --evaluators 200 --output transport.json
+
+No database access; the numbers cover the wire format only.
+"""
+
+import io
+import json
+import statistics
+import timeit
+import uuid
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+
+from apps.analysis.management.commands.benchmark_ahp import random_matrix
+from apps.common.renderers import FastJSONRenderer
+from apps.evaluations.matrix_format import MatrixParser, MatrixRenderer, pack_upper_triangle
+
+
+def comparison_objects(matrices, criteria_ids):
+    """Download shape: one PairwiseComparisonSerializer dict per answered pair"""
+    answered_at = timezone.now().isoformat()
+    rows, cols = np.triu_indices(len(criteria_ids), k=1)
+    return [
+        {
+            'id': str(uuid.uuid4()), 'evaluation': str(uuid.uuid4()),
+            'criteria_a': criteria_ids[i], 'criteria_b': criteria_ids[j],
+            'criteria_a_name': f'Criterion {criteria_ids[i]}', 'criteria_b_name': f'Criterion {criteria_ids[j]}',
+            'value': float(matrix[i, j]), 'comment': '', 'confidence': 5,
+            'answered_at': answered_at, 'time_spent': 0,
+        }
+        for matrix in matrices for i, j in zip(rows, cols)
+    ]
+
+
+def upload_objects(matrices, criteria_ids):
+    """Upload shape sent by the frontend: ``id``, ``value``, ``comment``, ``confidence`` per pair"""
+    rows, cols = np.triu_indices(len(criteria_ids), k=1)
+    return [
+        {'id': str(uuid.uuid4()), 'value': float(matrix[i, j]), 'comment': '', 'confidence': 5}
+        for matrix in matrices for i, j in zip(rows, cols)
+    ]
+
+
+def matrix_payload(matrices, criteria_ids):
+    """Compact shape: criteria header plus base64 float32 upper triangle per matrix"""
+    return {
+        'dtype': 'float32',
+        'matrices': [
+            {'parent': None, 'criteria': criteria_ids, 'values': pack_upper_triangle(matrix)}
+            for matrix in matrices
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare payload size and parse/render time of JSON comparison objects vs the matrix transport'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--criteria', type=int, default=20, help='Criteria per matrix (n)')
+        parser.add_argument('--evaluators', type=int, default=50, help='Matrices in one payload (k)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timing samples')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write results to this JSON file')
+
+    def handle(self, *args, **options):
+        n, k = options['criteria'], options['evaluators']
+        rng = np.random.default_rng(options['seed'])
+        matrices = [random_matrix(rng, n) for _ in range(k)]
+        criteria_ids = list(range(1, n + 1))
+        self.stdout.write(f"{k} matrices of {n} x {n} ({n * (n - 1) // 2} pairs each)")
+
+        formats = [
+            ('json upload', upload_objects(matrices, criteria_ids), FastJSONRenderer(), JSONParser()),
+            ('json download', comparison_objects(matrices, criteria_ids), FastJSONRenderer(), JSONParser()),
+            ('matrix', matrix_payload(matrices, criteria_ids), MatrixRenderer(), MatrixParser()),
+        ]
+        results = []
+        for name, data, renderer, parser in formats:
+            body = renderer.render(data)
+            result = {
+                'format': name,
+                'media_type': renderer.media_type,
+                'bytes': len(body),
+                'render_ms': self._time(lambda: renderer.render(data), options['repeat']),
+                'parse_ms': self._time(lambda: parser.parse(io.BytesIO(body)), options['repeat']),
+            }
+            results.append(result)
+            self.stdout.write(
+                f"{name:>13}: {result['bytes'] / 1024:.1f} KB, "
+                f"parse {result['parse_ms']:.3f} ms, render {result['render_ms']:.3f} ms"
+            )
+
+        compact = results[-1]
+        for verbose in results[:-1]:
+            self.stdout.write(
+                f"matrix vs {verbose['format']}: {verbose['bytes'] / compact['bytes']:.1f}x smaller, "
+                f"parses {verbose['parse_ms'] / compact['parse_ms']:.1f}x faster"
+            )
+
+        if options['output']:
+            report = {'criteria': n, 'evaluators': k, 'seed': options['seed'], 'results': results}
+            with open(options['output'], 'w', encoding='utf-8') as fp:
+                json.dump(report, fp, indent=2)
+            self.stdout.write(f"results written to {options['output']}")
+
+    def _time(self, func, repeat):
+        timer = timeit.Timer(func)
+        loops, _ = timer.autorange()
+        return statistics.median(total / loops for total in timer.repeat(repeat, loops)) * 1000
@@ -0,0 +1,25 @@
+"""
+Email retry worker management command
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.evaluations.tasks import process_due_retries
+
+
+class Command(BaseCommand):
+    help = 'Resend failed invitation emails whose backoff has elapsed (safe to run several workers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting after one pass')
+        parser.add_argument('--interval', type=float, default=30.0, help='Seconds between passes with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_due_retries()
+            if processed:
+                self.stdout.write(f"Processed {processed} email retries")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
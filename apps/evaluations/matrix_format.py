@@ -0,0 +1,204 @@
+"""
+Compact pairwise comparison matrix transport
+
+Media type ``application/vnd.ahp.matrix+json``::
+
+    {
+        "dtype": "float32",
+        "matrices": [
+            {
+                "parent": 12,              // 상위 기준 ID (루트는 null)
+                "criteria": [31, 32, 33],  // 행/열 순서
+                "values": "<base64>"       // 상삼각(대각 제외) 행 우선, little-endian float32
+            }
+        ]
+    }
+
+``values`` holds ``n * (n - 1) / 2`` numbers: entry (i, j) with i < j means
+"criteria[i] compared to criteria[j]". NaN marks a pair that has no answer.
+"""
+import base64
+import json
+from collections import defaultdict
+
+import numpy as np
+from django.utils import timezone
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.parsers import BaseParser
+
+from apps.common.renderers import FastJSONRenderer
+from .models import PairwiseComparison
+
+MATRIX_MEDIA_TYPE = 'application/vnd.ahp.matrix+json'
+MATRIX_DTYPE = np.dtype('<f4')
+
+
+def pack_upper_triangle(matrix):
+    """Base64 of the strict upper triangle of an (n, n) matrix as float32"""
+    matrix = np.asarray(matrix)
+    upper = matrix[np.triu_indices(matrix.shape[0], k=1)]
+    return base64.b64encode(upper.astype(MATRIX_DTYPE).tobytes()).decode('ascii')
+
+
+def unpack_upper_triangle(encoded, n):
+    """Decode ``values`` into a float64 vector of length n(n-1)/2"""
+    try:
+        upper = np.frombuffer(base64.b64decode(encoded, validate=True), dtype=MATRIX_DTYPE)
+    except (ValueError, TypeError) as e:
+        raise ParseError(f'Invalid matrix values: {e}')
+    expected = n * (n - 1) // 2
+    if upper.size != expected:
+        raise ParseError(f'Matrix values length {upper.size} does not match {n} criteria (expected {expected})')
+    return upper.astype(np.float64)
+
+
+def values_in_scale(values):
+    """True when every answered value (NaN is unanswered) lies on the 1/9..9 scale"""
+    values = np.asarray(values, dtype=np.float64)
+    answered = values[~np.isnan(values)]
+    # float32 반올림을 고려한 허용 오차
+    return bool(np.all((answered >= 1 / 9 - 1e-6) & (answered <= 9 + 1e-6)))
+
+
+def reciprocal_matrix(n, upper):
+    """Full reciprocal (n, n) matrix from an upper-triangle vector; missing pairs become 1"""
+    matrix = np.ones((n, n))
+    rows, cols = np.triu_indices(n, k=1)
+    values = np.where(np.isnan(upper), 1.0, upper)
+    matrix[rows, cols] = values
+    matrix[cols, rows] = 1.0 / values
+    return matrix
+
+
+def comparisons_to_matrices(comparisons, criteria_order=None):
+    """
+    Group comparisons by parent criterion and pack each group as one matrix.
+
+    Args:
+        comparisons: PairwiseComparison 목록 (criteria_a/criteria_b select_related 권장)
+        criteria_order: 선택적 {criteria_id: 정렬 키}; 기본은 (order, id)
+    """
+    groups = defaultdict(dict)
+    keys = {}
+    for comparison in comparisons:
+        parent = comparison.criteria_a.parent_id
+        for criteria in (comparison.criteria_a, comparison.criteria_b):
+            keys[criteria.id] = (criteria_order or {}).get(criteria.id, (criteria.order, criteria.id))
+        groups[parent][(comparison.criteria_a_id, comparison.criteria_b_id)] = comparison.value
+
+    matrices = []
+    for parent, pairs in groups.items():
+        ids = sorted({criteria_id for pair in pairs for criteria_id in pair}, key=keys.__getitem__)
+        index = {criteria_id: i for i, criteria_id in enumerate(ids)}
+        matrix = np.full((len(ids), len(ids)), np.nan)
+        for (a, b), value in pairs.items():
+            i, j = index[a], index[b]
+            if i < j:
+                matrix[i, j] = value
+            else:
+                matrix[j, i] = 1.0 / value if value else np.nan
+        matrices.append({'parent': parent, 'criteria': ids, 'values': pack_upper_triangle(matrix)})
+    return {'dtype': 'float32', 'matrices': matrices}
+
+
+def matrix_pairs(matrix):
+    """
+    Answered pairs of a parsed matrix as ``(criteria_a_id, criteria_b_id, value)``.
+
+    Pairs are normalized like ``PairwiseComparison.save()``: criteria_a has the
+    lower ID and the value is inverted when the order flips.
+    """
+    criteria = matrix['criteria']
+    upper = matrix['upper']
+    rows, cols = np.triu_indices(len(criteria), k=1)
+    answered = ~np.isnan(upper)
+    pairs = []
+    for i, j, value in zip(rows[answered], cols[answered], upper[answered]):
+        a, b, value = criteria[i], criteria[j], float(value)
+        if a > b and value > 0:
+            a, b, value = b, a, 1.0 / value
+        pairs.append((a, b, value))
+    return pairs
+
+
+def apply_matrices(evaluation, matrices):
+    """
+    Upsert the answered pairs of parsed matrices into an evaluation.
+
+    Existing comparisons are updated with one bulk_update and missing pairs
+    are bulk-created. Returns ``(updated, created)``.
+    """
+    from apps.projects.models import Criteria
+
+    pairs = [pair for matrix in matrices for pair in matrix_pairs(matrix)]
+    criteria_ids = {criteria_id for a, b, _ in pairs for criteria_id in (a, b)}
+    known = set(Criteria.objects.filter(
+        project_id=evaluation.project_id, pk__in=criteria_ids
+    ).values_list('pk', flat=True))
+    unknown = criteria_ids - known
+    if unknown:
+        raise ValidationError({'criteria': f'Criteria not in this project: {sorted(unknown)}'})
+    if not values_in_scale([value for _, _, value in pairs]):
+        raise ValidationError({'values': 'Comparison value must be between 1/9 and 9'})
+
+    existing = {
+        (comparison.criteria_a_id, comparison.criteria_b_id): comparison
+        for comparison in evaluation.pairwise_comparisons.all()
+    }
+    now = timezone.now()
+    to_update, to_create = [], []
+    for a, b, value in pairs:
+        value = min(max(value, 1 / 9), 9.0)
+        comparison = existing.get((a, b))
+        if comparison is None:
+            to_create.append(PairwiseComparison(
+                evaluation=evaluation, criteria_a_id=a, criteria_b_id=b, value=value, answered_at=now
+            ))
+        else:
+            comparison.value = value
+            comparison.answered_at = now
+            to_update.append(comparison)
+
+    PairwiseComparison.objects.bulk_update(to_update, ['value', 'answered_at'], batch_size=1000)
+    PairwiseComparison.objects.bulk_create(to_create, batch_size=1000)
+    return len(to_update), len(to_create)
+
+
+class MatrixParser(BaseParser):
+    """Parse the compact matrix payload; ``values`` is decoded into an ``upper`` float array"""
+    media_type = MATRIX_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            data = json.loads(stream.read().decode('utf-8'))
+        except ValueError as e:
+            raise ParseError(f'Matrix payload parse error - {e}')
+
+        matrices = data.get('matrices') if isinstance(data, dict) else None
+        if not isinstance(matrices, list):
+            raise ParseError("Matrix payload requires a 'matrices' list")
+        if data.get('dtype', 'float32') != 'float32':
+            raise ParseError("Only dtype 'float32' is supported")
+
+        for matrix in matrices:
+            criteria = matrix.get('criteria')
+            if (not isinstance(criteria, list) or len(set(criteria)) != len(criteria)
+                    or not all(isinstance(c, int) and not isinstance(c, bool) for c in criteria)):
+                raise ParseError("Each matrix requires a unique 'criteria' list of IDs")
+            matrix['upper'] = unpack_upper_triangle(matrix.get('values', ''), len(criteria))
+        return data
+
+
+class MatrixRenderer(FastJSONRenderer):
+    """Render responses as the compact matrix payload (``Accept`` or ``?format=matrix``)"""
+    media_type = MATRIX_MEDIA_TYPE
+    format = 'matrix'
+
+
+def is_matrix_request(request):
+    """True when the request body was sent in the compact matrix format"""
+    return (request.content_type or '').split(';')[0].strip() == MATRIX_MEDIA_TYPE
+
+
+def wants_matrix_response(request):
+    return getattr(request, 'accepted_renderer', None) is not None and request.accepted_renderer.format == 'matrix'
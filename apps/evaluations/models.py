@@ -3,6 +3,7 @@ Evaluation Models for AHP Platform
 """
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db.models import Q, Count, Avg
@@ -54,6 +55,9 @@ class Evaluation(models.Model):
         db_table = 'evaluations'
         ordering = ['-created_at']
         unique_together = ['project', 'evaluator']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),  # 커서 페이지네이션
+        ]
         
     def __str__(self):
         return f"{self.project.title} - {self.evaluator.username}"
@@ -82,7 +86,7 @@ class Evaluation(models.Model):
         
     def calculate_consistency_ratio(self):
         """Calculate consistency ratio for all pairwise comparisons"""
-        comparisons = self.pairwise_comparisons.all()
+        comparisons = self.pairwise_comparisons.select_related('criteria_a', 'criteria_b')
         if not comparisons:
             return None
             
@@ -167,6 +171,9 @@ class PairwiseComparison(models.Model):
     class Meta:
         db_table = 'pairwise_comparisons'
         unique_together = ['evaluation', 'criteria_a', 'criteria_b']
+        indexes = [
+            models.Index(fields=['answered_at', 'id']),  # 커서 페이지네이션
+        ]
         
     def __str__(self):
         return f"{self.criteria_a.name} vs {self.criteria_b.name}: {self.value}"
@@ -239,6 +246,11 @@ class EvaluationInvitation(models.Model):
     # Token for secure access
     token = models.UUIDField(default=uuid.uuid4, unique=True)
     
+    # Bulk invitation this invitation was created by (indexed FK instead of a metadata lookup)
+    bulk_invitation = models.ForeignKey(
+        'BulkInvitation', on_delete=models.SET_NULL, null=True, blank=True, related_name='invitations'
+    )
+    
     # Additional fields for email tracking
     metadata = models.JSONField(default=dict, blank=True)
     
@@ -249,6 +261,7 @@ class EvaluationInvitation(models.Model):
             models.Index(fields=['token']),
             models.Index(fields=['project', 'status']),
             models.Index(fields=['expires_at']),
+            models.Index(fields=['sent_at', 'id']),  # 커서 페이지네이션
         ]
         
     def __str__(self):
@@ -468,6 +481,43 @@ class BulkInvitation(models.Model):
         if self.started_at and self.completed_at:
             return (self.completed_at - self.started_at).total_seconds()
         return None
+    
+    STATUS_SNAPSHOT_TIMEOUT = 5  # seconds; polling a running send hits the cache
+    
+    @staticmethod
+    def status_cache_key(bulk_invitation_id):
+        return f"bulk_invitation_status:{bulk_invitation_id}"
+    
+    @classmethod
+    def invalidate_status_snapshot(cls, bulk_invitation_id):
+        cache.delete(cls.status_cache_key(bulk_invitation_id))
+    
+    def status_snapshot(self):
+        """Email/acceptance status counts, one GROUP BY per table, cached briefly"""
+        key = self.status_cache_key(self.pk)
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            return snapshot
+        
+        email_counts = dict(
+            self.email_statuses.values_list('status').annotate(total=Count('id')).order_by()
+        )
+        acceptance_counts = dict(
+            self.invitations.values_list('status').annotate(total=Count('id')).order_by()
+        )
+        snapshot = {
+            'email_status': {
+                value: email_counts.get(value, 0)
+                for value, _ in EmailDeliveryStatus.STATUS_CHOICES
+            },
+            'acceptance_status': {
+                value: acceptance_counts.get(value, 0)
+                for value, _ in EvaluationInvitation.STATUS_CHOICES
+            },
+            'updated_at': timezone.now(),
+        }
+        cache.set(key, snapshot, self.STATUS_SNAPSHOT_TIMEOUT)
+        return snapshot
 
 
 class EvaluationTemplate(models.Model):
@@ -574,6 +624,7 @@ class EmailDeliveryStatus(models.Model):
     # Error tracking
     error_message = models.TextField(blank=True)
     retry_count = models.IntegerField(default=0)
+    next_retry_at = models.DateTimeField(null=True, blank=True, help_text="다음 재발송 예정 시각 (없으면 재시도 안 함)")
     
     # Metadata
     metadata = models.JSONField(default=dict)
@@ -581,6 +632,9 @@ class EmailDeliveryStatus(models.Model):
     class Meta:
         db_table = 'email_delivery_status'
         ordering = ['-sent_at']
+        indexes = [
+            models.Index(fields=['status', 'next_retry_at']),
+        ]
         
     def __str__(self):
         return f"Email to {self.invitation.evaluator.email} - {self.status}"
\ No newline at end of file
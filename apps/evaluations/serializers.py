@@ -4,11 +4,13 @@ Serializers for Evaluation API
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.db import models as db_models
+from django.utils import timezone
 from .models import (
     Evaluation, PairwiseComparison, EvaluationInvitation, 
     EvaluationSession, DemographicSurvey, BulkInvitation,
     EvaluationTemplate, EvaluationAccessLog, EmailDeliveryStatus
 )
+from .stats import get_evaluator_stats
 from apps.projects.serializers import ProjectSerializer, CriteriaSerializer
 
 User = get_user_model()
@@ -145,27 +147,66 @@ class EvaluationInvitationSerializer(serializers.ModelSerializer):
         return f'/evaluations/invitation/{obj.token}/'
 
 
+class ComparisonProgressSerializer(serializers.Serializer):
+    """
+    One answered pair in a progress update
+
+    Items are matched to the evaluation's existing comparisons by
+    (criteria_a, criteria_b), in either order; pairs the evaluation does not
+    have are skipped. The former PairwiseComparisonSerializer item shape is
+    still accepted: its ``id``, ``evaluation`` and read-only fields are ignored.
+    """
+    criteria_a = serializers.IntegerField()
+    criteria_b = serializers.IntegerField()
+    value = serializers.FloatField(min_value=1/9, max_value=9)
+    comment = serializers.CharField(required=False, allow_blank=True)
+    confidence = serializers.IntegerField(required=False, min_value=1, max_value=10)
+    time_spent = serializers.FloatField(required=False, min_value=0)
+
+    def validate(self, data):
+        if data['criteria_a'] == data['criteria_b']:
+            raise serializers.ValidationError("Cannot compare criteria with itself")
+        return data
+
+
 class EvaluationProgressSerializer(serializers.Serializer):
     """Serializer for evaluation progress updates"""
-    comparisons = PairwiseComparisonSerializer(many=True)
+    comparisons = ComparisonProgressSerializer(many=True)
     auto_save = serializers.BooleanField(default=True)
     
     def update(self, instance, validated_data):
         """Update evaluation with comparison data"""
         comparisons_data = validated_data.get('comparisons', [])
         
+        # 기존 비교를 한 번에 로드하고 (criteria_a, criteria_b) 쌍으로 매칭 후 일괄 저장
+        existing = {
+            (comparison.criteria_a_id, comparison.criteria_b_id): comparison
+            for comparison in instance.pairwise_comparisons.all()
+        }
+        updated = {}
         for comp_data in comparisons_data:
-            comparison_id = comp_data.get('id')
-            if comparison_id:
-                try:
-                    comparison = instance.pairwise_comparisons.get(id=comparison_id)
-                    for field, value in comp_data.items():
-                        if field not in ['id', 'criteria_a', 'criteria_b']:
-                            setattr(comparison, field, value)
-                    comparison.save()
-                except PairwiseComparison.DoesNotExist:
-                    pass
-                    
+            a, b, value = comp_data['criteria_a'], comp_data['criteria_b'], comp_data['value']
+            if a > b:
+                # PairwiseComparison.save()와 같은 정규화
+                a, b, value = b, a, 1.0 / value
+            comparison = existing.get((a, b))
+            if comparison is None:
+                continue
+            comparison.value = value
+            for field in ('comment', 'confidence', 'time_spent'):
+                if field in comp_data:
+                    setattr(comparison, field, comp_data[field])
+            comparison.answered_at = timezone.now()
+            updated[comparison.pk] = comparison
+        
+        PairwiseComparison.objects.bulk_update(
+            updated.values(), ['value', 'comment', 'confidence', 'time_spent', 'answered_at'], batch_size=500
+        )
+        return self.refresh_progress(instance)
+    
+    @staticmethod
+    def refresh_progress(instance):
+        """Recompute progress, status and consistency after comparisons changed"""
         # Update evaluation progress
         total_comparisons = instance.pairwise_comparisons.count()
         completed_comparisons = instance.pairwise_comparisons.exclude(value=1.0).count()
@@ -212,16 +253,15 @@ class EvaluatorDashboardSerializer(serializers.Serializer):
             status='pending'
         ).select_related('project', 'invited_by')
         
-        # Statistics
+        # Statistics (single cached aggregate)
+        evaluator_stats = get_evaluator_stats(user)
         stats = {
-            'total_evaluations': Evaluation.objects.filter(evaluator=user).count(),
-            'completed_evaluations': completed_evals.count(),
-            'active_evaluations': active_evals.count(),
-            'pending_invitations': pending_invitations.count(),
-            'average_consistency': completed_evals.aggregate(
-                avg_consistency=db_models.Avg('consistency_ratio')
-            )['avg_consistency'] or 0,
-            'total_projects': Evaluation.objects.filter(evaluator=user).values('project').distinct().count()
+            'total_evaluations': evaluator_stats['total_evaluations'],
+            'completed_evaluations': evaluator_stats['completed_evaluations'],
+            'active_evaluations': evaluator_stats['active_evaluations'],
+            'pending_invitations': evaluator_stats['pending_invitations'],
+            'average_consistency': evaluator_stats['completed_average_consistency'],
+            'total_projects': evaluator_stats['total_projects']
         }
         
         return {
@@ -355,7 +395,7 @@ class BulkInvitationSerializer(serializers.ModelSerializer):
 
 class BulkInvitationCreateSerializer(serializers.Serializer):
     """대량 초대 생성 Serializer"""
-    project_id = serializers.IntegerField()
+    project_id = serializers.UUIDField()
     evaluator_emails = serializers.ListField(
         child=serializers.EmailField(),
         allow_empty=False
@@ -366,11 +406,11 @@ class BulkInvitationCreateSerializer(serializers.Serializer):
     
     def validate_evaluator_emails(self, value):
         """이메일 유효성 검사"""
-        if len(value) > 1000:
-            raise serializers.ValidationError("최대 1000명까지 초대할 수 있습니다.")
+        if len(value) > 5000:
+            raise serializers.ValidationError("최대 5000명까지 초대할 수 있습니다.")
         
-        # 중복 이메일 제거
-        unique_emails = list(set(value))
+        # 중복 이메일 제거 (입력 순서 유지)
+        unique_emails = list(dict.fromkeys(value))
         if len(unique_emails) < len(value):
             self.context['duplicate_count'] = len(value) - len(unique_emails)
             
@@ -450,8 +490,39 @@ class EmailDeliveryStatusSerializer(serializers.ModelSerializer):
         ]
 
 
+def project_progress_counts(project_ids):
+    """Per-project evaluation status counts for many projects in one GROUP BY query"""
+    rows = Evaluation.objects.filter(project_id__in=project_ids).values('project').annotate(
+        total=db_models.Count('id'),
+        completed=db_models.Count('id', filter=db_models.Q(status='completed')),
+        in_progress=db_models.Count('id', filter=db_models.Q(status='in_progress')),
+        pending=db_models.Count('id', filter=db_models.Q(status='pending')),
+    ).order_by()
+    return {row.pop('project'): row for row in rows}
+
+
+def evaluator_progress_entry(evaluation):
+    """Per-evaluator progress row"""
+    return {
+        'evaluator_id': evaluation.evaluator.id,
+        'evaluator_name': evaluation.evaluator.get_full_name(),
+        'evaluator_email': evaluation.evaluator.email,
+        'status': evaluation.status,
+        'progress': evaluation.progress,
+        'consistency_ratio': evaluation.consistency_ratio,
+        'started_at': evaluation.started_at.isoformat() if evaluation.started_at else None,
+        'completed_at': evaluation.completed_at.isoformat() if evaluation.completed_at else None
+    }
+
+
 class EvaluatorAssignmentProgressSerializer(serializers.Serializer):
-    """평가자 배정 진행률 Serializer"""
+    """평가자 배정 진행률 Serializer
+    
+    context 옵션:
+        counts: project_progress_counts()로 미리 계산한 집계 (없으면 1회 조회)
+        include_evaluators: 평가자별 상세 포함 여부 (기본값 True)
+        evaluator_offset / evaluator_limit: 평가자별 상세 페이지 범위
+    """
     project_id = serializers.IntegerField()
     total_evaluators = serializers.IntegerField()
     completed = serializers.IntegerField()
@@ -463,32 +534,27 @@ class EvaluatorAssignmentProgressSerializer(serializers.Serializer):
     def to_representation(self, instance):
         """진행률 데이터 표현"""
         project = instance
-        evaluations = Evaluation.objects.filter(project=project)
-        
-        total = evaluations.count()
-        completed = evaluations.filter(status='completed').count()
-        in_progress = evaluations.filter(status='in_progress').count()
-        pending = evaluations.filter(status='pending').count()
+        counts = self.context.get('counts')
+        if counts is None:
+            counts = project_progress_counts([project.pk]).get(project.pk, {})
         
-        evaluator_progress = []
-        for eval in evaluations.select_related('evaluator'):
-            evaluator_progress.append({
-                'evaluator_id': eval.evaluator.id,
-                'evaluator_name': eval.evaluator.get_full_name(),
-                'evaluator_email': eval.evaluator.email,
-                'status': eval.status,
-                'progress': eval.progress,
-                'consistency_ratio': eval.consistency_ratio,
-                'started_at': eval.started_at.isoformat() if eval.started_at else None,
-                'completed_at': eval.completed_at.isoformat() if eval.completed_at else None
-            })
+        total = counts.get('total', 0)
+        completed = counts.get('completed', 0)
         
-        return {
+        data = {
             'project_id': project.id,
             'total_evaluators': total,
             'completed': completed,
-            'in_progress': in_progress,
-            'pending': pending,
+            'in_progress': counts.get('in_progress', 0),
+            'pending': counts.get('pending', 0),
             'overall_progress': (completed / total * 100) if total > 0 else 0,
-            'evaluators': evaluator_progress
-        }
\ No newline at end of file
+        }
+        
+        if self.context.get('include_evaluators', True):
+            offset = self.context.get('evaluator_offset', 0)
+            limit = self.context.get('evaluator_limit')
+            evaluations = Evaluation.objects.filter(project=project).select_related('evaluator').order_by('created_at', 'id')
+            evaluations = evaluations[offset:offset + limit] if limit else evaluations[offset:]
+            data['evaluators'] = [evaluator_progress_entry(evaluation) for evaluation in evaluations]
+        
+        return data
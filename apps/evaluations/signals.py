@@ -0,0 +1,15 @@
+"""
+Signal handlers for the evaluations app
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Evaluation, EvaluationInvitation
+from .stats import invalidate_evaluator_stats
+
+
+@receiver([post_save, post_delete], sender=Evaluation)
+@receiver([post_save, post_delete], sender=EvaluationInvitation)
+def evaluator_stats_changed(sender, instance, **kwargs):
+    """Evaluation/invitation changes invalidate the evaluator's cached stats"""
+    invalidate_evaluator_stats(instance.evaluator_id)
@@ -0,0 +1,63 @@
+"""
+Evaluator statistics service
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Avg, Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import EvaluationInvitation
+
+User = get_user_model()
+
+EVALUATOR_STATS_TIMEOUT = 5 * 60
+
+
+def evaluator_stats_cache_key(user_id):
+    return f"evaluator_stats:{user_id}"
+
+
+def invalidate_evaluator_stats(*user_ids):
+    """Drop cached stats for the given evaluators"""
+    cache.delete_many([evaluator_stats_cache_key(user_id) for user_id in user_ids if user_id])
+
+
+def compute_evaluator_stats(user_id):
+    """All evaluator statistics in a single aggregate query"""
+    pending_invitations = EvaluationInvitation.objects.filter(
+        evaluator=OuterRef('pk'), status='pending'
+    ).order_by().values('evaluator').annotate(total=Count('id')).values('total')
+
+    stats = User.objects.filter(pk=user_id).annotate(
+        total_evaluations=Count('evaluations'),
+        completed_evaluations=Count('evaluations', filter=Q(evaluations__status='completed')),
+        active_evaluations=Count(
+            'evaluations', filter=Q(evaluations__status__in=['pending', 'in_progress'])
+        ),
+        average_consistency=Avg('evaluations__consistency_ratio'),
+        completed_average_consistency=Avg(
+            'evaluations__consistency_ratio', filter=Q(evaluations__status='completed')
+        ),
+        total_projects=Count('evaluations__project', distinct=True),
+        pending_invitations=Coalesce(
+            Subquery(pending_invitations, output_field=IntegerField()), Value(0)
+        ),
+    ).values(
+        'total_evaluations', 'completed_evaluations', 'active_evaluations',
+        'average_consistency', 'completed_average_consistency', 'total_projects',
+        'pending_invitations',
+    ).first() or {}
+
+    stats['average_consistency'] = stats.get('average_consistency') or 0.0
+    stats['completed_average_consistency'] = stats.get('completed_average_consistency') or 0.0
+    return stats
+
+
+def get_evaluator_stats(user):
+    """Cached evaluator statistics; invalidated by evaluation/invitation changes"""
+    key = evaluator_stats_cache_key(user.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_evaluator_stats(user.pk)
+        cache.set(key, stats, EVALUATOR_STATS_TIMEOUT)
+    return stats
@@ -0,0 +1,390 @@
+"""
+Background tasks for evaluator invitation emails
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.db.models import F
+from django.template import Context, Template
+from django.utils import timezone
+
+from .models import BulkInvitation, EmailDeliveryStatus, EvaluationTemplate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUBJECT = '[{{ project_name }}] AHP 평가 요청'
+DEFAULT_BODY = """안녕하세요 {{ evaluator_name }}님,
+
+{{ project_name }} 프로젝트의 AHP 평가에 참여해 주시기 바랍니다.
+
+{{ message }}
+
+아래 링크를 클릭하여 평가를 시작하세요:
+{{ evaluation_link }}
+
+이 링크는 {{ expiry_date }}까지 유효합니다.
+
+감사합니다.
+"""
+
+
+class InvitationMessageBuilder:
+    """Render invitation emails from an EvaluationTemplate, compiling it once per job"""
+
+    def __init__(self, template_id=None):
+        template = None
+        if template_id:
+            template = EvaluationTemplate.objects.filter(pk=template_id, is_active=True).first()
+        if template is None:
+            template = EvaluationTemplate.objects.filter(is_default=True, is_active=True).first()
+
+        self.subject = Template(template.email_subject if template else DEFAULT_SUBJECT)
+        self.body = Template(template.email_body if template else DEFAULT_BODY)
+        self.base_url = getattr(settings, 'INVITATION_BASE_URL', '').rstrip('/')
+
+    def build(self, email_status):
+        invitation = email_status.invitation
+        evaluator = invitation.evaluator
+        project = invitation.project
+        # 일반 텍스트 메일이므로 HTML 이스케이프(&amp; 등)를 하지 않음
+        context = Context({
+            'evaluator_name': evaluator.get_full_name() or evaluator.username,
+            'project_name': project.title,
+            'message': invitation.message,
+            'deadline': project.deadline.date().isoformat() if project.deadline else '',
+            'estimated_time': '',
+            'evaluation_link': f"{self.base_url}/evaluations/invitation/{invitation.token}/",
+            'expiry_date': invitation.expires_at.date().isoformat() if invitation.expires_at else '',
+        }, autoescape=False)
+        return EmailMessage(
+            subject=self.subject.render(context).strip(),
+            body=self.body.render(context),
+            to=[evaluator.email],
+        )
+
+
+def send_email_batch(connection, rows, builder):
+    """
+    Send one batch over an already-open connection.
+
+    Messages go out one at a time on the shared connection: when a batched
+    ``send_messages`` raises partway through there is no way to tell which
+    recipients were already delivered, and resending the batch would mail
+    them twice. Returns (sent_rows, failed_rows); failed rows carry
+    ``error_message``.
+    """
+    sent, failed = [], []
+    for row in rows:
+        try:
+            connection.send_messages([builder.build(row)])
+            sent.append(row)
+        except Exception as e:
+            row.error_message = str(e)[:1000]
+            failed.append(row)
+    return sent, failed
+
+
+def retry_delay(retry_count):
+    """Exponential backoff: base * 2^retry_count, capped"""
+    base = getattr(settings, 'INVITATION_EMAIL_RETRY_BASE_SECONDS', 60)
+    cap = getattr(settings, 'INVITATION_EMAIL_RETRY_MAX_SECONDS', 6 * 60 * 60)
+    return timedelta(seconds=min(base * (2 ** retry_count), cap))
+
+
+def next_retry_time(retry_count, now):
+    """When a row that has failed ``retry_count`` retries should be tried again, or None"""
+    if retry_count >= getattr(settings, 'INVITATION_EMAIL_MAX_RETRIES', 5):
+        return None
+    return now + retry_delay(retry_count)
+
+
+def record_batch_outcome(sent, failed, bulk_invitation_id=None):
+    """Persist a batch result with two set-based writes and F() counter increments"""
+    now = timezone.now()
+    if sent:
+        EmailDeliveryStatus.objects.filter(pk__in=[row.pk for row in sent]).update(
+            status='sent', sent_at=now, error_message='', next_retry_at=None
+        )
+    if failed:
+        for row in failed:
+            row.status = 'failed'
+            row.next_retry_at = next_retry_time(row.retry_count, now)
+        EmailDeliveryStatus.objects.bulk_update(failed, ['status', 'error_message', 'next_retry_at'])
+    if bulk_invitation_id and (sent or failed):
+        BulkInvitation.objects.filter(pk=bulk_invitation_id).update(
+            sent_count=F('sent_count') + len(sent),
+            failed_count=F('failed_count') + len(failed),
+        )
+        BulkInvitation.invalidate_status_snapshot(bulk_invitation_id)
+
+
+def throttle(batch_size, started):
+    """Sleep so that at most INVITATION_EMAIL_RATE_LIMIT messages go out per second"""
+    rate = getattr(settings, 'INVITATION_EMAIL_RATE_LIMIT', 0)
+    if rate > 0:
+        remaining = batch_size / rate - (time.monotonic() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+def send_lease():
+    """How long a claimed row is hidden from other senders (INVITATION_EMAIL_RETRY_LEASE_SECONDS)"""
+    return timedelta(seconds=getattr(settings, 'INVITATION_EMAIL_RETRY_LEASE_SECONDS', 10 * 60))
+
+
+def claim_rows(queryset, batch_size, **changes):
+    """
+    Lock up to ``batch_size`` rows of ``queryset`` (SKIP LOCKED), push their
+    ``next_retry_at`` one lease ahead, apply ``changes`` and commit.
+
+    Sending happens after the commit, so no row lock is held during SMTP.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update(skip_locked=True, of=('self',))
+            .select_related('invitation__evaluator', 'invitation__project')[:batch_size]
+        )
+        if rows:
+            EmailDeliveryStatus.objects.filter(pk__in=[row.pk for row in rows]).update(
+                next_retry_at=timezone.now() + send_lease(), **changes
+            )
+    return rows
+
+
+def send_bulk_invitation_emails(bulk_invitation_id):
+    """
+    Send all pending emails of a bulk invitation.
+
+    Reuses a single mail connection for the whole job, sends in batches of
+    INVITATION_EMAIL_BATCH_SIZE and updates sent/failed counters after each batch.
+    Each batch is claimed with a lease first; if the process dies mid-job the
+    rows still pending are taken over by ``process_due_retries`` once their
+    lease runs out.
+    """
+    batch_size = getattr(settings, 'INVITATION_EMAIL_BATCH_SIZE', 100)
+
+    BulkInvitation.objects.filter(pk=bulk_invitation_id, status='pending').update(
+        status='processing', started_at=timezone.now()
+    )
+    bulk_invitation = BulkInvitation.objects.get(pk=bulk_invitation_id)
+    builder = InvitationMessageBuilder(bulk_invitation.results.get('template_id'))
+
+    pending = EmailDeliveryStatus.objects.filter(
+        bulk_invitation_id=bulk_invitation_id, status='pending'
+    ).order_by('pk')
+
+    connection = get_connection()
+    try:
+        connection.open()
+        last_pk = 0
+        while True:
+            rows = claim_rows(pending.filter(pk__gt=last_pk), batch_size)
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            started = time.monotonic()
+            sent, failed = send_email_batch(connection, rows, builder)
+            record_batch_outcome(sent, failed, bulk_invitation_id)
+            throttle(len(rows), started)
+    except Exception as e:
+        logger.exception("Bulk invitation %s failed", bulk_invitation_id)
+        BulkInvitation.objects.get(pk=bulk_invitation_id).mark_failed(str(e))
+        return
+    finally:
+        connection.close()
+
+    BulkInvitation.objects.filter(pk=bulk_invitation_id, status='processing').update(
+        status='completed', completed_at=timezone.now()
+    )
+
+
+def record_retry_outcome(sent, failed):
+    """
+    Persist retried rows with one bulk_update and fix the bulk invitation counters
+
+    Successes of failed rows move from failed to sent; rows taken over while
+    still pending (``status`` as read) are counted for the first time.
+    """
+    now = timezone.now()
+    sent_delta, failed_delta = Counter(), Counter()
+    for row in sent:
+        if row.bulk_invitation_id and row.status in ('failed', 'pending'):
+            sent_delta[row.bulk_invitation_id] += 1
+            if row.status == 'failed':
+                failed_delta[row.bulk_invitation_id] -= 1
+        row.status = 'sent'
+        row.sent_at = now
+        row.error_message = ''
+        row.retry_count += 1
+        row.next_retry_at = None
+    for row in failed:
+        if row.bulk_invitation_id and row.status == 'pending':
+            failed_delta[row.bulk_invitation_id] += 1
+        row.status = 'failed'
+        row.retry_count += 1
+        row.next_retry_at = next_retry_time(row.retry_count, now)
+
+    EmailDeliveryStatus.objects.bulk_update(
+        list(sent) + list(failed),
+        ['status', 'sent_at', 'error_message', 'retry_count', 'next_retry_at']
+    )
+    for bulk_invitation_id in set(sent_delta) | set(failed_delta):
+        BulkInvitation.objects.filter(pk=bulk_invitation_id).update(
+            sent_count=F('sent_count') + sent_delta[bulk_invitation_id],
+            failed_count=F('failed_count') + failed_delta[bulk_invitation_id],
+        )
+    for bulk_invitation_id in {row.bulk_invitation_id for row in list(sent) + list(failed)}:
+        if bulk_invitation_id:
+            BulkInvitation.invalidate_status_snapshot(bulk_invitation_id)
+
+
+def claim_due_retries(batch_size):
+    """
+    Claim up to ``batch_size`` due rows and commit the claim.
+
+    Due rows are failed/bounced rows whose backoff has elapsed, plus pending
+    rows whose lease ran out because the bulk job sending them died. Claimed
+    rows are hidden from other workers for one lease; a worker that dies
+    before recording the outcome leaves rows that become due again.
+    """
+    now = timezone.now()
+    due = EmailDeliveryStatus.objects.filter(next_retry_at__lte=now).order_by('next_retry_at')
+    rows = claim_rows(due.filter(status__in=['failed', 'bounced']), batch_size)
+    if len(rows) < batch_size:
+        # 중단된 대량 발송의 대기 행은 실패로 옮겨 대량 발송 작업이 다시 가져가지 않도록 함
+        rows += claim_rows(
+            due.filter(status='pending'), batch_size - len(rows),
+            status='failed', error_message='Interrupted before sending',
+        )
+    return rows
+
+
+def process_due_retries(max_batches=None):
+    """
+    Resend failed emails whose backoff has elapsed.
+
+    Each batch is claimed in a short transaction of its own (see
+    ``claim_due_retries``) and sent after that commit, so several workers can
+    run at once and no row lock is held while talking to the SMTP server.
+    Returns the number of rows processed.
+    """
+    batch_size = getattr(settings, 'INVITATION_EMAIL_BATCH_SIZE', 100)
+    builders = {}
+    processed = 0
+    batches = 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+        while max_batches is None or batches < max_batches:
+            started = time.monotonic()
+            rows = claim_due_retries(batch_size)
+            if not rows:
+                break
+
+            sent, failed = [], []
+            by_template = {}
+            for row in rows:
+                by_template.setdefault(row.invitation.metadata.get('template_id'), []).append(row)
+            for template_id, group in by_template.items():
+                if template_id not in builders:
+                    builders[template_id] = InvitationMessageBuilder(template_id)
+                group_sent, group_failed = send_email_batch(connection, group, builders[template_id])
+                sent.extend(group_sent)
+                failed.extend(group_failed)
+            record_retry_outcome(sent, failed)
+
+            processed += len(rows)
+            batches += 1
+            throttle(len(rows), started)
+    finally:
+        connection.close()
+
+    return processed
+
+
+def _run_in_worker(func, *args):
+    try:
+        func(*args)
+    finally:
+        # 스레드별 DB 연결 정리
+        connections.close_all()
+
+
+def enqueue_bulk_invitation(bulk_invitation_id):
+    """Start sending once the surrounding transaction commits, on a background thread"""
+    def start():
+        worker = threading.Thread(
+            target=_run_in_worker,
+            args=(send_bulk_invitation_emails, bulk_invitation_id),
+            name=f"bulk-invitation-{bulk_invitation_id}",
+            daemon=True,
+        )
+        worker.start()
+        BulkInvitation.objects.filter(pk=bulk_invitation_id).update(celery_task_id=worker.name[:100])
+
+    transaction.on_commit(start)
+
+
+def enqueue_retries():
+    """Run one pass of the retry scheduler on a background thread after commit"""
+    def start():
+        threading.Thread(
+            target=_run_in_worker, args=(process_due_retries,),
+            name='email-retry-worker', daemon=True,
+        ).start()
+
+    transaction.on_commit(start)
+
+
+_retry_scheduler = None
+
+
+def start_retry_scheduler(interval=None):
+    """
+    Poll for due email retries on a daemon thread of this process.
+
+    Called from the WSGI module when INVITATION_EMAIL_RETRY_SCHEDULER is on,
+    so the web service resends failed invitations without a separate worker
+    (``manage.py process_email_retries --loop`` does the same from a shell or
+    a dedicated process). Every gunicorn worker may run one; rows are claimed
+    with SKIP LOCKED so they never send the same email twice.
+    """
+    global _retry_scheduler
+    if _retry_scheduler is not None and _retry_scheduler.is_alive():
+        return _retry_scheduler
+    if interval is None:
+        interval = getattr(settings, 'INVITATION_EMAIL_RETRY_INTERVAL_SECONDS', 30.0)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                _run_in_worker(process_due_retries)
+            except Exception:
+                logger.exception('Email retry pass failed')
+
+    _retry_scheduler = threading.Thread(target=run, name='email-retry-scheduler', daemon=True)
+    _retry_scheduler.start()
+    return _retry_scheduler
+
+
+def enqueue_comparison_import(upload_id, create_respondents=False):
+    """Import an uploaded comparison sheet on a background thread after commit"""
+    from .importers import import_comparison_upload
+
+    def start():
+        threading.Thread(
+            target=_run_in_worker,
+            args=(import_comparison_upload, upload_id, create_respondents),
+            name=f"comparison-import-{upload_id}",
+            daemon=True,
+        ).start()
+
+    transaction.on_commit(start)
@@ -1,6 +1,9 @@
 """
 Views for Evaluation API
 """
+import os
+import uuid
+
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -8,8 +11,10 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import transaction, models
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.settings import api_settings
 
 from .models import Evaluation, PairwiseComparison, EvaluationInvitation, EvaluationSession, DemographicSurvey
 from .serializers import (
@@ -17,10 +22,28 @@ from .serializers import (
     EvaluationInvitationSerializer, EvaluationProgressSerializer, EvaluatorDashboardSerializer,
     DemographicSurveySerializer, DemographicSurveyCreateSerializer, DemographicSurveyListSerializer
 )
+from .matrix_format import (
+    MatrixParser, MatrixRenderer, apply_matrices, comparisons_to_matrices,
+    is_matrix_request, wants_matrix_response
+)
+from .stats import get_evaluator_stats
+from .tasks import enqueue_comparison_import
+from apps.common.access import ProjectAccess
+from apps.common.models import FileUpload
+from apps.common.pagination import OptInCursorPagination
 from apps.common.permissions import IsOwnerOrReadOnly, IsEvaluatorOrProjectMember
+from apps.projects.models import Project, ProjectMember
+from apps.subscriptions.entitlements import ensure_evaluator_capacity
 
 User = get_user_model()
 
+IMPORT_EXTENSIONS = ('.xlsx', '.xlsm', '.csv')
+
+
+def _collaborates_on(user, project_ref):
+    """EXISTS membership test used instead of a DISTINCT join through collaborators"""
+    return models.Exists(ProjectMember.objects.filter(project=models.OuterRef(project_ref), user=user))
+
 
 class EvaluationViewSet(viewsets.ModelViewSet):
     """ViewSet for managing evaluations"""
@@ -32,6 +55,10 @@ class EvaluationViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'project__title']
     ordering_fields = ['created_at', 'updated_at', 'progress']
     ordering = ['-created_at']
+    pagination_class = OptInCursorPagination
+    cursor_ordering = ('-created_at', '-id')
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [MatrixParser]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [MatrixRenderer]
     
     def get_queryset(self):
         """Filter evaluations based on user permissions"""
@@ -43,8 +70,8 @@ class EvaluationViewSet(viewsets.ModelViewSet):
         return Evaluation.objects.filter(
             models.Q(evaluator=user) |
             models.Q(project__owner=user) |
-            models.Q(project__collaborators=user)
-        ).distinct().select_related('project', 'evaluator')
+            _collaborates_on(user, 'project')
+        ).select_related('project', 'evaluator')
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -53,7 +80,13 @@ class EvaluationViewSet(viewsets.ModelViewSet):
         elif self.action == 'update_progress':
             return EvaluationProgressSerializer
         return EvaluationSerializer
-    
+
+    def perform_create(self, serializer):
+        """프로젝트당 평가자 한도는 프로젝트 소유자의 구독 기준으로 확인"""
+        project = serializer.validated_data['project']
+        ensure_evaluator_capacity(project.owner_id, project.pk, [serializer.validated_data['evaluator'].pk])
+        serializer.save()
+
     @action(detail=True, methods=['post'])
     def start(self, request, pk=None):
         """Start an evaluation"""
@@ -129,9 +162,15 @@ class EvaluationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
             
-        serializer = self.get_serializer(evaluation, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        evaluation = serializer.save()
+        if is_matrix_request(request):
+            # 압축 행렬 업로드: 한 번의 bulk_update/bulk_create로 반영
+            with transaction.atomic():
+                apply_matrices(evaluation, request.data['matrices'])
+                evaluation = EvaluationProgressSerializer.refresh_progress(evaluation)
+        else:
+            serializer = self.get_serializer(evaluation, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            evaluation = serializer.save()
         
         return Response({
             'message': 'Progress updated successfully',
@@ -144,9 +183,74 @@ class EvaluationViewSet(viewsets.ModelViewSet):
         """Get pairwise comparisons for an evaluation"""
         evaluation = self.get_object()
         comparisons = evaluation.pairwise_comparisons.select_related('criteria_a', 'criteria_b')
+        # Accept: application/vnd.ahp.matrix+json 또는 ?format=matrix 이면 압축 행렬로 응답
+        if wants_matrix_response(request):
+            return Response(comparisons_to_matrices(comparisons))
         serializer = PairwiseComparisonSerializer(comparisons, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_comparisons(self, request):
+        """Upload an xlsx/CSV comparison sheet; it is imported in the background"""
+        upload_file = request.FILES.get('file')
+        project_id = request.data.get('project')
+        if upload_file is None or not project_id:
+            return Response(
+                {'error': "'file' and 'project' are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        project = get_object_or_404(Project, pk=project_id)
+        if not ProjectAccess.for_request(request).can_manage_evaluators(project):
+            return Response(
+                {'error': 'You do not have permission to import evaluations for this project'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        extension = os.path.splitext(upload_file.name)[1].lower()
+        if extension not in IMPORT_EXTENSIONS:
+            return Response(
+                {'error': f"Supported file types: {', '.join(IMPORT_EXTENSIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # 청크 단위로 디스크에 저장 (업로드 전체를 메모리에 올리지 않음)
+        stored_name = default_storage.save(f'imports/{uuid.uuid4().hex}{extension}', upload_file)
+        create_respondents = str(request.data.get('create_respondents', '')).lower() in ('1', 'true', 'yes')
+        with transaction.atomic():
+            upload = FileUpload.objects.create(
+                original_name=upload_file.name[:255],
+                file_path=default_storage.path(stored_name),
+                file_size=upload_file.size,
+                mime_type=(upload_file.content_type or '')[:100],
+                uploaded_by=request.user,
+                upload_type='comparison_import',
+                metadata={'project_id': str(project.pk)},
+            )
+            enqueue_comparison_import(upload.pk, create_respondents)
+        
+        return Response(self._import_status(upload), status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'], url_path=r'import/(?P<upload_id>[0-9a-f-]+)')
+    def import_status(self, request, upload_id=None):
+        """Status and progress of a comparison import"""
+        upload = get_object_or_404(
+            FileUpload, pk=upload_id, uploaded_by=request.user, upload_type='comparison_import'
+        )
+        return Response(self._import_status(upload))
+    
+    @staticmethod
+    def _import_status(upload):
+        return {
+            'id': upload.id,
+            'status': upload.status,
+            'original_name': upload.original_name,
+            'results': upload.processing_results,
+            'error_message': upload.error_message,
+            'created_at': upload.created_at,
+            'completed_at': upload.completed_at,
+        }
+    
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """Get evaluator dashboard data"""
@@ -162,6 +266,8 @@ class PairwiseComparisonViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['evaluation', 'criteria_a', 'criteria_b']
     ordering = ['criteria_a__order', 'criteria_b__order']
+    pagination_class = OptInCursorPagination
+    cursor_ordering = ('-answered_at', '-id')
     
     def get_queryset(self):
         """Filter comparisons based on user permissions"""
@@ -169,8 +275,8 @@ class PairwiseComparisonViewSet(viewsets.ModelViewSet):
         return PairwiseComparison.objects.filter(
             models.Q(evaluation__evaluator=user) |
             models.Q(evaluation__project__owner=user) |
-            models.Q(evaluation__project__collaborators=user)
-        ).distinct().select_related('evaluation', 'criteria_a', 'criteria_b')
+            _collaborates_on(user, 'evaluation__project')
+        ).select_related('evaluation', 'criteria_a', 'criteria_b')
     
     def perform_update(self, serializer):
         """Update comparison and track timing"""
@@ -195,6 +301,8 @@ class EvaluationInvitationViewSet(viewsets.ModelViewSet):
     filterset_fields = ['status', 'project']
     search_fields = ['evaluator__username', 'evaluator__email']
     ordering = ['-sent_at']
+    pagination_class = OptInCursorPagination
+    cursor_ordering = ('-sent_at', '-id')
     
     def get_queryset(self):
         """Filter invitations based on user permissions"""
@@ -203,8 +311,8 @@ class EvaluationInvitationViewSet(viewsets.ModelViewSet):
             models.Q(evaluator=user) |  # Invitations for the user
             models.Q(invited_by=user) |  # Invitations sent by the user
             models.Q(project__owner=user) |  # User owns the project
-            models.Q(project__collaborators=user)  # User collaborates on the project
-        ).distinct().select_related('project', 'evaluator', 'invited_by')
+            _collaborates_on(user, 'project')  # User collaborates on the project
+        ).select_related('project', 'evaluator', 'invited_by')
     
     def perform_create(self, serializer):
         """Create invitation and set inviter"""
@@ -291,24 +399,14 @@ def evaluator_dashboard(request):
 @action(detail=False, methods=['get'])
 def evaluation_statistics(request):
     """Get evaluation statistics"""
-    user = request.user
+    evaluator_stats = get_evaluator_stats(request.user)
     
     stats = {
-        'total_evaluations': Evaluation.objects.filter(evaluator=user).count(),
-        'completed_evaluations': Evaluation.objects.filter(
-            evaluator=user, status='completed'
-        ).count(),
-        'active_evaluations': Evaluation.objects.filter(
-            evaluator=user, status__in=['pending', 'in_progress']
-        ).count(),
-        'average_consistency': Evaluation.objects.filter(
-            evaluator=user, consistency_ratio__isnull=False
-        ).aggregate(
-            avg_consistency=models.Avg('consistency_ratio')
-        )['avg_consistency'] or 0,
-        'projects_participated': Evaluation.objects.filter(
-            evaluator=user
-        ).values('project').distinct().count()
+        'total_evaluations': evaluator_stats['total_evaluations'],
+        'completed_evaluations': evaluator_stats['completed_evaluations'],
+        'active_evaluations': evaluator_stats['active_evaluations'],
+        'average_consistency': evaluator_stats['average_consistency'],
+        'projects_participated': evaluator_stats['total_projects']
     }
     
     return Response(stats)
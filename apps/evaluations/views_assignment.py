@@ -7,19 +7,26 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
 from django.db import transaction, models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from datetime import timedelta
+import uuid
 
 from .models import (
-    EvaluationInvitation, BulkInvitation, 
+    Evaluation, EvaluationInvitation, BulkInvitation, 
     EvaluationTemplate, EmailDeliveryStatus
 )
 from .serializers import (
     BulkInvitationSerializer, BulkInvitationCreateSerializer,
     EvaluationTemplateSerializer, EmailDeliveryStatusSerializer,
-    EvaluatorAssignmentProgressSerializer
+    EvaluatorAssignmentProgressSerializer, project_progress_counts,
+    evaluator_progress_entry
 )
+from .stats import invalidate_evaluator_stats
+from .tasks import enqueue_bulk_invitation, enqueue_retries, send_lease
 from apps.projects.models import Project
+from apps.common.access import ProjectAccess
 
 User = get_user_model()
 
@@ -47,6 +54,7 @@ class BulkInvitationViewSet(viewsets.ModelViewSet):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         data = serializer.validated_data
+        emails = data['evaluator_emails']
         
         try:
             with transaction.atomic():
@@ -57,66 +65,80 @@ class BulkInvitationViewSet(viewsets.ModelViewSet):
                 bulk_invitation = BulkInvitation.objects.create(
                     project=project,
                     created_by=request.user,
-                    total_count=len(data['evaluator_emails'])
+                    total_count=len(emails)
                 )
                 
-                # 평가자 생성 또는 조회
-                evaluators = []
-                for email in data['evaluator_emails']:
-                    user, created = User.objects.get_or_create(
-                        email=email,
-                        defaults={
-                            'username': email.split('@')[0],
-                            'is_active': True
-                        }
-                    )
-                    evaluators.append(user)
+                # 평가자 조회 (단일 email__in 쿼리) 및 누락 사용자 일괄 생성
+                evaluators = self._resolve_evaluators(emails)
                 
-                # 초대 생성
+                # 기존 초대 대상 제외 후 초대 일괄 생성
+                already_invited = set(
+                    EvaluationInvitation.objects.filter(
+                        project=project,
+                        evaluator__in=evaluators
+                    ).values_list('evaluator_id', flat=True)
+                )
                 expires_at = timezone.now() + timedelta(days=data.get('expiry_days', 30))
-                invitations_created = 0
-                invitations_existing = 0
-                
-                for evaluator in evaluators:
-                    invitation, created = EvaluationInvitation.objects.get_or_create(
+                new_invitations = [
+                    EvaluationInvitation(
                         project=project,
                         evaluator=evaluator,
-                        defaults={
-                            'invited_by': request.user,
-                            'message': data.get('custom_message', ''),
-                            'expires_at': expires_at,
-                            'metadata': {
-                                'bulk_invitation_id': str(bulk_invitation.id),
-                                'template_id': data.get('template_id')
-                            }
+                        invited_by=request.user,
+                        message=data.get('custom_message', ''),
+                        expires_at=expires_at,
+                        bulk_invitation=bulk_invitation,
+                        metadata={
+                            'bulk_invitation_id': str(bulk_invitation.id),
+                            'template_id': data.get('template_id')
                         }
                     )
-                    
-                    if created:
-                        invitations_created += 1
-                        
-                        # 이메일 발송 상태 추적 객체 생성
-                        EmailDeliveryStatus.objects.create(
-                            invitation=invitation,
+                    for evaluator in evaluators
+                    if evaluator.id not in already_invited
+                ]
+                EvaluationInvitation.objects.bulk_create(
+                    new_invitations, batch_size=500, ignore_conflicts=True
+                )
+                
+                # ignore_conflicts는 PK를 반환하지 않으므로 토큰으로 실제 생성분 조회
+                created_ids = list(
+                    EvaluationInvitation.objects.filter(
+                        token__in=[invitation.token for invitation in new_invitations]
+                    ).values_list('id', flat=True)
+                )
+                invitations_created = len(created_ids)
+                invitations_existing = len(evaluators) - invitations_created
+                
+                # bulk_create는 시그널을 발생시키지 않으므로 평가자 통계 캐시 직접 무효화
+                invalidate_evaluator_stats(*[invitation.evaluator_id for invitation in new_invitations])
+                
+                # 이메일 발송 상태 추적 객체 일괄 생성
+                EmailDeliveryStatus.objects.bulk_create(
+                    [
+                        EmailDeliveryStatus(
+                            invitation_id=invitation_id,
                             bulk_invitation=bulk_invitation,
+                            # 발송 작업이 시작되지 못하면 임대 만료 후 재시도 워커가 가져감
+                            next_retry_at=timezone.now() + send_lease(),
                             metadata={'scheduled': True}
                         )
-                    else:
-                        invitations_existing += 1
+                        for invitation_id in created_ids
+                    ],
+                    batch_size=500,
+                    ignore_conflicts=True
+                )
                 
                 # 결과 업데이트
                 bulk_invitation.results = {
                     'created': invitations_created,
                     'existing': invitations_existing,
-                    'duplicate_emails': serializer.context.get('duplicate_count', 0)
+                    'unresolved_emails': len(emails) - len(evaluators),
+                    'duplicate_emails': serializer.context.get('duplicate_count', 0),
+                    'template_id': data.get('template_id')
                 }
-                bulk_invitation.save()
+                bulk_invitation.save(update_fields=['results'])
                 
-                # TODO: Celery 작업 시작 (이메일 발송)
-                # from .tasks import send_bulk_invitation_emails
-                # task = send_bulk_invitation_emails.delay(str(bulk_invitation.id))
-                # bulk_invitation.celery_task_id = task.id
-                # bulk_invitation.save()
+                # 커밋 후 백그라운드 워커에서 이메일 발송
+                enqueue_bulk_invitation(bulk_invitation.id)
                 
                 return Response({
                     'bulk_invitation_id': str(bulk_invitation.id),
@@ -131,43 +153,42 @@ class BulkInvitationViewSet(viewsets.ModelViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def _resolve_evaluators(self, emails):
+        """이메일 목록을 사용자로 변환 (조회 1회, 누락분 bulk_create)"""
+        users = list(User.objects.filter(email__in=emails))
+        found = {user.email for user in users}
+        missing = [email for email in emails if email not in found]
+        
+        if missing:
+            # 사용자명 충돌 방지: 이미 사용 중이거나 요청 내에서 중복된 사용자명은 접미사 추가
+            candidates = [email.split('@')[0][:130] for email in missing]
+            taken = set(
+                User.objects.filter(username__in=candidates).values_list('username', flat=True)
+            )
+            new_users = []
+            for email, username in zip(missing, candidates):
+                if username in taken:
+                    username = f"{username}_{uuid.uuid4().hex[:8]}"
+                taken.add(username)
+                new_users.append(User(email=email, username=username, is_active=True))
+            User.objects.bulk_create(new_users, batch_size=500, ignore_conflicts=True)
+            users.extend(User.objects.filter(email__in=missing))
+        
+        return users
+    
     @action(detail=True, methods=['get'])
     def check_status(self, request, pk=None):
         """초대 상태 확인"""
         bulk_invitation = self.get_object()
         
-        # 이메일 상태 집계
-        email_statuses = EmailDeliveryStatus.objects.filter(
-            bulk_invitation=bulk_invitation
-        )
-        
-        status_summary = {
-            'pending': email_statuses.filter(status='pending').count(),
-            'sent': email_statuses.filter(status='sent').count(),
-            'delivered': email_statuses.filter(status='delivered').count(),
-            'opened': email_statuses.filter(status='opened').count(),
-            'clicked': email_statuses.filter(status='clicked').count(),
-            'bounced': email_statuses.filter(status='bounced').count(),
-            'failed': email_statuses.filter(status='failed').count(),
-        }
-        
-        # 수락 상태 확인
-        invitations = EvaluationInvitation.objects.filter(
-            metadata__bulk_invitation_id=str(bulk_invitation.id)
-        )
-        
-        acceptance_summary = {
-            'pending': invitations.filter(status='pending').count(),
-            'accepted': invitations.filter(status='accepted').count(),
-            'declined': invitations.filter(status='declined').count(),
-            'expired': invitations.filter(status='expired').count(),
-        }
+        # 이메일/수락 상태 집계 (테이블별 GROUP BY 1회, 짧은 TTL 캐시)
+        snapshot = bulk_invitation.status_snapshot()
         
         return Response({
             'bulk_invitation': BulkInvitationSerializer(bulk_invitation).data,
-            'email_status': status_summary,
-            'acceptance_status': acceptance_summary,
-            'updated_at': timezone.now()
+            'email_status': snapshot['email_status'],
+            'acceptance_status': snapshot['acceptance_status'],
+            'updated_at': snapshot['updated_at']
         })
     
     @action(detail=True, methods=['post'])
@@ -186,17 +207,9 @@ class BulkInvitationViewSet(viewsets.ModelViewSet):
                 'message': '재발송할 실패한 이메일이 없습니다.'
             }, status=status.HTTP_200_OK)
         
-        # 재발송 처리
-        resent_count = 0
-        for email_status in failed_emails:
-            email_status.status = 'pending'
-            email_status.retry_count += 1
-            email_status.save()
-            resent_count += 1
-            
-            # TODO: Celery 작업으로 재발송
-            # from .tasks import resend_invitation_email
-            # resend_invitation_email.delay(email_status.id)
+        # 즉시 재발송 대상으로 예약 후 재시도 스케줄러 실행
+        resent_count = failed_emails.update(next_retry_at=timezone.now())
+        enqueue_retries()
         
         return Response({
             'resent_count': resent_count,
@@ -301,14 +314,23 @@ class EvaluatorProgressViewSet(viewsets.ViewSet):
             project = Project.objects.get(id=pk)
             
             # 권한 확인
-            if project.owner != request.user and request.user not in project.members.all():
+            if not ProjectAccess.for_request(request).is_member(project):
                 return Response({
                     'error': '권한이 없습니다.'
                 }, status=status.HTTP_403_FORBIDDEN)
             
-            # 진행률 데이터 생성
-            serializer = EvaluatorAssignmentProgressSerializer()
+            # 진행률 데이터 생성 (집계 1회 + 평가자 상세 페이지)
+            page_size = self._int_param(request, 'page_size', 0, minimum=0, maximum=500)
+            page = self._int_param(request, 'page', 1)
+            serializer = EvaluatorAssignmentProgressSerializer(context={
+                'include_evaluators': request.query_params.get('include_evaluators', 'true').lower() != 'false',
+                'evaluator_offset': (page - 1) * page_size if page_size else 0,
+                'evaluator_limit': page_size or None,
+            })
             data = serializer.to_representation(project)
+            if page_size:
+                data['page'] = page
+                data['page_size'] = page_size
             
             return Response(data)
             
@@ -319,26 +341,60 @@ class EvaluatorProgressViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def my_projects_progress(self, request):
-        """내 프로젝트들의 진행률"""
-        projects = Project.objects.filter(owner=request.user)
+        """내 프로젝트들의 진행률
+        
+        모든 프로젝트의 상태별 집계를 단일 GROUP BY 쿼리로 계산.
+        ?include_evaluators=true 이면 프로젝트별 평가자 상세 첫 페이지(page_size, 기본 20)를 함께 반환.
+        """
+        projects = list(Project.objects.filter(owner=request.user).values('id', 'title'))
+        project_ids = [project['id'] for project in projects]
+        counts = project_progress_counts(project_ids)
+        
+        evaluators = {}
+        include_evaluators = request.query_params.get('include_evaluators', '').lower() == 'true'
+        if include_evaluators and project_ids:
+            page_size = self._int_param(request, 'page_size', 20, maximum=500)
+            ranked = Evaluation.objects.filter(project_id__in=project_ids).select_related('evaluator').annotate(
+                row_number=Window(
+                    expression=RowNumber(),
+                    partition_by=[F('project_id')],
+                    order_by=[F('created_at').asc(), F('id').asc()]
+                )
+            ).filter(row_number__lte=page_size)
+            for evaluation in ranked:
+                evaluators.setdefault(evaluation.project_id, []).append(evaluator_progress_entry(evaluation))
         
         progress_data = []
         for project in projects:
-            serializer = EvaluatorAssignmentProgressSerializer()
-            data = serializer.to_representation(project)
-            progress_data.append({
-                'project_id': project.id,
-                'project_title': project.title,
-                'progress': data['overall_progress'],
+            project_counts = counts.get(project['id'], {})
+            total = project_counts.get('total', 0)
+            completed = project_counts.get('completed', 0)
+            entry = {
+                'project_id': project['id'],
+                'project_title': project['title'],
+                'progress': (completed / total * 100) if total > 0 else 0,
                 'summary': {
-                    'total': data['total_evaluators'],
-                    'completed': data['completed'],
-                    'in_progress': data['in_progress'],
-                    'pending': data['pending']
+                    'total': total,
+                    'completed': completed,
+                    'in_progress': project_counts.get('in_progress', 0),
+                    'pending': project_counts.get('pending', 0)
                 }
-            })
+            }
+            if include_evaluators:
+                entry['evaluators'] = evaluators.get(project['id'], [])
+            progress_data.append(entry)
         
         return Response({
             'projects': progress_data,
             'total_projects': len(progress_data)
-        })
\ No newline at end of file
+        })
+    
+    @staticmethod
+    def _int_param(request, name, default, minimum=1, maximum=None):
+        """정수 쿼리 파라미터 파싱 (범위 제한)"""
+        try:
+            value = int(request.query_params.get(name, default))
+        except (TypeError, ValueError):
+            value = default
+        value = max(value, minimum)
+        return min(value, maximum) if maximum else value
@@ -9,6 +9,7 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.common.activity import log_activity
 from .models import ExportTemplate, ExportHistory, ReportSchedule
 from .serializers import (
     ExportTemplateSerializer, ExportHistorySerializer, ReportScheduleSerializer
@@ -111,6 +112,8 @@ class ExportDataViewSet(viewsets.ViewSet):
                 )
                 safe_title = project.title.replace(' ', '_')[:50]
                 response['Content-Disposition'] = f'attachment; filename="{safe_title}.xlsx"'
+                log_activity('export', f'Exported project {project.title} (xlsx)', request=request,
+                             target=project, details={'format': 'xlsx'})
                 return response
 
             except ImportError:
@@ -132,6 +135,8 @@ class ExportDataViewSet(viewsets.ViewSet):
                 writer.writerow(['이름', '순서'])
                 for a in alternatives_qs:
                     writer.writerow([a.name, a.order])
+                log_activity('export', f'Exported project {project.title} (csv)', request=request,
+                             target=project, details={'format': 'csv'})
                 return response
 
         except Exception as e:
@@ -162,6 +167,8 @@ class ExportDataViewSet(viewsets.ViewSet):
                 project=project, is_active=True, type='alternative'
             ).values('id', 'name', 'description', 'order'))
 
+            log_activity('export', f'Exported project {project.title} (report)', request=request,
+                         target=project, details={'format': 'json'})
             return Response({
                 'project': {
                     'id': str(project.id),
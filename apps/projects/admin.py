@@ -4,6 +4,8 @@ Admin configuration for Project models
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
+
+from apps.subscriptions.entitlements import recalculate_usage
 from .models import (
     Project, ProjectMember, Criteria, ProjectTemplate
 )
@@ -101,22 +103,28 @@ class ProjectAdmin(admin.ModelAdmin):
     # 액션 추가
     actions = ['activate_projects', 'archive_projects', 'soft_delete_projects']
     
+    def _update_projects(self, queryset, **fields):
+        """queryset.update는 시그널을 보내지 않으므로 소유자별 구독 사용량을 재집계"""
+        owner_ids = list(queryset.values_list('owner_id', flat=True).distinct())
+        updated = queryset.update(**fields)
+        recalculate_usage(*owner_ids)
+        return updated
+
     def activate_projects(self, request, queryset):
         """선택된 프로젝트를 활성화"""
-        updated = queryset.update(status='active')
+        updated = self._update_projects(queryset, status='active')
         self.message_user(request, f'{updated}개의 프로젝트를 활성화했습니다.')
     activate_projects.short_description = '선택된 프로젝트 활성화'
     
     def archive_projects(self, request, queryset):
         """선택된 프로젝트를 보관"""
-        updated = queryset.update(status='archived')
+        updated = self._update_projects(queryset, status='archived')
         self.message_user(request, f'{updated}개의 프로젝트를 보관했습니다.')
     archive_projects.short_description = '선택된 프로젝트 보관'
     
     def soft_delete_projects(self, request, queryset):
         """선택된 프로젝트를 소프트 삭제"""
-        from django.utils import timezone
-        updated = queryset.update(status='deleted', deleted_at=timezone.now())
+        updated = self._update_projects(queryset, status='deleted', deleted_at=timezone.now())
         self.message_user(request, f'{updated}개의 프로젝트를 삭제했습니다.')
     soft_delete_projects.short_description = '선택된 프로젝트 삭제'
 
@@ -143,14 +151,14 @@ class CriteriaAdmin(admin.ModelAdmin):
     ]
     search_fields = ['name', 'description', 'project__title']
     list_editable = []
-    readonly_fields = ['id', 'created_at', 'updated_at']
+    readonly_fields = ['id', 'path', 'created_at', 'updated_at']
     
     fieldsets = (
         ('기본 정보', {
             'fields': ('project', 'name', 'description', 'type')
         }),
         ('계층 구조', {
-            'fields': ('parent', 'level', 'order'),
+            'fields': ('parent', 'level', 'order', 'path'),
             'description': '계층 구조를 설정합니다. Level 1이 최상위입니다.'
         }),
         ('설정', {
@@ -257,8 +265,8 @@ class CriteriaAdmin(admin.ModelAdmin):
         
         # 하위 기준들도 함께 삭제
         for criteria in queryset:
-            # 하위 기준들 찾기
-            children = Criteria.objects.filter(parent=criteria)
+            # 하위 기준들 찾기 (materialized path로 전체 하위 트리 조회)
+            children = criteria.get_descendants()
             children_count = children.count()
             
             # 하위 기준들 먼저 삭제
@@ -0,0 +1,158 @@
+"""
+Bulk cloning of criteria hierarchies (project duplication, template instantiation)
+"""
+from .models import Criteria
+from .tree import CriteriaTree
+
+CLONE_BATCH_SIZE = 500
+
+
+def bulk_create_hierarchy(project, nodes, batch_size=CLONE_BATCH_SIZE):
+    """
+    Create a criteria hierarchy with one bulk INSERT per level.
+
+    Args:
+        project: 대상 프로젝트
+        nodes: ``(key, parent_key, fields)`` 튜플 목록 (루트는 parent_key=None)
+        batch_size: bulk_create 배치 크기
+
+    Returns:
+        dict: key -> 생성된 Criteria
+    """
+    nodes = list(nodes)
+    parent_of = {key: parent_key for key, parent_key, _ in nodes}
+
+    # 메모리에서 깊이 계산 후 레벨별로 묶음
+    depth = {}
+    for key in parent_of:
+        chain = []
+        current = key
+        while current is not None and current not in depth:
+            chain.append(current)
+            current = parent_of.get(current)
+        base = depth[current] if current is not None else -1
+        for item in reversed(chain):
+            base += 1
+            depth[item] = base
+
+    levels = {}
+    for key, parent_key, fields in nodes:
+        levels.setdefault(depth[key], []).append((key, parent_key, fields))
+
+    created = {}
+    for level in sorted(levels):
+        batch = levels[level]
+        objs = [
+            Criteria(project=project, parent=created.get(parent_key), **fields)
+            for _, parent_key, fields in batch
+        ]
+        Criteria.objects.bulk_create(objs, batch_size=batch_size)
+        for (key, _, _), obj in zip(batch, objs):
+            created[key] = obj
+
+    # bulk_create는 save()를 거치지 않으므로 경로를 직접 채움
+    for level in sorted(levels):
+        for key, parent_key, _ in levels[level]:
+            obj = created[key]
+            prefix = created[parent_key].path if parent_key is not None else ''
+            obj.path = f"{prefix}{obj.pk}{Criteria.PATH_SEPARATOR}"
+    Criteria.objects.bulk_update(created.values(), ['path'], batch_size=batch_size)
+
+    return created
+
+
+def clone_criteria(source_project, target_project):
+    """
+    Copy the active criteria hierarchy of ``source_project`` into ``target_project``.
+
+    Reads the source tree with one query. Returns a mapping of source criteria ID
+    to the new Criteria.
+    """
+    tree = CriteriaTree.for_project(source_project)
+    nodes = []
+    stack = [(root, None) for root in reversed(tree.roots())]
+    while stack:
+        node, parent_id = stack.pop()
+        nodes.append((node.id, parent_id, {
+            'name': node.name,
+            'description': node.description,
+            'type': node.type,
+            'order': node.order,
+            'level': node.level,
+        }))
+        stack.extend((child, node.id) for child in reversed(tree.children_of(node)))
+
+    return bulk_create_hierarchy(target_project, nodes)
+
+
+def criteria_nodes_from_structure(structure):
+    """Flatten a template ``structure`` list (nested ``children``) into hierarchy nodes"""
+    nodes = []
+    stack = [(item, (i,), None, 0) for i, item in reversed(list(enumerate(structure)))]
+    while stack:
+        item, key, parent_key, level = stack.pop()
+        nodes.append((key, parent_key, {
+            'name': item['name'],
+            'description': item.get('description', ''),
+            'type': item.get('type', 'criteria'),
+            'order': key[-1],
+            'level': level,
+        }))
+        children = item.get('children') or []
+        stack.extend(
+            (child, key + (i,), key, level + 1)
+            for i, child in reversed(list(enumerate(children)))
+        )
+    return nodes
+
+
+def clone_evaluations(source_project, target_project, criteria_map, batch_size=CLONE_BATCH_SIZE):
+    """
+    Copy evaluations and their pairwise comparisons onto the cloned criteria.
+
+    Comparisons whose criteria were not cloned (inactive) are skipped. Returns
+    ``(evaluation_count, comparison_count)``.
+    """
+    from apps.evaluations.models import Evaluation, PairwiseComparison
+    from apps.evaluations.stats import invalidate_evaluator_stats
+
+    copy_fields = [
+        'evaluator_id', 'title', 'instructions', 'status', 'progress', 'started_at',
+        'completed_at', 'expires_at', 'consistency_ratio', 'is_consistent',
+    ]
+    sources = list(source_project.evaluations.all())
+    evaluation_map = {}
+    for evaluation in sources:
+        evaluation_map[evaluation.id] = Evaluation(
+            project=target_project,
+            metadata=dict(evaluation.metadata or {}),
+            **{name: getattr(evaluation, name) for name in copy_fields}
+        )
+    Evaluation.objects.bulk_create(evaluation_map.values(), batch_size=batch_size)
+
+    comparisons = []
+    for comparison in PairwiseComparison.objects.filter(evaluation__project=source_project).iterator():
+        criteria_a = criteria_map.get(comparison.criteria_a_id)
+        criteria_b = criteria_map.get(comparison.criteria_b_id)
+        if criteria_a is None or criteria_b is None:
+            continue
+        value = comparison.value
+        # PairwiseComparison.save()와 동일하게 criteria_a의 ID가 더 작도록 정규화
+        if criteria_a.pk > criteria_b.pk:
+            criteria_a, criteria_b = criteria_b, criteria_a
+            value = 1.0 / value if value != 0 else 0
+        comparisons.append(PairwiseComparison(
+            evaluation=evaluation_map[comparison.evaluation_id],
+            criteria_a=criteria_a,
+            criteria_b=criteria_b,
+            value=value,
+            comment=comparison.comment,
+            confidence=comparison.confidence,
+            answered_at=comparison.answered_at,
+            time_spent=comparison.time_spent,
+        ))
+    PairwiseComparison.objects.bulk_create(comparisons, batch_size=batch_size)
+
+    # bulk_create는 시그널을 발생시키지 않으므로 평가자 통계 캐시 직접 무효화
+    invalidate_evaluator_stats(*[evaluation.evaluator_id for evaluation in sources])
+    return len(evaluation_map), len(comparisons)
@@ -0,0 +1,40 @@
+"""
+Criteria materialized path backfill command
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.projects.models import Criteria, Project
+from apps.projects.tree import CriteriaTree
+
+
+class Command(BaseCommand):
+    help = 'Compute Criteria.path for existing projects (one read and batched writes per project)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', action='append', help='Only backfill this project ID (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk UPDATE')
+        parser.add_argument('--dry-run', action='store_true', help='Report stale rows without writing')
+        parser.add_argument('--missing-only', action='store_true',
+                            help='Only projects that still have criteria without a path (used by the deploy step)')
+
+    def handle(self, *args, **options):
+        # --missing-only: 경로가 비어 있는 기준이 남은 프로젝트만 (배포마다 실행)
+        with_criteria = {'criteria__path': ''} if options['missing_only'] else {'criteria__isnull': False}
+        project_ids = options['project'] or Project.objects.filter(
+            **with_criteria
+        ).values_list('id', flat=True).distinct()
+
+        total = 0
+        for project_id in project_ids:
+            tree = CriteriaTree(Criteria.objects.filter(project_id=project_id).only(
+                'id', 'parent_id', 'path', 'order', 'is_active'
+            ))
+            stale = tree.stale_nodes()
+            if stale and not options['dry_run']:
+                with transaction.atomic():
+                    Criteria.objects.bulk_update(stale, ['path'], batch_size=options['batch_size'])
+            total += len(stale)
+
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} criteria paths"))
@@ -5,11 +5,41 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Length, Substr
 import uuid
 
 User = get_user_model()
 
 
+def _count_subquery(queryset, group_by='project'):
+    """Correlated COUNT subquery over ``queryset`` (already filtered on OuterRef)"""
+    counted = queryset.order_by().values(group_by).annotate(total=models.Count('pk')).values('total')
+    return Coalesce(Subquery(counted, output_field=models.IntegerField()), Value(0))
+
+
+class ProjectQuerySet(models.QuerySet):
+    """Project queries shared by list/detail views"""
+    
+    def visible_to(self, user):
+        """Projects the user owns, collaborates on, or that are public (EXISTS, no join/DISTINCT)"""
+        if user.is_superuser:
+            return self
+        membership = ProjectMember.objects.filter(project=OuterRef('pk'), user=user)
+        return self.filter(
+            models.Q(owner=user) | models.Q(visibility='public') | Exists(membership)
+        )
+    
+    def with_counts(self):
+        """Annotate ``member_count`` and ``evaluation_count`` as correlated subqueries"""
+        from django.apps import apps
+        Evaluation = apps.get_model('evaluations', 'Evaluation')
+        return self.annotate(
+            member_count=_count_subquery(ProjectMember.objects.filter(project=OuterRef('pk'))),
+            evaluation_count=_count_subquery(Evaluation.objects.filter(project=OuterRef('pk'))),
+        )
+
+
 class Project(models.Model):
     """AHP Project model"""
     
@@ -97,6 +127,8 @@ class Project(models.Model):
         help_text="평가 진행 순서"
     )
     
+    objects = ProjectQuerySet.as_manager()
+    
     class Meta:
         app_label = 'projects'
         db_table = 'ahp_projects'
@@ -163,6 +195,9 @@ class Criteria(models.Model):
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
     order = models.PositiveIntegerField(default=0)
     level = models.PositiveIntegerField(default=0)
+    # Materialized path: 루트부터 자신까지의 ID를 '/'로 연결 (예: "12/45/78/")
+    path = models.CharField(max_length=255, blank=True, default='', db_index=True,
+                            help_text="루트부터의 계층 경로 (하위 트리 조회용)")
     
     # Metadata
     weight = models.FloatField(default=0.0)
@@ -179,13 +214,79 @@ class Criteria(models.Model):
         
     def __str__(self):
         return f"{self.project.title} - {self.name}"
+    
+    PATH_SEPARATOR = '/'
+    
+    def build_path(self):
+        """Compute this node's materialized path from its parent"""
+        if self.parent_id is None:
+            prefix = ''
+        else:
+            prefix = self.parent.path or self.parent.build_path()
+        return f"{prefix}{self.pk}{self.PATH_SEPARATOR}"
+    
+    def save(self, *args, **kwargs):
+        """Keep ``path`` in sync on create and when the node moves to another parent"""
+        if self.pk is None:
+            super().save(*args, **kwargs)
+            self.path = self.build_path()
+            Criteria.objects.filter(pk=self.pk).update(path=self.path)
+            return
+        
+        old_path = self.path
+        new_path = self.build_path()
+        if new_path != old_path:
+            self.path = new_path
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'path'}
+        super().save(*args, **kwargs)
+        
+        if old_path and new_path != old_path:
+            # 하위 트리 경로를 한 번의 UPDATE로 이동
+            Criteria.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                path=Concat(Value(new_path), Substr('path', len(old_path) + 1))
+            )
+    
+    @property
+    def ancestor_ids(self):
+        """IDs of ancestors from the root down, parsed from ``path``"""
+        return [int(segment) for segment in self.path.split(self.PATH_SEPARATOR)[:-2]]
+    
+    def get_ancestors(self):
+        """Ancestors ordered root first, in one indexed query"""
+        return Criteria.objects.filter(pk__in=self.ancestor_ids).order_by(Length('path'))
+    
+    def get_descendants(self, include_self=False):
+        """
+        Whole subtree with a single ``LIKE 'path%'`` query
+
+        Rows saved before ``path`` existed have an empty path until
+        ``backfill_criteria_paths`` runs; an empty prefix would match the whole
+        project, so the subtree is collected through ``children`` instead
+        (one query per level).
+        """
+        if not self.path:
+            ids, level = [], [self.pk]
+            while level:
+                level = list(Criteria.objects.filter(parent_id__in=level).values_list('pk', flat=True))
+                ids.extend(level)
+            queryset = Criteria.objects.filter(pk__in=ids + [self.pk])
+        else:
+            queryset = Criteria.objects.filter(project_id=self.project_id, path__startswith=self.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset
         
     @property
     def full_path(self):
         """Get full hierarchical path"""
-        if self.parent:
-            return f"{self.parent.full_path} > {self.name}"
-        return self.name
+        if self.parent_id is None:
+            return self.name
+        if self.path:
+            names = [ancestor.name for ancestor in self.get_ancestors().only('name', 'path')]
+            return ' > '.join(names + [self.name])
+        return f"{self.parent.full_path} > {self.name}"
 
 
 class ProjectTemplate(models.Model):
@@ -4,13 +4,32 @@ Serializers for Project API
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Project, ProjectMember, Criteria, ProjectTemplate
+from .tree import CriteriaTree
 
 User = get_user_model()
 
 
+def project_member_count(project):
+    """Member count from ``ProjectQuerySet.with_counts()`` annotation, querying only if absent"""
+    count = getattr(project, 'member_count', None)
+    return count if count is not None else project.collaborators.count()
+
+
+def project_evaluation_count(project):
+    """Evaluation count from ``ProjectQuerySet.with_counts()`` annotation, querying only if absent"""
+    count = getattr(project, 'evaluation_count', None)
+    return count if count is not None else project.evaluations.count()
+
+
 class CriteriaSerializer(serializers.ModelSerializer):
+    """
+    Criteria with nested children.
+
+    Pass a ``CriteriaTree`` as ``context['criteria_tree']`` to render the
+    hierarchy from memory; without it children are queried per node.
+    """
     children = serializers.SerializerMethodField()
-    full_path = serializers.CharField(read_only=True)
+    full_path = serializers.SerializerMethodField()
     # ID를 문자열로 반환하여 프론트엔드와 호환성 확보
     id = serializers.SerializerMethodField()
     # parent 필드를 PrimaryKeyRelatedField로 처리하여 쓰기 가능하게 함
@@ -34,21 +53,27 @@ class CriteriaSerializer(serializers.ModelSerializer):
         
     def get_parent_id(self, obj):
         """Convert parent ID to string for frontend compatibility (alias for parent)"""
-        return str(obj.parent.id) if obj.parent else None
+        return str(obj.parent_id) if obj.parent_id else None
         
     def get_children(self, obj):
         """Get child criteria"""
-        children = obj.children.filter(is_active=True).order_by('order')
-        return CriteriaSerializer(children, many=True).data
+        tree = self.context.get('criteria_tree')
+        if tree is not None:
+            children = tree.children_of(obj)
+        else:
+            children = obj.children.filter(is_active=True).order_by('order')
+        return CriteriaSerializer(children, many=True, context=self.context).data
+    
+    def get_full_path(self, obj):
+        """Get full hierarchical path"""
+        tree = self.context.get('criteria_tree')
+        return tree.full_path(obj) if tree is not None else obj.full_path
     
     def to_representation(self, instance):
         """Custom representation to return parent as string ID"""
         data = super().to_representation(instance)
         # parent를 ID 문자열로 변환
-        if instance.parent:
-            data['parent'] = str(instance.parent.id)
-        else:
-            data['parent'] = None
+        data['parent'] = str(instance.parent_id) if instance.parent_id else None
         return data
 
 
@@ -75,7 +100,7 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
 
 class ProjectSerializer(serializers.ModelSerializer):
     owner_name = serializers.CharField(source='owner.get_full_name', read_only=True)
-    criteria = CriteriaSerializer(many=True, read_only=True)
+    criteria = serializers.SerializerMethodField()
     members = ProjectMemberSerializer(source='projectmember_set', many=True, read_only=True)
     member_count = serializers.SerializerMethodField()
     evaluation_count = serializers.SerializerMethodField()
@@ -99,13 +124,19 @@ class ProjectSerializer(serializers.ModelSerializer):
         """Convert ID to string for frontend compatibility"""
         return str(obj.id)
         
+    def get_criteria(self, obj):
+        """Get all project criteria, rendering the hierarchy from a single query"""
+        tree = CriteriaTree.for_project(obj)
+        context = {**self.context, 'criteria_tree': tree}
+        return CriteriaSerializer(tree.nodes, many=True, context=context).data
+        
     def get_member_count(self, obj):
         """Get total number of project members"""
-        return obj.collaborators.count()
+        return project_member_count(obj)
         
     def get_evaluation_count(self, obj):
         """Get number of evaluations for this project"""
-        return obj.evaluations.count()
+        return project_evaluation_count(obj)
 
 
 class ProjectCreateSerializer(serializers.ModelSerializer):
@@ -171,6 +202,8 @@ class ProjectTemplateSerializer(serializers.ModelSerializer):
 class ProjectSummarySerializer(serializers.ModelSerializer):
     """Lightweight serializer for project lists"""
     owner_name = serializers.CharField(source='owner.get_full_name', read_only=True)
+    member_count = serializers.SerializerMethodField()
+    evaluation_count = serializers.SerializerMethodField()
     # ID를 문자열로 반환하여 프론트엔드와 호환성 확보
     id = serializers.SerializerMethodField()
     
@@ -179,9 +212,18 @@ class ProjectSummarySerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'owner', 'owner_name', 'status',
             'evaluation_mode', 'workflow_stage', 'created_at', 'updated_at', 
-            'deleted_at', 'deadline', 'tags', 'criteria_count', 'alternatives_count'
+            'deleted_at', 'deadline', 'tags', 'criteria_count', 'alternatives_count',
+            'member_count', 'evaluation_count'
         ]
         
     def get_id(self, obj):
         """Convert ID to string for frontend compatibility"""
-        return str(obj.id)
\ No newline at end of file
+        return str(obj.id)
+        
+    def get_member_count(self, obj):
+        """Get total number of project members"""
+        return project_member_count(obj)
+        
+    def get_evaluation_count(self, obj):
+        """Get number of evaluations for this project"""
+        return project_evaluation_count(obj)
\ No newline at end of file
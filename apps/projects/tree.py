@@ -0,0 +1,106 @@
+"""
+Criteria hierarchy assembled in memory from a single query
+"""
+from collections import defaultdict
+
+from .models import Criteria
+
+
+class CriteriaTree:
+    """
+    In-memory criteria hierarchy.
+
+    Built from one flat list of criteria; children lists and full paths are
+    resolved from that list without further queries, so serializing a whole
+    hierarchy costs a single SELECT regardless of its depth.
+    """
+
+    def __init__(self, criteria):
+        self.nodes = list(criteria)
+        self.by_id = {node.id: node for node in self.nodes}
+        self._children = defaultdict(list)
+        for node in self.nodes:
+            if node.parent_id is not None and node.is_active:
+                self._children[node.parent_id].append(node)
+        for siblings in self._children.values():
+            siblings.sort(key=lambda node: node.order)
+        self._paths = {}
+
+    @classmethod
+    def for_project(cls, project):
+        """Tree of every criterion in a project (uses prefetched ``criteria`` if present)"""
+        return cls(project.criteria.all())
+
+    @classmethod
+    def for_projects(cls, project_ids):
+        """One tree covering several projects, loaded with a single query"""
+        return cls(Criteria.objects.filter(project_id__in=list(project_ids)))
+
+    def roots(self):
+        """Active top-level criteria ordered by ``order``"""
+        return sorted(
+            (node for node in self.nodes if node.parent_id is None and node.is_active),
+            key=lambda node: node.order
+        )
+
+    def children_of(self, node):
+        """Active children of a node ordered by ``order``"""
+        return self._children.get(node.id, [])
+
+    def full_path(self, node):
+        """'Parent > Child' path, memoized so every ancestor is resolved once"""
+        if node.id in self._paths:
+            return self._paths[node.id]
+
+        # 메모되지 않은 조상까지 올라간 뒤 위에서부터 경로를 채움
+        chain, seen = [], set()
+        current = node
+        while current is not None and current.id not in self._paths:
+            chain.append(current)
+            seen.add(current.id)
+            parent = self.by_id.get(current.parent_id) if current.parent_id else None
+            if parent is None and current.parent_id:
+                # 트리에 없는 부모 (다른 프로젝트 등)는 기존 방식으로 조회
+                parent = current.parent
+            if parent is not None and parent.id in seen:
+                parent = None  # 순환 참조 방지
+            current = parent
+
+        prefix = self._paths.get(current.id) if current is not None else None
+        for item in reversed(chain):
+            prefix = f"{prefix} > {item.name}" if prefix else item.name
+            self._paths[item.id] = prefix
+        return self._paths[node.id]
+
+    def build_paths(self):
+        """
+        Materialized path for every node, computed in memory.
+
+        Returns ``{id: path}``; nodes whose parent is missing from the tree
+        are treated as roots.
+        """
+        paths = {}
+        for node in self.nodes:
+            chain, seen = [], set()
+            current = node
+            while current is not None and current.id not in paths and current.id not in seen:
+                chain.append(current)
+                seen.add(current.id)
+                current = self.by_id.get(current.parent_id)
+
+            prefix = paths.get(current.id, '') if current is not None else ''
+            for item in reversed(chain):
+                prefix = f"{prefix}{item.id}{Criteria.PATH_SEPARATOR}"
+                paths[item.id] = prefix
+        return paths
+
+    def stale_nodes(self):
+        """Nodes whose stored ``path`` differs from the computed one, with ``path`` updated"""
+        stale = []
+        for node_id, path in self.build_paths().items():
+            node = self.by_id[node_id]
+            if node.path != path:
+                node.path = path
+                stale.append(node)
+        return stale
+
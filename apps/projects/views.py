@@ -14,7 +14,16 @@ from .serializers import (
     ProjectSerializer, ProjectCreateSerializer, ProjectSummarySerializer,
     ProjectMemberSerializer, CriteriaSerializer, ProjectTemplateSerializer
 )
+from .cloning import (
+    bulk_create_hierarchy, clone_criteria, clone_evaluations, criteria_nodes_from_structure
+)
+from .tree import CriteriaTree
+from apps.common.access import ProjectAccess
+from apps.common.activity import log_activity
 from apps.common.permissions import IsOwnerOrReadOnly
+from apps.subscriptions.entitlements import (
+    ensure_evaluator_capacity, ensure_within_limit, project_evaluator_ids, recalculate_usage,
+)
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -32,17 +41,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         # Exclude deleted projects by default
-        base_queryset = Project.objects.filter(deleted_at__isnull=True)
-
-        if user.is_superuser:
-            return base_queryset
-
         # Users can see projects they own, collaborate on, or are public
-        return base_queryset.filter(
-            models.Q(owner=user) |
-            models.Q(collaborators=user) |
-            models.Q(visibility='public')
-        ).distinct().select_related('owner').prefetch_related('collaborators')
+        queryset = Project.objects.filter(
+            deleted_at__isnull=True
+        ).visible_to(user).with_counts().select_related('owner')
+
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related('projectmember_set__user', 'criteria')
+        return queryset
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -51,6 +57,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
         elif self.action == 'list':
             return ProjectSummarySerializer
         return ProjectSerializer
+
+    def perform_create(self, serializer):
+        """구독 플랜의 프로젝트 한도 확인 후 생성 (캐시된 사용량 기준)"""
+        ensure_within_limit(self.request.user.pk, 'projects')
+        serializer.save()
+
+    def retrieve(self, request, *args, **kwargs):
+        """Project detail; the view is recorded in the activity log off the request path"""
+        project = self.get_object()
+        log_activity('view', f'Viewed project {project.title}', request=request, target=project)
+        return Response(self.get_serializer(project).data)
     
     @action(detail=True, methods=['post'])
     def add_member(self, request, pk=None):
@@ -58,10 +75,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project = self.get_object()
         
         # Check permission
-        if not project.projectmember_set.filter(
-            user=request.user,
-            can_manage_evaluators=True
-        ).exists() and project.owner != request.user:
+        if not ProjectAccess.for_request(request).can_manage_evaluators(project):
             return Response(
                 {'error': 'Permission denied'},
                 status=status.HTTP_403_FORBIDDEN
@@ -108,10 +122,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             )
         
         # Check permission
-        if not project.projectmember_set.filter(
-            user=request.user,
-            can_manage_evaluators=True
-        ).exists() and project.owner != request.user:
+        if not ProjectAccess.for_request(request).can_manage_evaluators(project):
             return Response(
                 {'error': 'Permission denied'},
                 status=status.HTTP_403_FORBIDDEN
@@ -144,10 +155,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             )
         
         # Check permission
-        if not project.projectmember_set.filter(
-            user=request.user,
-            can_manage_evaluators=True
-        ).exists() and project.owner != request.user:
+        if not ProjectAccess.for_request(request).can_manage_evaluators(project):
             return Response(
                 {'error': 'Permission denied'},
                 status=status.HTTP_403_FORBIDDEN
@@ -175,9 +183,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def criteria(self, request, pk=None):
         """Get project criteria hierarchy"""
         project = self.get_object()
-        # Get root criteria (no parent)
-        criteria = project.criteria.filter(parent=None, is_active=True).order_by('order')
-        serializer = CriteriaSerializer(criteria, many=True)
+        # 전체 기준을 한 번에 조회하여 메모리에서 계층 구성
+        tree = CriteriaTree.for_project(project)
+        serializer = CriteriaSerializer(tree.roots(), many=True, context={'criteria_tree': tree})
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
@@ -186,10 +194,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project = self.get_object()
         
         # Check permission
-        if not project.projectmember_set.filter(
-            user=request.user,
-            can_edit_structure=True
-        ).exists() and project.owner != request.user:
+        if not ProjectAccess.for_request(request).can_edit_structure(project):
             return Response(
                 {'error': 'Permission denied'},
                 status=status.HTTP_403_FORBIDDEN
@@ -262,6 +267,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
         trashed_projects = Project.objects.filter(
             owner=user,
             deleted_at__isnull=False
+        ).with_counts().select_related('owner').prefetch_related(
+            'projectmember_set__user', 'criteria'
         ).order_by('-deleted_at')
         
         serializer = ProjectSerializer(trashed_projects, many=True, context={'request': request})
@@ -305,6 +312,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def duplicate(self, request, pk=None):
         """Duplicate a project"""
         original_project = self.get_object()
+        include_evaluations = str(request.data.get('include_evaluations', '')).lower() in ('1', 'true', 'yes')
+        ensure_within_limit(request.user.pk, 'projects')
+        if include_evaluations:
+            # 복제된 평가자도 새 프로젝트의 평가자 한도 안에 있어야 함
+            ensure_evaluator_capacity(request.user.pk, None, project_evaluator_ids(original_project.pk))
         
         with transaction.atomic():
             # Create new project
@@ -329,30 +341,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 can_view_results=True
             )
             
-            # Copy criteria hierarchy
-            criteria_mapping = {}
-            
-            def copy_criteria(parent_criteria_list, new_parent=None):
-                for criteria in parent_criteria_list:
-                    new_criteria = Criteria.objects.create(
-                        project=new_project,
-                        name=criteria.name,
-                        description=criteria.description,
-                        type=criteria.type,
-                        parent=new_parent,
-                        order=criteria.order,
-                        level=criteria.level
-                    )
-                    criteria_mapping[criteria.id] = new_criteria
-                    
-                    # Recursively copy children
-                    children = criteria.children.filter(is_active=True).order_by('order')
-                    if children:
-                        copy_criteria(children, new_criteria)
+            # Copy criteria hierarchy (한 번의 조회 + 레벨별 bulk_create)
+            criteria_mapping = clone_criteria(original_project, new_project)
             
-            # Start with root criteria
-            root_criteria = original_project.criteria.filter(parent=None, is_active=True).order_by('order')
-            copy_criteria(root_criteria)
+            # 선택적으로 평가 및 쌍대비교 데이터까지 복제
+            if include_evaluations:
+                clone_evaluations(original_project, new_project, criteria_mapping)
+                # bulk_create는 시그널을 발생시키지 않으므로 사용량 재집계
+                recalculate_usage(request.user.pk)
         
         serializer = ProjectSerializer(new_project, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -375,17 +371,27 @@ class CriteriaViewSet(viewsets.ModelViewSet):
             return Criteria.objects.filter(is_active=True).select_related('project', 'parent').order_by('level', 'order')
 
         # Only return criteria for projects the user has access to
-        accessible_projects = Project.objects.filter(
-            models.Q(owner=user) |
-            models.Q(collaborators=user) |
-            models.Q(visibility='public')
-        ).values_list('id', flat=True)
+        accessible_projects = Project.objects.visible_to(user).values('id')
 
         return Criteria.objects.filter(
             is_active=True,
             project__in=accessible_projects
         ).select_related('project', 'parent').order_by('level', 'order')
     
+    def list(self, request, *args, **kwargs):
+        """List criteria, resolving children and paths from one tree query"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        items = page if page is not None else list(queryset)
+        
+        context = self.get_serializer_context()
+        context['criteria_tree'] = CriteriaTree.for_projects({item.project_id for item in items})
+        serializer = self.get_serializer_class()(items, many=True, context=context)
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+    
     def create(self, request, *args, **kwargs):
         """Create new criteria with proper validation"""
         try:
@@ -524,10 +530,10 @@ class ProjectTemplateViewSet(viewsets.ModelViewSet):
     def create_project(self, request, pk=None):
         """Create a project from template"""
         template = self.get_object()
+        ensure_within_limit(request.user.pk, 'projects')
         
         # Increment usage count
-        template.usage_count += 1
-        template.save(update_fields=['usage_count'])
+        ProjectTemplate.objects.filter(pk=template.pk).update(usage_count=models.F('usage_count') + 1)
         
         with transaction.atomic():
             # Create project from template
@@ -541,27 +547,11 @@ class ProjectTemplateViewSet(viewsets.ModelViewSet):
             serializer.is_valid(raise_exception=True)
             project = serializer.save()
             
-            # Create criteria from template structure
-            def create_criteria_from_structure(structure, parent=None, level=0):
-                for i, item in enumerate(structure):
-                    criteria = Criteria.objects.create(
-                        project=project,
-                        name=item['name'],
-                        description=item.get('description', ''),
-                        type=item.get('type', 'criteria'),
-                        parent=parent,
-                        order=i,
-                        level=level
-                    )
-                    
-                    # Create children if they exist
-                    if 'children' in item:
-                        create_criteria_from_structure(
-                            item['children'], criteria, level + 1
-                        )
-            
+            # Create criteria from template structure (레벨별 bulk_create)
             if 'structure' in template.structure:
-                create_criteria_from_structure(template.structure['structure'])
+                bulk_create_hierarchy(
+                    project, criteria_nodes_from_structure(template.structure['structure'])
+                )
         
         return Response(
             ProjectSerializer(project, context={'request': request}).data,
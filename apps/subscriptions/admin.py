@@ -8,10 +8,14 @@ from django.utils import timezone
 from django.urls import reverse
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Count, Sum, Q
+from .entitlements import invalidate_entitlements
+from .stats import SUBSCRIPTION_STATS_CACHE_KEY
 from .models import (
     SubscriptionPlan, UserSubscription, PaymentMethod, 
-    PaymentRecord, SubscriptionUsage, UsageAlert, CouponCode
+    PaymentRecord, SubscriptionUsage, UsageAlert, CouponCode, MonthlyRevenue
 )
 
 
@@ -228,12 +232,17 @@ class UserSubscriptionAdmin(admin.ModelAdmin):
     ]
     
     def activate_subscriptions(self, request, queryset):
+        user_ids = list(queryset.values_list('user_id', flat=True))
         updated = queryset.update(status='active')
+        # queryset.update()는 시그널을 보내지 않으므로 캐시된 구독 권한 직접 무효화
+        invalidate_entitlements(*user_ids)
         self.message_user(request, f'{updated}개 구독이 활성화되었습니다.')
     activate_subscriptions.short_description = '선택된 구독 활성화'
     
     def cancel_subscriptions(self, request, queryset):
+        user_ids = list(queryset.values_list('user_id', flat=True))
         updated = queryset.update(status='cancelled', auto_renew=False)
+        invalidate_entitlements(*user_ids)
         self.message_user(request, f'{updated}개 구독이 취소되었습니다.')
     cancel_subscriptions.short_description = '선택된 구독 취소'
     
@@ -325,20 +334,37 @@ class PaymentRecordAdmin(admin.ModelAdmin):
     actions = ['mark_as_completed', 'process_refund']
     
     def mark_as_completed(self, request, queryset):
-        updated = queryset.filter(status='pending').update(
-            status='completed',
-            paid_at=timezone.now()
-        )
-        self.message_user(request, f'{updated}개 결제가 완료 처리되었습니다.')
+        # 건별 save(): 결제 완료 시그널이 월별 수익 집계(MonthlyRevenue)를 갱신
+        now = timezone.now()
+        with transaction.atomic():
+            payments = list(queryset.filter(status='pending').select_for_update())
+            for payment in payments:
+                payment.status = 'completed'
+                payment.paid_at = now
+                payment.save(update_fields=['status', 'paid_at', 'updated_at'])
+        cache.delete(SUBSCRIPTION_STATS_CACHE_KEY)
+        self.message_user(request, f'{len(payments)}개 결제가 완료 처리되었습니다.')
     mark_as_completed.short_description = '결제 완료 처리'
     
     def process_refund(self, request, queryset):
         # 실제로는 결제 게이트웨이와 연동하여 환불 처리
-        updated = queryset.filter(status='completed').update(status='refunded')
-        self.message_user(request, f'{updated}개 결제가 환불 처리되었습니다.')
+        with transaction.atomic():
+            payments = list(queryset.filter(status='completed').select_for_update())
+            for payment in payments:
+                payment.status = 'refunded'
+                payment.save(update_fields=['status', 'updated_at'])
+        cache.delete(SUBSCRIPTION_STATS_CACHE_KEY)
+        self.message_user(request, f'{len(payments)}개 결제가 환불 처리되었습니다.')
     process_refund.short_description = '환불 처리'
 
 
+@admin.register(MonthlyRevenue)
+class MonthlyRevenueAdmin(admin.ModelAdmin):
+    list_display = ['month', 'revenue', 'payment_count', 'updated_at']
+    ordering = ['-month']
+    readonly_fields = ['month', 'revenue', 'payment_count', 'updated_at']
+
+
 @admin.register(PaymentMethod)
 class PaymentMethodAdmin(admin.ModelAdmin):
     list_display = [
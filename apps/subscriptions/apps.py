@@ -4,4 +4,6 @@ from django.apps import AppConfig
 class SubscriptionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.subscriptions'
-    verbose_name = '구독 관리'
\ No newline at end of file
+    verbose_name = '구독 관리'
+    def ready(self):
+        from . import signals  # noqa: F401
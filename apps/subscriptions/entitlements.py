@@ -0,0 +1,283 @@
+"""
+Cached subscription entitlements
+
+Each user has a cached snapshot of their subscription status, plan limits and
+features, plus one cache counter per counted resource (projects). Signal
+handlers keep ``SubscriptionUsage`` current with ``F()`` updates and apply the
+same delta to the cache counter, so project limit checks on a warm cache run
+no queries. Saving a subscription, plan or usage row drops the snapshot and
+the counters, and the next read rebuilds both with a single query.
+
+The evaluator limit is per project (``max_evaluators_per_project``): it is
+checked against the distinct evaluators of the target project, one query.
+``current_evaluators`` is the owner's distinct evaluators across projects and
+is informational only.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+ENTITLEMENT_CACHE_TIMEOUT = 10 * 60
+
+# 시그널로 유지되고 캐시 카운터를 갖는 리소스 -> SubscriptionUsage 필드
+COUNTED_RESOURCES = {
+    'projects': 'current_projects',
+}
+
+
+class LimitExceeded(APIException):
+    status_code = status.HTTP_403_FORBIDDEN
+    default_detail = '구독 플랜의 사용 한도를 초과했습니다.'
+    default_code = 'limit_exceeded'
+
+    def __init__(self, resource, current, limit):
+        super().__init__()
+        # 숫자 필드가 문자열(ErrorDetail)로 바뀌지 않도록 응답 본문을 직접 구성
+        self.detail = {
+            'detail': str(self.default_detail),
+            'resource_type': resource,
+            'current_usage': current,
+            'limit': limit,
+        }
+
+
+def entitlement_cache_key(user_id):
+    return f"entitlements:{user_id}"
+
+
+def usage_counter_key(user_id, resource):
+    return f"entitlements:{user_id}:{resource}"
+
+
+def invalidate_entitlements(*user_ids):
+    """Drop the cached snapshot and usage counters of the given users"""
+    keys = []
+    for user_id in user_ids:
+        if user_id:
+            keys.append(entitlement_cache_key(user_id))
+            keys.extend(usage_counter_key(user_id, resource) for resource in COUNTED_RESOURCES)
+    if keys:
+        cache.delete_many(keys)
+
+
+class Entitlements:
+    """A user's subscription limits, features and current usage"""
+
+    def __init__(self, user_id, snapshot, counts):
+        self.user_id = user_id
+        self.snapshot = snapshot
+        self.counts = counts
+
+    @property
+    def has_subscription(self):
+        return self.snapshot['subscription_id'] is not None
+
+    @property
+    def is_active(self):
+        return self.snapshot['status'] == 'active'
+
+    @property
+    def has_usage(self):
+        return self.snapshot['has_usage']
+
+    def limit(self, resource):
+        return self.snapshot['limits'].get(resource, -1)
+
+    def current(self, resource):
+        """Owner-wide usage; the per-project evaluator count comes from project_evaluator_ids()"""
+        if resource in COUNTED_RESOURCES:
+            return self.counts.get(resource, 0)
+        return self.snapshot['usage'].get(resource, 0)
+
+    def has_feature(self, feature):
+        return bool(self.snapshot['features'].get(feature))
+
+    def allows(self, resource, amount=1):
+        """SubscriptionUsage.check_limit과 같은 규칙 (-1은 무제한, 알 수 없는 리소스는 허용)"""
+        limit = self.limit(resource)
+        if limit == -1:
+            return True
+        return self.current(resource) + amount <= limit
+
+
+def build_entitlements(user_id):
+    """Snapshot and counted usage for one user in a single query"""
+    from .models import UserSubscription
+
+    subscription = UserSubscription.objects.select_related('plan', 'usage').filter(
+        user_id=user_id
+    ).order_by().first()
+    if subscription is None:
+        snapshot = {
+            'subscription_id': None, 'status': None, 'plan_id': None, 'has_usage': False,
+            'limits': {}, 'usage': {}, 'features': {},
+        }
+        return snapshot, {resource: 0 for resource in COUNTED_RESOURCES}
+
+    plan = subscription.plan
+    usage = getattr(subscription, 'usage', None)
+    snapshot = {
+        'subscription_id': str(subscription.pk),
+        'status': subscription.status,
+        'plan_id': plan.plan_id,
+        'has_usage': usage is not None,
+        'limits': {
+            'projects': subscription.effective_max_projects,
+            'evaluators': subscription.effective_max_evaluators,
+            'surveys': plan.max_surveys_per_project,
+            'storage': plan.storage_limit_gb,
+        },
+        'usage': {
+            'surveys': usage.current_surveys if usage else 0,
+            'storage': float(usage.storage_used_gb) if usage else 0.0,
+        },
+        'features': {
+            'ai': subscription.effective_ai_enabled,
+            'advanced_analytics': plan.advanced_analytics,
+            'group_ahp': plan.group_ahp_enabled,
+            'api_access': plan.api_access,
+        },
+    }
+    counts = {
+        resource: getattr(usage, field) if usage else 0
+        for resource, field in COUNTED_RESOURCES.items()
+    }
+    return snapshot, counts
+
+
+def get_entitlements(user_id):
+    """Cached entitlements; one cache round trip when warm"""
+    snapshot_key = entitlement_cache_key(user_id)
+    counter_keys = {resource: usage_counter_key(user_id, resource) for resource in COUNTED_RESOURCES}
+    cached = cache.get_many([snapshot_key, *counter_keys.values()])
+    if len(cached) == len(counter_keys) + 1:
+        counts = {resource: cached[key] for resource, key in counter_keys.items()}
+        return Entitlements(user_id, cached[snapshot_key], counts)
+
+    snapshot, counts = build_entitlements(user_id)
+    values = {snapshot_key: snapshot}
+    values.update({counter_keys[resource]: count for resource, count in counts.items()})
+    cache.set_many(values, ENTITLEMENT_CACHE_TIMEOUT)
+    return Entitlements(user_id, snapshot, counts)
+
+
+def ensure_within_limit(user_id, resource, amount=1):
+    """
+    Raise LimitExceeded if an active subscription does not allow ``amount`` more
+
+    Users without an active subscription are not limited here.
+    """
+    entitlements = get_entitlements(user_id)
+    if not entitlements.is_active or entitlements.allows(resource, amount):
+        return entitlements
+    raise LimitExceeded(resource, entitlements.current(resource), entitlements.limit(resource))
+
+
+def _may_have_usage(user_id):
+    """False when the cached snapshot says there is no usage row to update"""
+    if not user_id:
+        return False
+    snapshot = cache.get(entitlement_cache_key(user_id))
+    return snapshot is None or snapshot['has_usage']
+
+
+def project_evaluator_ids(project_id):
+    """Distinct evaluators already assigned to a project (one query)"""
+    from apps.evaluations.models import Evaluation
+
+    if project_id is None:
+        return set()
+    return set(Evaluation.objects.filter(project_id=project_id).values_list(
+        'evaluator_id', flat=True
+    ).distinct())
+
+
+def evaluator_allowance(owner_id, project_id=None):
+    """
+    ``(limit, current evaluator ids)`` for a project of ``owner_id``
+
+    None when the owner is not limited (no active subscription or unlimited
+    plan); no query is made in that case. ``project_id=None`` is a project
+    that does not exist yet.
+    """
+    entitlements = get_entitlements(owner_id)
+    limit = entitlements.limit('evaluators')
+    if not entitlements.is_active or limit == -1:
+        return None
+    return limit, project_evaluator_ids(project_id)
+
+
+def ensure_evaluator_capacity(owner_id, project_id, evaluator_ids):
+    """Raise LimitExceeded if adding ``evaluator_ids`` takes the project past its evaluator limit"""
+    allowance = evaluator_allowance(owner_id, project_id)
+    if allowance is None:
+        return
+    limit, current = allowance
+    added = set(evaluator_ids) - current
+    if added and len(current) + len(added) > limit:
+        raise LimitExceeded('evaluators', len(current), limit)
+
+
+def record_usage_change(user_id, resource, delta, created=False):
+    """
+    Apply ``delta`` to a counted resource in the database and in the cache
+
+    The row is updated with ``F()`` (no read-modify-write); the cache counter
+    follows once the transaction commits. A missing counter is left alone
+    and rebuilt from the database on the next read. ``created`` also counts
+    new projects in ``total_projects_created`` (not restores).
+    """
+    from .models import SubscriptionUsage
+
+    if not delta or not _may_have_usage(user_id):
+        return
+
+    field = COUNTED_RESOURCES[resource]
+    updates = {field: Greatest(F(field) + delta, 0)}
+    if resource == 'projects' and created:
+        updates['total_projects_created'] = F('total_projects_created') + delta
+    SubscriptionUsage.objects.filter(subscription__user_id=user_id).update(**updates)
+
+    def adjust_counter():
+        try:
+            cache.incr(usage_counter_key(user_id, resource), delta)
+        except ValueError:
+            pass
+    transaction.on_commit(adjust_counter)
+
+
+def owner_evaluator_count(user_id):
+    """Subquery: distinct evaluators across a user's projects"""
+    from apps.evaluations.models import Evaluation
+
+    distinct = Evaluation.objects.filter(project__owner_id=user_id).order_by().values(
+        'project__owner'
+    ).annotate(total=Count('evaluator', distinct=True)).values('total')
+    return Coalesce(Subquery(distinct, output_field=IntegerField()), Value(0))
+
+
+def refresh_evaluator_usage(user_id):
+    """Recount ``current_evaluators`` with one UPDATE (distinct counts cannot follow ±1 deltas)"""
+    from .models import SubscriptionUsage
+
+    if _may_have_usage(user_id):
+        SubscriptionUsage.objects.filter(subscription__user_id=user_id).update(
+            current_evaluators=owner_evaluator_count(user_id)
+        )
+
+
+def recalculate_usage(*user_ids):
+    """Recount projects/evaluators from the source tables (bulk paths, hard deletes)"""
+    from apps.projects.models import Project
+    from .models import SubscriptionUsage
+
+    user_ids = [user_id for user_id in set(user_ids) if user_id]
+    for user_id in user_ids:
+        SubscriptionUsage.objects.filter(subscription__user_id=user_id).update(
+            current_projects=Project.objects.filter(owner_id=user_id, deleted_at__isnull=True).count(),
+            current_evaluators=owner_evaluator_count(user_id),
+        )
+    transaction.on_commit(lambda: invalidate_entitlements(*user_ids))
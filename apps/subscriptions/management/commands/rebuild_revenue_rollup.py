@@ -0,0 +1,22 @@
+"""
+Monthly revenue rollup rebuild command
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from apps.subscriptions.stats import SUBSCRIPTION_STATS_CACHE_KEY, rebuild_revenue_rollup
+
+
+class Command(BaseCommand):
+    help = 'Recompute the MonthlyRevenue rollup from completed payments (one group-by query)'
+
+    def handle(self, *args, **options):
+        months = rebuild_revenue_rollup()
+        cache.delete(SUBSCRIPTION_STATS_CACHE_KEY)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt revenue rollup for {months} months"))
+        if not settings.SUBSCRIPTION_REVENUE_ROLLUP:
+            self.stdout.write(self.style.WARNING(
+                'SUBSCRIPTION_REVENUE_ROLLUP is off: the rollup is not kept current or used for stats'
+            ))
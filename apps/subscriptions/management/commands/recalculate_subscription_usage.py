@@ -0,0 +1,28 @@
+"""
+Subscription usage counter backfill command
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.subscriptions.entitlements import recalculate_usage
+from apps.subscriptions.models import SubscriptionUsage
+
+
+class Command(BaseCommand):
+    help = 'Recount SubscriptionUsage.current_projects / current_evaluators from projects and evaluations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', help='Only recount this user ID (repeatable)')
+
+    def handle(self, *args, **options):
+        user_ids = options['user'] or SubscriptionUsage.objects.values_list(
+            'subscription__user_id', flat=True
+        )
+
+        total = 0
+        for user_id in user_ids:
+            with transaction.atomic():
+                recalculate_usage(user_id)
+            total += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted usage for {total} subscribers"))
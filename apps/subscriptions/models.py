@@ -333,6 +333,25 @@ class PaymentRecord(models.Model):
         return self.amount - self.discount_amount
 
 
+class MonthlyRevenue(models.Model):
+    """월별 결제 수익 집계 (SUBSCRIPTION_REVENUE_ROLLUP 사용 시 결제 완료 시그널로 갱신)"""
+
+    month = models.DateField(unique=True, verbose_name='월')  # TIME_ZONE 기준 해당 월 1일
+    revenue = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name='수익')
+    payment_count = models.IntegerField(default=0, verbose_name='결제 건수')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='업데이트일')
+
+    class Meta:
+        app_label = 'subscriptions'
+        db_table = 'subscription_monthly_revenue'
+        verbose_name = '월별 수익'
+        verbose_name_plural = '월별 수익들'
+        ordering = ['month']
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} - ₩{self.revenue:,}"
+
+
 class SubscriptionUsage(models.Model):
     """구독 사용량 추적"""
     
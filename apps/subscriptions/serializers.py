@@ -259,6 +259,8 @@ class LimitCheckSerializer(serializers.Serializer):
         choices=['projects', 'evaluators', 'surveys', 'storage', 'ai_requests']
     )
     required_amount = serializers.IntegerField(default=1, min_value=1)
+    # evaluators 한도는 프로젝트당: 지정하면 해당 프로젝트의 현재 평가자 수 기준 (없으면 새 프로젝트 기준)
+    project = serializers.UUIDField(required=False)
     
     def validate_resource_type(self, value):
         valid_resources = ['projects', 'evaluators', 'surveys', 'storage', 'ai_requests']
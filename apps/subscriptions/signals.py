@@ -0,0 +1,142 @@
+"""
+Signal handlers for the subscriptions app
+
+Keep SubscriptionUsage.current_projects / current_evaluators in step with
+Project and Evaluation rows, and drop cached entitlements when a subscription,
+plan or usage row changes. Bulk paths (bulk_create, queryset.update) do not
+send signals and call ``recalculate_usage`` themselves.
+
+With SUBSCRIPTION_REVENUE_ROLLUP on, completed payments are also added to the
+MonthlyRevenue rollup (``manage.py rebuild_revenue_rollup`` after enabling it).
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.evaluations.models import Evaluation
+from apps.projects.models import Project
+from .entitlements import (
+    invalidate_entitlements, recalculate_usage, record_usage_change, refresh_evaluator_usage,
+)
+from .models import PaymentRecord, SubscriptionPlan, SubscriptionUsage, UserSubscription
+from .stats import record_revenue, revenue_contribution
+
+
+def _is_deleted(project):
+    # __dict__에서 직접 읽어 지연(deferred) 필드 로딩 쿼리를 피함
+    if 'deleted_at' not in project.__dict__:
+        return None
+    return project.__dict__['deleted_at'] is not None
+
+
+@receiver(post_init, sender=Project)
+def remember_project_state(sender, instance, **kwargs):
+    instance._usage_deleted = _is_deleted(instance)
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    """New projects count toward the owner's usage; soft delete/restore move the count"""
+    deleted = _is_deleted(instance)
+    if created:
+        if not deleted:
+            record_usage_change(instance.owner_id, 'projects', 1, created=True)
+    else:
+        was_deleted = getattr(instance, '_usage_deleted', None)
+        if was_deleted is not None and deleted is not None and was_deleted != deleted:
+            record_usage_change(instance.owner_id, 'projects', -1 if deleted else 1)
+    instance._usage_deleted = deleted
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    # 영구 삭제는 평가도 함께 삭제(CASCADE)되므로 재집계
+    recalculate_usage(instance.owner_id)
+
+
+def _project_owner_id(evaluation):
+    if Evaluation.project.is_cached(evaluation):
+        return evaluation.project.owner_id
+    return Project.objects.filter(pk=evaluation.project_id).values_list('owner_id', flat=True).first()
+
+
+@receiver(post_save, sender=Evaluation)
+def evaluation_created(sender, instance, created, **kwargs):
+    if created:
+        refresh_evaluator_usage(_project_owner_id(instance))
+
+
+@receiver(post_delete, sender=Evaluation)
+def evaluation_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Project):
+        return  # project_deleted에서 재집계
+    refresh_evaluator_usage(_project_owner_id(instance))
+
+
+@receiver([post_save, post_delete], sender=UserSubscription)
+def subscription_changed(sender, instance, **kwargs):
+    invalidate_entitlements(instance.user_id)
+
+
+@receiver(post_save, sender=SubscriptionUsage)
+def usage_saved(sender, instance, created, **kwargs):
+    if created:
+        # 새 사용량 행은 기존 프로젝트/평가 수로 채움 (재집계가 캐시도 무효화)
+        recalculate_usage(instance.subscription.user_id)
+    else:
+        invalidate_entitlements(instance.subscription.user_id)
+
+
+@receiver(post_delete, sender=SubscriptionUsage)
+def usage_deleted(sender, instance, **kwargs):
+    invalidate_entitlements(
+        UserSubscription.objects.filter(pk=instance.subscription_id).values_list('user_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+def plan_changed(sender, instance, **kwargs):
+    invalidate_entitlements(*instance.subscriptions.values_list('user_id', flat=True))
+
+
+REVENUE_FIELDS = ('status', 'paid_at', 'amount')
+UNKNOWN = object()
+
+
+def _revenue_contribution(payment):
+    # 지연 로딩된 필드가 있으면 판단하지 않음 (rebuild_revenue_rollup으로 보정)
+    if any(name not in payment.__dict__ for name in REVENUE_FIELDS):
+        return UNKNOWN
+    return revenue_contribution(payment)
+
+
+@receiver(post_init, sender=PaymentRecord)
+def remember_payment_state(sender, instance, **kwargs):
+    if settings.SUBSCRIPTION_REVENUE_ROLLUP:
+        instance._revenue_contribution = _revenue_contribution(instance)
+
+
+@receiver(post_save, sender=PaymentRecord)
+def payment_saved(sender, instance, created, **kwargs):
+    """Completing (or un-completing) a payment moves its amount in the monthly rollup"""
+    if not settings.SUBSCRIPTION_REVENUE_ROLLUP:
+        return
+    previous = None if created else getattr(instance, '_revenue_contribution', UNKNOWN)
+    current = _revenue_contribution(instance)
+    if previous is UNKNOWN or current is UNKNOWN or previous == current:
+        instance._revenue_contribution = current
+        return
+    if previous is not None:
+        record_revenue(previous[0], -previous[1], -1)
+    if current is not None:
+        record_revenue(current[0], current[1], 1)
+    instance._revenue_contribution = current
+
+
+@receiver(post_delete, sender=PaymentRecord)
+def payment_deleted(sender, instance, **kwargs):
+    if not settings.SUBSCRIPTION_REVENUE_ROLLUP:
+        return
+    contribution = getattr(instance, '_revenue_contribution', UNKNOWN)
+    if contribution is not UNKNOWN and contribution is not None:
+        record_revenue(contribution[0], -contribution[1], -1)
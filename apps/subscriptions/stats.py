@@ -0,0 +1,147 @@
+"""
+Subscription statistics service (admin dashboard)
+
+Revenue per month comes from one ``TruncMonth`` + ``Sum`` group-by over
+completed payments, or from the ``MonthlyRevenue`` rollup table when
+``SUBSCRIPTION_REVENUE_ROLLUP`` is on. Subscription counts for growth and
+churn are one conditional aggregate. The result is cached for
+``SUBSCRIPTION_STATS_CACHE_SECONDS``.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import MonthlyRevenue, PaymentRecord, UserSubscription
+
+SUBSCRIPTION_STATS_CACHE_KEY = 'subscription_stats'
+REVENUE_MONTHS = 12
+CHURNED_STATUSES = ('cancelled', 'expired')
+
+
+def month_start(value):
+    """Local (TIME_ZONE) first day of the month of ``value``, 00:00"""
+    return timezone.localtime(value).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month, count):
+    year, index = divmod(month.year * 12 + month.month - 1 + count, 12)
+    return month.replace(year=year, month=index + 1)
+
+
+def revenue_by_month(since):
+    """{month (date): revenue} for completed payments paid at or after ``since``"""
+    if settings.SUBSCRIPTION_REVENUE_ROLLUP:
+        return dict(MonthlyRevenue.objects.filter(month__gte=since.date()).values_list('month', 'revenue'))
+
+    rows = PaymentRecord.objects.filter(
+        status='completed', paid_at__gte=since
+    ).annotate(month=TruncMonth('paid_at')).order_by().values('month').annotate(
+        total=Sum('amount')
+    ).values_list('month', 'total')
+    return {timezone.localtime(month).date(): total for month, total in rows}
+
+
+def total_revenue():
+    if settings.SUBSCRIPTION_REVENUE_ROLLUP:
+        total = MonthlyRevenue.objects.aggregate(total=Sum('revenue'))['total']
+    else:
+        total = PaymentRecord.objects.filter(status='completed').aggregate(total=Sum('amount'))['total']
+    return total or Decimal('0')
+
+
+def compute_subscription_stats():
+    """All dashboard statistics in four queries"""
+    current_month = month_start(timezone.now())
+    last_month = add_months(current_month, -1)
+    first_month = add_months(current_month, -(REVENUE_MONTHS - 1))
+
+    counts = UserSubscription.objects.aggregate(
+        active=Count('id', filter=Q(status='active')),
+        new_this_month=Count('id', filter=Q(created_at__gte=current_month)),
+        new_last_month=Count('id', filter=Q(created_at__gte=last_month, created_at__lt=current_month)),
+        # 별도 해지일 필드가 없으므로 이번 달에 해지/만료 상태로 바뀐 구독으로 근사
+        churned_this_month=Count('id', filter=Q(status__in=CHURNED_STATUSES, updated_at__gte=current_month)),
+    )
+    plan_distribution = dict(
+        UserSubscription.objects.filter(status='active').order_by().values('plan__name').annotate(
+            count=Count('id')
+        ).values_list('plan__name', 'count')
+    )
+    revenue = total_revenue()
+    monthly = revenue_by_month(first_month)
+
+    monthly_growth = 0
+    if counts['new_last_month'] > 0:
+        monthly_growth = (counts['new_this_month'] - counts['new_last_month']) / counts['new_last_month'] * 100
+
+    churn_base = counts['active'] + counts['churned_this_month']
+    churn_rate = counts['churned_this_month'] / churn_base * 100 if churn_base else 0
+
+    months = [add_months(first_month, i) for i in range(REVENUE_MONTHS)]
+    return {
+        'total_active_subscriptions': counts['active'],
+        'total_revenue': revenue,
+        'plan_distribution': plan_distribution,
+        'monthly_growth': monthly_growth,
+        'revenue_by_month': [
+            {'month': month.strftime('%Y-%m'), 'revenue': float(monthly.get(month.date(), 0))}
+            for month in months
+        ],
+        'user_acquisition_rate': monthly_growth,
+        'churn_rate': churn_rate,
+        'average_revenue_per_user': revenue / counts['active'] if counts['active'] else Decimal('0'),
+    }
+
+
+def get_subscription_stats():
+    """Cached subscription statistics (short TTL, not invalidated on writes)"""
+    timeout = settings.SUBSCRIPTION_STATS_CACHE_SECONDS
+    if timeout <= 0:
+        return compute_subscription_stats()
+    stats = cache.get(SUBSCRIPTION_STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_subscription_stats()
+        cache.set(SUBSCRIPTION_STATS_CACHE_KEY, stats, timeout)
+    return stats
+
+
+def revenue_contribution(payment):
+    """(month, amount) a payment adds to the rollup, or None if it is not completed"""
+    if payment.status != 'completed' or payment.paid_at is None:
+        return None
+    return month_start(payment.paid_at).date(), payment.amount
+
+
+def record_revenue(month, amount, count):
+    """Add ``amount``/``count`` to a rollup month with F() (creating the row if needed)"""
+    updates = {'revenue': F('revenue') + amount, 'payment_count': F('payment_count') + count}
+    if MonthlyRevenue.objects.filter(month=month).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            MonthlyRevenue.objects.create(month=month, revenue=amount, payment_count=count)
+    except IntegrityError:
+        # 동시에 다른 요청이 같은 월 행을 만든 경우
+        MonthlyRevenue.objects.filter(month=month).update(**updates)
+
+
+def rebuild_revenue_rollup():
+    """Recompute every rollup month from completed payments; returns the number of months"""
+    rows = PaymentRecord.objects.filter(
+        status='completed', paid_at__isnull=False
+    ).annotate(month=TruncMonth('paid_at')).order_by().values('month').annotate(
+        total=Sum('amount'), count=Count('id')
+    ).values_list('month', 'total', 'count')
+    months = [
+        MonthlyRevenue(month=timezone.localtime(month).date(), revenue=total, payment_count=count)
+        for month, total, count in rows
+    ]
+    with transaction.atomic():
+        MonthlyRevenue.objects.all().delete()
+        MonthlyRevenue.objects.bulk_create(months)
+    return len(months)
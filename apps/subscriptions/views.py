@@ -14,6 +14,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from apps.projects.models import Project
+from .entitlements import get_entitlements, project_evaluator_ids
+from .stats import get_subscription_stats
 from .models import (
     SubscriptionPlan, UserSubscription, PaymentMethod,
     PaymentRecord, SubscriptionUsage, UsageAlert, CouponCode
@@ -386,32 +389,31 @@ class LimitCheckView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         data = serializer.validated_data
+        resource = data['resource_type']
         
-        try:
-            subscription = UserSubscription.objects.select_related('plan').get(
-                user=request.user,
-                status='active'
-            )
-            
-            if hasattr(subscription, 'usage'):
-                usage = subscription.usage
-                allowed = usage.check_limit(
-                    data['resource_type'],
-                    data['required_amount']
-                )
-                
-                return Response({
-                    'allowed': allowed,
-                    'resource_type': data['resource_type'],
-                    'required_amount': data['required_amount'],
-                    'current_usage': getattr(usage, f"current_{data['resource_type']}", 0),
-                    'limit': getattr(subscription.plan, f"max_{data['resource_type']}_per_project", -1)
-                })
-            else:
-                return Response({'detail': '사용량 정보가 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
-                
-        except UserSubscription.DoesNotExist:
+        # 캐시된 스냅샷과 사용량 카운터로 확인 (캐시가 채워져 있으면 DB 조회 없음)
+        entitlements = get_entitlements(request.user.pk)
+        if not entitlements.is_active:
             return Response({'detail': '활성 구독이 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        if not entitlements.has_usage:
+            return Response({'detail': '사용량 정보가 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        
+        current = entitlements.current(resource)
+        if resource == 'evaluators':
+            # 평가자 한도는 프로젝트당: 지정한 프로젝트의 고유 평가자 수 (미지정 시 새 프로젝트)
+            project_id = data.get('project')
+            if project_id and not Project.objects.filter(pk=project_id, owner=request.user).exists():
+                return Response({'detail': '프로젝트를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+            current = len(project_evaluator_ids(project_id))
+        limit = entitlements.limit(resource)
+        
+        return Response({
+            'allowed': limit == -1 or current + data['required_amount'] <= limit,
+            'resource_type': resource,
+            'required_amount': data['required_amount'],
+            'current_usage': current,
+            'limit': limit
+        })
 
 
 class CouponValidationView(APIView):
@@ -484,68 +486,8 @@ class SubscriptionStatsView(APIView):
         if not request.user.is_superuser:
             return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
         
-        # 기본 통계
-        total_active_subscriptions = UserSubscription.objects.filter(status='active').count()
-        total_revenue = PaymentRecord.objects.filter(status='completed').aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0')
-        
-        # 플랜별 분포
-        plan_distribution = dict(
-            UserSubscription.objects.filter(status='active').values_list(
-                'plan__name'
-            ).annotate(count=Count('id')).values_list('plan__name', 'count')
-        )
-        
-        # 월별 수익 (최근 12개월)
-        revenue_by_month = []
-        for i in range(12):
-            month_start = timezone.now().replace(day=1) - timedelta(days=30 * i)
-            month_end = month_start + timedelta(days=32)
-            month_end = month_end.replace(day=1) - timedelta(days=1)
-            
-            monthly_revenue = PaymentRecord.objects.filter(
-                status='completed',
-                paid_at__range=[month_start, month_end]
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-            
-            revenue_by_month.append({
-                'month': month_start.strftime('%Y-%m'),
-                'revenue': float(monthly_revenue)
-            })
-        
-        revenue_by_month.reverse()
-        
-        # 성장률 계산 (이번 달 vs 지난 달)
-        current_month = timezone.now().replace(day=1)
-        last_month = current_month - timedelta(days=1)
-        last_month_start = last_month.replace(day=1)
-        
-        current_month_subs = UserSubscription.objects.filter(
-            created_at__gte=current_month
-        ).count()
-        last_month_subs = UserSubscription.objects.filter(
-            created_at__range=[last_month_start, current_month]
-        ).count()
-        
-        monthly_growth = 0
-        if last_month_subs > 0:
-            monthly_growth = ((current_month_subs - last_month_subs) / last_month_subs) * 100
-        
-        # ARPU (Average Revenue Per User)
-        active_users = UserSubscription.objects.filter(status='active').count()
-        arpu = total_revenue / active_users if active_users > 0 else Decimal('0')
-        
-        stats_data = {
-            'total_active_subscriptions': total_active_subscriptions,
-            'total_revenue': total_revenue,
-            'plan_distribution': plan_distribution,
-            'monthly_growth': monthly_growth,
-            'revenue_by_month': revenue_by_month,
-            'user_acquisition_rate': monthly_growth,
-            'churn_rate': 0,  # 실제로는 더 복잡한 계산 필요
-            'average_revenue_per_user': arpu
-        }
+        # 집계 쿼리 4개로 계산, SUBSCRIPTION_STATS_CACHE_SECONDS 동안 캐시
+        stats_data = get_subscription_stats()
         
         serializer = SubscriptionStatsSerializer(stats_data)
         return Response(serializer.data)
\ No newline at end of file
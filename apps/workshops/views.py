@@ -182,11 +182,53 @@ class GroupConsensusResultViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = GroupConsensusResultSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['workshop']
+    MAX_CLUSTERS = 20
 
     def get_queryset(self):
         return GroupConsensusResult.objects.filter(
             workshop__facilitator=self.request.user
-        ).order_by('-created_at')
+        ).order_by('-calculated_at')
+
+    @action(detail=True, methods=['get', 'post'])
+    def clusters(self, request, pk=None):
+        """
+        참여자 가중치 벡터 군집 분석
+
+        GET은 계산 결과만 반환하고, POST는 consensus_clusters에 저장함.
+        max_clusters: 1~MAX_CLUSTERS (GET은 쿼리 파라미터, POST는 본문 또는 쿼리 파라미터)
+        """
+        from apps.analysis.clustering import cluster_evaluators, weight_matrix_from_json
+
+        source = request.data if request.method == 'POST' else request.query_params
+        raw = source.get('max_clusters', request.query_params.get('max_clusters', 8))
+        try:
+            max_clusters = int(raw)
+        except (TypeError, ValueError):
+            return Response({'error': 'max_clusters는 정수여야 합니다.'}, status=400)
+        if not 1 <= max_clusters <= self.MAX_CLUSTERS:
+            return Response(
+                {'error': f'max_clusters는 1에서 {self.MAX_CLUSTERS} 사이여야 합니다.'}, status=400
+            )
+
+        result = self.get_object()
+        try:
+            weights, participants = weight_matrix_from_json(result.individual_weights)
+        except ValueError as e:
+            return Response({'error': f'개인별 가중치 형식이 올바르지 않습니다: {e}'}, status=400)
+        if weights.size == 0:
+            return Response({'error': '개인별 가중치 데이터가 없습니다.'}, status=400)
+
+        clustering = cluster_evaluators(
+            weights, participants,
+            scope=('workshop', result.workshop_id),
+            max_clusters=max_clusters
+        ).to_dict()
+
+        if request.method == 'POST' and result.consensus_clusters != clustering:
+            result.consensus_clusters = clustering
+            result.save(update_fields=['consensus_clusters'])
+
+        return Response(clustering)
 
 
 class SurveyTemplateViewSet(viewsets.ModelViewSet):
@@ -33,7 +33,11 @@ if 'export_templates' in tables and ('exports', '0001_initial') not in applied:
     print('INFO: Marked exports.0001_initial as applied (tables already exist in DB)')
 "
 
-echo "Running database migrations..."
-python manage.py migrate --no-input
+echo "Running database migrations (single pre-deploy step, advisory-locked)..."
+# apps without committed migration files (e.g. subscriptions) still get theirs generated here
+python manage.py migrate_locked --makemigrations
+
+echo "Filling materialized paths of criteria saved before Criteria.path existed..."
+python manage.py backfill_criteria_paths --missing-only
 
 echo "Build completed successfully!"
@@ -11,13 +11,18 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
     TokenVerifyView,
 )
+import logging
+
+from apps.common import health_views
+
+logger = logging.getLogger(__name__)
+
 try:
     from apps.accounts.views import login_view as login_api, register as register_api
     from apps.accounts.jwt_views import custom_token_obtain_pair
-    print("✅ Custom auth views imported successfully")
 except ImportError as e:
     # Fallback if views are not available during migration
-    print(f"⚠️ Custom auth views import failed: {e}")
+    logger.warning("Custom auth views import failed: %s", e)
     login_api = None
     register_api = None  
     custom_token_obtain_pair = None
@@ -225,6 +230,7 @@ api_patterns = [
     path('subscriptions/', include('apps.subscriptions.urls')),
     path('exports/', include('apps.exports.urls')),
     path('workshops/', include('apps.workshops.urls')),
+    path('common/', include('apps.common.urls')),
 ]
 
 # Add custom auth endpoints if available
@@ -250,6 +256,9 @@ urlpatterns = [
     # Health check for Render.com
     path('health/', health_check),
     
+    # Prometheus metrics (apps.common.middleware.RequestMetricsMiddleware)
+    path('metrics', health_views.metrics, name='metrics'),
+    
     # Database status check  
     path('db-status/', lambda request: JsonResponse(check_database_status())),
     
@@ -0,0 +1,3 @@
+"""
+Analysis computations (consensus metrics)
+"""
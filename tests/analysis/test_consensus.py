@@ -0,0 +1,35 @@
+"""
+Consensus metrics against the per-pair SciPy reference
+
+    python manage.py test tests.analysis --settings=tests.settings
+"""
+import itertools
+
+import numpy as np
+from django.test import SimpleTestCase
+from scipy import stats
+
+from apps.analysis.views import AnalysisViewSet
+
+
+class ConsensusMetricsTests(SimpleTestCase):
+
+    def metrics(self, rows):
+        vectors = [dict(enumerate(row)) for row in rows]
+        return AnalysisViewSet()._calculate_consensus_metrics(vectors)
+
+    def test_spearman_matches_pairwise_spearmanr(self):
+        rng = np.random.default_rng(7)
+        rows = rng.dirichlet(np.ones(6), size=12)
+        rows[3] = rows[2]                      # 동일한 평가자
+        rows[5][[1, 4]] = rows[5][0]           # 동점 순위
+        expected = np.mean([
+            stats.spearmanr(a, b)[0] for a, b in itertools.combinations(rows, 2)
+        ])
+        self.assertAlmostEqual(self.metrics(rows)['spearman_rho'], expected)
+
+    def test_perfect_agreement(self):
+        self.assertAlmostEqual(self.metrics([[0.5, 0.3, 0.2]] * 4)['spearman_rho'], 1.0)
+
+    def test_single_evaluator_has_no_consensus(self):
+        self.assertEqual(self.metrics([[0.5, 0.3, 0.2]])['spearman_rho'], 0)
@@ -0,0 +1,64 @@
+"""
+Compact matrix uploads to the advanced analysis endpoints
+
+    python manage.py test tests.analysis --settings=tests.settings
+"""
+import json
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.evaluations.matrix_format import MATRIX_MEDIA_TYPE, pack_upper_triangle
+from apps.projects.models import Criteria
+from tests.perf import factories
+
+
+class MatrixUploadTests(TestCase):
+
+    def setUp(self):
+        self.owner = factories.create_user('owner')
+        self.project = factories.create_project(self.owner)
+        self.criteria = [
+            criteria.pk for criteria in Criteria.objects.bulk_create([
+                Criteria(project=self.project, name=name, type='criteria', order=i)
+                for i, name in enumerate(['Cost', 'Quality', 'Delivery'])
+            ])
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def matrix(self, upper, criteria=None):
+        criteria = criteria or self.criteria
+        full = [[1.0] * len(criteria) for _ in criteria]
+        values = iter(upper)
+        for i in range(len(criteria)):
+            for j in range(i + 1, len(criteria)):
+                full[i][j] = next(values)
+        return {'parent': None, 'criteria': criteria, 'values': pack_upper_triangle(full)}
+
+    def simulate(self, *matrices):
+        return self.client.post(
+            f'/api/analysis/advanced/{self.project.pk}/monte_carlo_simulation/',
+            json.dumps({'dtype': 'float32', 'matrices': list(matrices), 'n_simulations': 20}),
+            content_type=MATRIX_MEDIA_TYPE,
+        )
+
+    def test_valid_matrix_is_analyzed(self):
+        self.assertEqual(self.simulate(self.matrix([3, 5, 1 / 3])).status_code, 200)
+
+    def test_more_than_one_matrix_is_rejected(self):
+        response = self.simulate(self.matrix([3, 5, 1 / 3]), self.matrix([2, 2, 2]))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Exactly one matrix', response.data['error'])
+
+    def test_values_off_the_scale_are_rejected(self):
+        for upper in ([0, 5, 1], [-3, 5, 1], [3, 12, 1]):
+            response = self.simulate(self.matrix(upper))
+            self.assertEqual(response.status_code, 400, upper)
+            self.assertIn('between 1/9 and 9', response.data['error'])
+
+    def test_foreign_criteria_are_rejected(self):
+        other = factories.create_project(factories.create_user('other'))
+        foreign = Criteria.objects.create(project=other, name='Foreign', type='criteria')
+        response = self.simulate(self.matrix([3, 5, 1], criteria=[*self.criteria[:2], foreign.pk]))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,3 @@
+"""
+Common app behaviour (throttling, API usage counters, request metrics, JSON rendering)
+"""
@@ -0,0 +1,37 @@
+"""
+FastJSONRenderer output compared with DRF's JSONRenderer
+
+    python manage.py test tests.common --settings=tests.settings
+"""
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    def test_matches_json_renderer(self):
+        data = {
+            'text': 'line\u2028paragraph\u2029평가', 'id': uuid.UUID(int=7), 'price': Decimal('1.50'),
+            'at': datetime(2024, 1, 2, 3, 4, 5), 'weights': [0.25, 0.75], 'nested': {'ok': True, 'none': None},
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_numpy_values(self):
+        rendered = FastJSONRenderer().render({'weights': np.array([0.5, 0.25]), 'n': np.int64(3)})
+        self.assertEqual(json.loads(rendered), {'weights': [0.5, 0.25], 'n': 3})
+
+    def test_non_finite_floats_render_as_null(self):
+        self.assertEqual(FastJSONRenderer().render([float('nan'), float('inf')]), b'[null,null]')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render([float('nan')])
+
+    def test_large_integers_use_the_stock_renderer(self):
+        self.assertEqual(FastJSONRenderer().render({'big': 2 ** 70}), JSONRenderer().render({'big': 2 ** 70}))
@@ -0,0 +1,33 @@
+"""
+Server-Timing exposure of the request metrics middleware
+
+    python manage.py test tests.common --settings=tests.settings
+"""
+from django.test import Client, TestCase, override_settings
+
+from tests.perf import factories
+
+
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0, REQUEST_METRICS_SERVER_TIMING=True, DEBUG=False)
+class ServerTimingTests(TestCase):
+
+    def timing_header(self, user=None):
+        client = Client()  # 미들웨어가 현재 설정으로 다시 만들어지도록 요청마다 새 클라이언트
+        if user is not None:
+            client.force_login(user)
+        return client.get('/health/').headers.get('Server-Timing')
+
+    def test_hidden_from_anonymous_and_regular_users(self):
+        self.assertIsNone(self.timing_header())
+        self.assertIsNone(self.timing_header(factories.create_user('member')))
+
+    def test_sent_to_staff(self):
+        self.assertIn('db;dur=', self.timing_header(factories.create_user('staff', is_staff=True)))
+
+    def test_sent_to_everyone_under_debug(self):
+        with self.settings(DEBUG=True):
+            self.assertIn('db;dur=', self.timing_header())
+
+    def test_off_unless_enabled(self):
+        with self.settings(REQUEST_METRICS_SERVER_TIMING=False):
+            self.assertIsNone(self.timing_header(factories.create_user('staff', is_staff=True)))
@@ -0,0 +1,145 @@
+"""
+Sliding-window throttles and buffered API usage counters
+
+    python manage.py test tests.common --settings=tests.settings
+"""
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from apps.common.models import APIKey
+from apps.common.throttling import SlidingWindowThrottle, parse_rate
+from apps.common.usage import UsageBuffer
+from apps.subscriptions.models import SubscriptionUsage
+from tests.perf import factories
+
+
+class FixedRateThrottle(SlidingWindowThrottle):
+    """``rate`` per ``duration`` seconds for one client, on a clock the test controls"""
+
+    def __init__(self, limit, duration=60):
+        self.rate = (limit, duration)
+        self.now = 0.0
+        self.timer = lambda: self.now
+
+    def get_rate(self, request, view):
+        return self.rate
+
+    def get_cache_key(self, request, view):
+        return 'throttle:test'
+
+
+class SlidingWindowTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def admitted(self, throttle, attempts):
+        return sum(throttle.allow_request(None, None) for _ in range(attempts))
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('60/min'), (60, 60))
+        self.assertEqual(parse_rate('1000/hour'), (1000, 3600))
+        self.assertEqual(parse_rate('0/day'), (0, 86400))
+
+    def test_limit_within_one_window(self):
+        throttle = FixedRateThrottle(10)
+        throttle.now = 600.0  # 윈도우 시작
+        self.assertEqual(self.admitted(throttle, 15), 10)
+        self.assertAlmostEqual(throttle.wait(), 60.0)
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        throttle = FixedRateThrottle(10)
+        throttle.now = 600.0
+        self.admitted(throttle, 10)
+        # 다음 윈도우의 절반 지점: 이전 윈도우 10건 중 5건만 반영
+        throttle.now = 690.0
+        self.assertEqual(self.admitted(throttle, 10), 5)
+        # previous * (1 - f) + 5 < 10 이 되는 f = 0.5 -> 이미 지남, 현재 윈도우 끝까지는 30초
+        self.assertLessEqual(throttle.wait(), 30.0)
+
+    def test_zero_limit_denies_without_error(self):
+        throttle = FixedRateThrottle(0, duration=3600)
+        throttle.now = 3600 * 10 + 1800
+        self.assertFalse(throttle.allow_request(None, None))
+        self.assertAlmostEqual(throttle.wait(), 1800.0)
+        self.assertEqual(SlidingWindowThrottle._wait_time(0, 3600, 0, 0, 0.5), 1800.0)
+
+    def test_wait_time(self):
+        # 현재 윈도우만으로 한도 도달: 다음 윈도우에서 가중치가 한도 아래로 내려갈 때까지
+        self.assertAlmostEqual(SlidingWindowThrottle._wait_time(10, 60, 0, 10, 0.5), 30.0)
+        self.assertAlmostEqual(SlidingWindowThrottle._wait_time(10, 60, 0, 20, 0.5), 60.0)
+        # 이전 윈도우 가중치로 한도 도달: 10 * (1 - f) < 10 - 4 -> f > 0.4
+        self.assertAlmostEqual(SlidingWindowThrottle._wait_time(10, 60, 10, 4, 0.25), 9.0)
+
+
+class APIKeyThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = factories.create_user('integrator')
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_zero_rate_limit_disables_the_key(self):
+        APIKey.objects.create(name='off', key='disabled-key', user=self.user, rate_limit=0)
+        response = self.client_for(self.user).get('/api/projects/projects/', HTTP_X_API_KEY='disabled-key')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_key_does_not_authenticate(self):
+        APIKey.objects.create(name='ci', key='live-key', user=self.user)
+        response = APIClient().post(
+            '/api/projects/projects/', {'title': 'via key'}, format='json', HTTP_X_API_KEY='live-key'
+        )
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_key_of_another_user_is_ignored(self):
+        APIKey.objects.create(name='off', key='disabled-key', user=self.user, rate_limit=0)
+        other = factories.create_user('bystander')
+        response = self.client_for(other).get('/api/projects/projects/', HTTP_X_API_KEY='disabled-key')
+        self.assertEqual(response.status_code, 200)
+
+
+class UsageBufferTests(TestCase):
+
+    def setUp(self):
+        self.user = factories.create_user('integrator')
+        factories.create_subscription(self.user)
+        self.api_key = APIKey.objects.create(name='k', key='k', user=self.user)
+
+    def test_flush_writes_counts(self):
+        buffer = UsageBuffer(background=False)
+        for _ in range(3):
+            buffer.record_api_call(self.api_key.pk, self.user.pk)
+        buffer.flush()
+
+        self.api_key.refresh_from_db()
+        self.assertEqual(self.api_key.usage_count, 3)
+        self.assertIsNotNone(self.api_key.last_used_at)
+        self.assertEqual(SubscriptionUsage.objects.get().monthly_api_calls, 3)
+        self.assertEqual(buffer.pending(), {'api_keys': 0, 'api_calls': 0})
+
+    def test_failed_counts_are_kept_and_written_ones_are_not_resent(self):
+        buffer = UsageBuffer(background=False)
+        buffer.record_api_call(self.api_key.pk, self.user.pk)
+        buffer.record_api_call('not-a-key-id', self.user.pk)
+        with self.assertLogs('apps.common.usage', level='ERROR'):
+            buffer.flush()
+
+        self.api_key.refresh_from_db()
+        self.assertEqual(self.api_key.usage_count, 1)
+        self.assertEqual(SubscriptionUsage.objects.get().monthly_api_calls, 2)
+        self.assertEqual(buffer.pending(), {'api_keys': 1, 'api_calls': 1})
+
+        # 다음 주기: 실패한 키만 다시 시도, 이미 기록된 카운트는 중복 기록하지 않음
+        buffer.record_api_call(self.api_key.pk, self.user.pk)
+        with self.assertLogs('apps.common.usage', level='ERROR'):
+            buffer.flush()
+        self.api_key.refresh_from_db()
+        self.assertEqual(self.api_key.usage_count, 2)
+        self.assertEqual(SubscriptionUsage.objects.get().monthly_api_calls, 3)
+        self.assertEqual(buffer.pending(), {'api_keys': 1, 'api_calls': 1})
@@ -0,0 +1,3 @@
+"""
+Evaluation app behaviour (invitation emails, comparison import, progress updates, evaluator stats)
+"""
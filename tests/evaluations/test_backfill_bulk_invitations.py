@@ -0,0 +1,44 @@
+"""
+bulk_invitation foreign key backfill from invitation metadata
+
+    python manage.py test tests.evaluations --settings=tests.settings
+"""
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.evaluations.models import BulkInvitation, EvaluationInvitation
+from tests.perf import factories
+
+
+class BackfillBulkInvitationTests(TestCase):
+
+    def setUp(self):
+        self.owner = factories.create_user('owner')
+        self.project = factories.create_project(self.owner)
+        self.bulk = BulkInvitation.objects.create(project=self.project, created_by=self.owner, total_count=3)
+
+    def invite(self, username, metadata):
+        return EvaluationInvitation.objects.create(
+            project=self.project, evaluator=factories.create_user(username),
+            invited_by=self.owner, metadata=metadata,
+        )
+
+    def test_links_invitations_from_metadata(self):
+        linked = self.invite('linked', {'bulk_invitation_id': str(self.bulk.pk)})
+        orphan = self.invite('orphan', {'bulk_invitation_id': str(uuid.uuid4())})
+        broken = self.invite('broken', {'bulk_invitation_id': 'not-a-uuid'})
+        direct = self.invite('direct', {})
+
+        dry_run = StringIO()
+        call_command('backfill_bulk_invitations', '--dry-run', stdout=dry_run)
+        self.assertIn('Would link 1 invitations', dry_run.getvalue())
+        self.assertIsNone(EvaluationInvitation.objects.get(pk=linked.pk).bulk_invitation_id)
+
+        call_command('backfill_bulk_invitations', stdout=StringIO())
+        self.assertEqual(EvaluationInvitation.objects.get(pk=linked.pk).bulk_invitation_id, self.bulk.pk)
+        for invitation in (orphan, broken, direct):
+            self.assertIsNone(EvaluationInvitation.objects.get(pk=invitation.pk).bulk_invitation_id)
+        self.assertEqual(self.bulk.status_snapshot()['acceptance_status']['pending'], 1)
@@ -0,0 +1,93 @@
+"""
+Comparison import: respondent matching, evaluation progress and file cleanup
+
+    python manage.py test tests.evaluations --settings=tests.settings
+"""
+import os
+import tempfile
+
+from django.test import TestCase
+
+from apps.common.models import FileUpload
+from apps.evaluations.importers import ComparisonImporter, import_comparison_upload
+from apps.evaluations.models import Evaluation
+from apps.projects.models import Criteria
+from tests.perf import factories
+
+
+class ComparisonImportTests(TestCase):
+
+    def setUp(self):
+        self.owner = factories.create_user('owner')
+        self.project = factories.create_project(self.owner)
+        Criteria.objects.bulk_create([
+            Criteria(project=self.project, name=name, type='criteria', order=i)
+            for i, name in enumerate(['Cost', 'Quality', 'Delivery'])
+        ])
+
+    def upload(self, rows, project_id=None):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False)
+        handle.write('\n'.join(['respondent,criteria_a,criteria_b,value', *rows]))
+        handle.close()
+        self.addCleanup(lambda: os.path.exists(handle.name) and os.unlink(handle.name))
+        return FileUpload.objects.create(
+            original_name='comparisons.csv', file_path=handle.name, file_size=1,
+            mime_type='text/csv', uploaded_by=self.owner, upload_type='comparison_import',
+            metadata={'project_id': str(project_id or self.project.pk)},
+        )
+
+    def run_import(self, rows, create_respondents=False):
+        upload = self.upload(rows)
+        return ComparisonImporter(upload, self.project, create_respondents=create_respondents).run()
+
+    def test_respondents_match_accounts_case_insensitively(self):
+        kim = factories.create_user('Kim', email='Kim@Example.com')
+        lee = factories.create_user('LeeJ')
+
+        summary = self.run_import([
+            'kim@example.com,Cost,Quality,3',
+            'KIM@EXAMPLE.COM,Cost,Delivery,5',
+            'leej,Cost,Quality,1/3',
+        ], create_respondents=True)
+
+        self.assertEqual(summary['error_count'], 0)
+        self.assertEqual(summary['respondents'], 2)
+        self.assertEqual(
+            set(Evaluation.objects.filter(project=self.project).values_list('evaluator_id', flat=True)),
+            {kim.pk, lee.pk},
+        )
+        # 기존 계정과 대소문자만 다른 라벨로 플레이스홀더 사용자를 만들지 않음
+        self.assertEqual(factories.User.objects.count(), 3)
+
+    def test_progress_follows_answered_pairs(self):
+        complete, partial = factories.create_user('complete'), factories.create_user('partial')
+
+        self.run_import([
+            'complete@example.com,Cost,Quality,3',
+            'complete@example.com,Cost,Delivery,5',
+            'complete@example.com,Quality,Delivery,1/3',
+            'partial@example.com,Cost,Quality,3',
+        ])
+
+        done = Evaluation.objects.get(project=self.project, evaluator=complete)
+        self.assertEqual((done.status, done.progress), ('completed', 100.0))
+        self.assertIsNotNone(done.completed_at)
+        pending = Evaluation.objects.get(project=self.project, evaluator=partial)
+        self.assertEqual(pending.status, 'in_progress')
+        self.assertAlmostEqual(pending.progress, 100 / 3)
+        self.assertIsNone(pending.completed_at)
+
+        # 나머지 쌍을 다시 가져오면 완료됨
+        self.run_import(['partial@example.com,Cost,Delivery,5', 'partial@example.com,Quality,Delivery,1'])
+        pending.refresh_from_db()
+        self.assertEqual((pending.status, pending.progress), ('completed', 100.0))
+
+    def test_file_is_removed_once_the_import_is_final(self):
+        factories.create_user('kim')
+        completed = import_comparison_upload(self.upload(['kim@example.com,Cost,Quality,3']).pk)
+        self.assertEqual(completed.status, 'completed')
+        self.assertFalse(os.path.exists(completed.file_path))
+
+        failed = import_comparison_upload(self.upload([], project_id='00000000-0000-0000-0000-000000000000').pk)
+        self.assertEqual(failed.status, 'failed')
+        self.assertFalse(os.path.exists(failed.file_path))
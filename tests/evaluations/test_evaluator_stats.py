@@ -0,0 +1,36 @@
+"""
+Cached evaluator statistics after bulk evaluation changes
+
+    python manage.py test tests.evaluations --settings=tests.settings
+"""
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from apps.evaluations.models import Evaluation
+from apps.evaluations.stats import get_evaluator_stats
+from tests.perf import factories
+
+
+class EvaluatorStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.evaluator = factories.create_user('evaluator')
+        project = factories.create_project(factories.create_user('owner'))
+        self.evaluation = Evaluation.objects.create(
+            project=project, evaluator=self.evaluator, title='Evaluation',
+            status='completed', progress=100, completed_at=timezone.now(),
+        )
+
+    def test_admin_reset_invalidates_stats(self):
+        self.assertEqual(get_evaluator_stats(self.evaluator)['completed_evaluations'], 1)
+        admin = Client()
+        admin.force_login(factories.create_user('admin', is_staff=True, is_superuser=True))
+        response = admin.post('/admin/evaluations/evaluation/', {
+            'action': 'reset_evaluations', '_selected_action': [str(self.evaluation.pk)],
+        })
+        self.assertEqual(response.status_code, 302)
+        stats = get_evaluator_stats(self.evaluator)
+        self.assertEqual(stats['completed_evaluations'], 0)
+        self.assertEqual(stats['active_evaluations'], 1)
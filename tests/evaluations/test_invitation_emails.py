@@ -0,0 +1,139 @@
+"""
+Batched invitation email delivery
+
+    python manage.py test tests.evaluations --settings=tests.settings
+"""
+from datetime import timedelta
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection as db_connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.evaluations.models import BulkInvitation, EmailDeliveryStatus, EvaluationInvitation
+from apps.evaluations.tasks import (
+    InvitationMessageBuilder, process_due_retries, send_bulk_invitation_emails, send_email_batch,
+)
+from tests.perf import factories
+
+
+class FailingConnection:
+    """Delivers messages until it reaches a recipient listed in ``refuse``"""
+
+    def __init__(self, refuse):
+        self.refuse = set(refuse)
+        self.delivered = []
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.to[0] in self.refuse:
+                raise ConnectionError(f'refused {message.to[0]}')
+            self.delivered.append(message.to[0])
+        return len(messages)
+
+
+class Row:
+    def __init__(self, email):
+        self.email = email
+        self.error_message = ''
+
+
+class Builder:
+    def build(self, row):
+        return EmailMessage(subject='s', body='b', to=[row.email])
+
+
+class SendEmailBatchTests(SimpleTestCase):
+
+    def test_partial_failure_sends_each_recipient_once(self):
+        rows = [Row(f'user{i}@example.com') for i in range(4)]
+        connection = FailingConnection(refuse={'user1@example.com'})
+
+        sent, failed = send_email_batch(connection, rows, Builder())
+
+        self.assertEqual(connection.delivered, ['user0@example.com', 'user2@example.com', 'user3@example.com'])
+        self.assertEqual([row.email for row in sent], connection.delivered)
+        self.assertEqual(failed, [rows[1]])
+        self.assertIn('refused', rows[1].error_message)
+
+
+class RecordingBackend(BaseEmailBackend):
+    """Records, per message, whether a transaction was open and the row's stored next_retry_at"""
+    sends = []
+
+    def send_messages(self, messages):
+        for message in messages:
+            row = EmailDeliveryStatus.objects.get(invitation__evaluator__email=message.to[0])
+            RecordingBackend.sends.append((db_connection.in_atomic_block, row.next_retry_at))
+        return len(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='tests.evaluations.test_invitation_emails.RecordingBackend',
+    INVITATION_EMAIL_RATE_LIMIT=0, INVITATION_EMAIL_RETRY_LEASE_SECONDS=600,
+)
+class ProcessDueRetriesTests(TransactionTestCase):
+
+    def test_claim_is_committed_before_sending(self):
+        RecordingBackend.sends = []
+        owner = factories.create_user('owner')
+        invitation = EvaluationInvitation.objects.create(
+            project=factories.create_project(owner), evaluator=factories.create_user('evaluator'),
+            invited_by=owner,
+        )
+        row = EmailDeliveryStatus.objects.create(
+            invitation=invitation, status='failed', next_retry_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(process_due_retries(), 1)
+
+        [(in_transaction, stored_retry_at)] = RecordingBackend.sends
+        self.assertFalse(in_transaction)
+        # 발송 중에는 임대 기간만큼 미뤄져 다른 워커가 가져가지 않음
+        self.assertGreater(stored_retry_at, timezone.now() + timedelta(seconds=500))
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.retry_count, row.next_retry_at), ('sent', 1, None))
+
+    def test_pending_rows_of_an_interrupted_bulk_job_are_taken_over(self):
+        RecordingBackend.sends = []
+        owner = factories.create_user('owner')
+        project = factories.create_project(owner)
+        bulk = BulkInvitation.objects.create(project=project, created_by=owner, total_count=1, status='processing')
+        invitation = EvaluationInvitation.objects.create(
+            project=project, evaluator=factories.create_user('evaluator'), invited_by=owner,
+        )
+        # 발송 도중 프로세스가 죽어 임대가 만료된 대기 행
+        row = EmailDeliveryStatus.objects.create(
+            invitation=invitation, bulk_invitation=bulk, status='pending',
+            next_retry_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        self.assertEqual(process_due_retries(), 1)
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'sent')
+        bulk.refresh_from_db()
+        self.assertEqual((bulk.sent_count, bulk.failed_count), (1, 0))
+        # 대량 발송 작업이 다시 실행되어도 같은 행을 두 번 보내지 않음
+        send_bulk_invitation_emails(bulk.pk)
+        self.assertEqual(len(RecordingBackend.sends), 1)
+
+
+class InvitationMessageTests(TestCase):
+
+    def test_plain_text_is_not_html_escaped(self):
+        owner = factories.create_user('owner')
+        evaluator = factories.create_user('evaluator', first_name="O'Brien", last_name='<Lee>')
+        invitation = EvaluationInvitation.objects.create(
+            project=factories.create_project(owner, title='R&D "Q3" <plan>'),
+            evaluator=evaluator, invited_by=owner, message="Tom & Jerry's note",
+        )
+        row = EmailDeliveryStatus.objects.create(invitation=invitation)
+
+        message = InvitationMessageBuilder().build(row)
+
+        self.assertEqual(message.subject, '[R&D "Q3" <plan>] AHP 평가 요청')
+        self.assertIn("O'Brien <Lee>님", message.body)
+        self.assertIn("Tom & Jerry's note", message.body)
+        self.assertNotIn('&amp;', message.body + message.subject)
@@ -0,0 +1,58 @@
+"""
+update_progress payload contract
+
+    python manage.py test tests.evaluations --settings=tests.settings
+"""
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.evaluations.models import Evaluation, PairwiseComparison
+from apps.projects.models import Criteria
+from tests.perf import factories
+
+
+class UpdateProgressTests(TestCase):
+
+    def setUp(self):
+        owner = factories.create_user('owner')
+        self.evaluator = factories.create_user('evaluator')
+        project = factories.create_project(owner)
+        self.cost, self.quality = Criteria.objects.bulk_create([
+            Criteria(project=project, name=name, type='criteria', order=i)
+            for i, name in enumerate(['Cost', 'Quality'])
+        ])
+        self.evaluation = Evaluation.objects.create(
+            project=project, evaluator=self.evaluator, title='Evaluation', status='in_progress'
+        )
+        self.comparison = PairwiseComparison.objects.create(
+            evaluation=self.evaluation, criteria_a=self.cost, criteria_b=self.quality, value=1.0
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.evaluator)
+
+    def update(self, *items):
+        return self.client.patch(
+            f'/api/evaluations/evaluations/{self.evaluation.pk}/update_progress/',
+            {'comparisons': list(items)}, format='json',
+        )
+
+    def test_former_comparison_item_shape_is_accepted(self):
+        response = self.update({
+            'id': self.comparison.pk, 'evaluation': str(self.evaluation.pk),
+            'criteria_a': self.cost.pk, 'criteria_b': self.quality.pk,
+            'criteria_a_name': 'Cost', 'value': 5, 'comment': 'cheaper',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.comparison.refresh_from_db()
+        self.assertEqual((self.comparison.value, self.comparison.comment), (5, 'cheaper'))
+
+    def test_reversed_pair_is_stored_as_reciprocal(self):
+        self.assertEqual(self.update({
+            'criteria_a': self.quality.pk, 'criteria_b': self.cost.pk, 'value': 4,
+        }).status_code, 200)
+        self.comparison.refresh_from_db()
+        self.assertAlmostEqual(self.comparison.value, 0.25)
+
+    def test_invalid_value_is_rejected(self):
+        response = self.update({'criteria_a': self.cost.pk, 'criteria_b': self.quality.pk, 'value': 12})
+        self.assertEqual(response.status_code, 400)
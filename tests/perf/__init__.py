@@ -0,0 +1,3 @@
+"""
+Query-count and wall-time budgets for hot API endpoints
+"""
@@ -0,0 +1,137 @@
+"""
+Factories that seed a large synthetic AHP project with bulk inserts
+"""
+import itertools
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.analysis.models import WeightVector
+from apps.evaluations.models import Evaluation, PairwiseComparison
+from apps.projects.cloning import bulk_create_hierarchy
+from apps.projects.models import Project, ProjectMember
+from apps.subscriptions.models import PaymentRecord, SubscriptionPlan, SubscriptionUsage, UserSubscription
+
+User = get_user_model()
+
+SAATY_SCALE = (1 / 9, 1 / 7, 1 / 5, 1 / 3, 1, 3, 5, 7, 9)
+
+
+def create_user(username, **fields):
+    fields.setdefault('email', f'{username}@example.com')
+    return User.objects.create_user(username=username, password='pw', **fields)
+
+
+def create_project(owner, title='Perf project', **fields):
+    fields.setdefault('description', 'Synthetic project for performance tests')
+    fields.setdefault('objective', 'Rank alternatives')
+    return Project.objects.create(title=title, owner=owner, status='active', **fields)
+
+
+def create_projects(owners, count, public_every=10):
+    """``count`` projects spread round-robin over ``owners``; every ``public_every``-th one is public"""
+    projects = [
+        Project(
+            title=f'Project {i}', description='Synthetic project for performance tests', objective='Rank alternatives',
+            owner=owners[i % len(owners)], status='active',
+            visibility='public' if public_every and i % public_every == 0 else 'private',
+        )
+        for i in range(count)
+    ]
+    Project.objects.bulk_create(projects, batch_size=1000)
+    return projects
+
+
+def create_subscription(user, **plan_fields):
+    """Active subscription with a usage row (counted from the user's existing projects)"""
+    plan_fields.setdefault('plan_id', f'plan-{user.username}')
+    plan_fields.setdefault('plan_type', 'basic')
+    plan = SubscriptionPlan.objects.create(name='Perf plan', description='', price=10000, **plan_fields)
+    now = timezone.now()
+    subscription = UserSubscription.objects.create(
+        user=user, plan=plan, status='active', start_date=now, end_date=now + timedelta(days=30)
+    )
+    SubscriptionUsage.objects.create(subscription=subscription)
+    return subscription
+
+
+def create_payments(subscription, count, months=18):
+    """Completed payments spread over the last ``months`` months"""
+    now = timezone.now()
+    PaymentRecord.objects.bulk_create([
+        PaymentRecord(
+            subscription=subscription, payment_type='subscription', amount=10000, status='completed',
+            paid_at=now - timedelta(days=(i % months) * 30),
+        )
+        for i in range(count)
+    ])
+
+
+def create_criteria_tree(project, branching=(4, 5), alternatives=6):
+    """
+    Criteria hierarchy with ``branching[0]`` top-level criteria, each with
+    ``branching[1]`` sub-criteria, plus ``alternatives`` alternatives.
+
+    Returns a list of sibling groups (lists of Criteria), root group first.
+    """
+    top, sub = branching
+    nodes = [(f't{i}', None, {'name': f'Criterion {i}', 'type': 'criteria', 'order': i}) for i in range(top)]
+    nodes += [
+        (f't{i}.{j}', f't{i}', {'name': f'Criterion {i}.{j}', 'type': 'criteria', 'order': j})
+        for i in range(top) for j in range(sub)
+    ]
+    nodes += [(f'a{k}', None, {'name': f'Alternative {k}', 'type': 'alternative', 'order': k})
+              for k in range(alternatives)]
+    created = bulk_create_hierarchy(project, nodes)
+
+    groups = [[created[f't{i}'] for i in range(top)]]
+    groups += [[created[f't{i}.{j}'] for j in range(sub)] for i in range(top)]
+    return groups
+
+
+def create_evaluators(project, count, prefix='evaluator'):
+    """Evaluator users who are members of ``project``"""
+    User.objects.bulk_create([
+        User(username=f'{prefix}{i}', email=f'{prefix}{i}@example.com') for i in range(count)
+    ])
+    users = list(User.objects.filter(username__startswith=prefix).order_by('pk'))
+    ProjectMember.objects.bulk_create([
+        ProjectMember(project=project, user=user, role='evaluator') for user in users
+    ])
+    return users
+
+
+def create_completed_evaluations(project, evaluators, groups, seed=0):
+    """One completed evaluation per evaluator with every pairwise comparison answered"""
+    rng = random.Random(seed)
+    evaluations = Evaluation.objects.bulk_create([
+        Evaluation(project=project, evaluator=user, status='completed', progress=100.0, consistency_ratio=0.05)
+        for user in evaluators
+    ])
+    pairs = [
+        (a, b) if a.pk < b.pk else (b, a)
+        for group in groups for a, b in itertools.combinations(group, 2)
+    ]
+    PairwiseComparison.objects.bulk_create([
+        PairwiseComparison(evaluation=evaluation, criteria_a=a, criteria_b=b, value=rng.choice(SAATY_SCALE))
+        for evaluation in evaluations for a, b in pairs
+    ], batch_size=2000)
+    return evaluations
+
+
+def create_weight_vectors(project, evaluations, criteria, seed=0):
+    """Stored per-evaluation weights (input of consensus metrics)"""
+    rng = random.Random(seed)
+    rows = []
+    for evaluation in evaluations:
+        weights = [rng.random() for _ in criteria]
+        total = sum(weights)
+        ranked = sorted(range(len(criteria)), key=lambda i: -weights[i])
+        for rank, index in enumerate(ranked, 1):
+            rows.append(WeightVector(
+                project=project, evaluation=evaluation, criteria=criteria[index],
+                weight=weights[index] / total, normalized_weight=weights[index] / total, rank=rank,
+            ))
+    WeightVector.objects.bulk_create(rows, batch_size=2000)
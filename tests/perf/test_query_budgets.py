@@ -0,0 +1,274 @@
+"""
+Query-count and wall-time budgets for hot API endpoints
+
+A synthetic project (4 x 5 criteria hierarchy, 300 evaluators with every
+comparison answered) is seeded once per class. Query budgets are fixed
+numbers that must not grow with the number of evaluators or criteria; time
+budgets are generous ceilings for SQLite and can be scaled with the
+``PERF_TIME_FACTOR`` environment variable on slow machines. The project list
+is also timed against 10k projects (ProjectListScaleBudgetTests).
+
+    python manage.py test tests --settings=tests.settings
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.common.activity import get_writer
+from apps.common.models import ActivityLog
+from apps.evaluations.matrix_format import MATRIX_MEDIA_TYPE, pack_upper_triangle
+from apps.projects.models import Project, ProjectMember
+from apps.subscriptions.models import SubscriptionUsage
+from . import factories
+
+EVALUATORS = 300
+TIME_FACTOR = float(os.environ.get('PERF_TIME_FACTOR', '1'))
+
+
+class BudgetTestCase(TestCase):
+    """TestCase with an ``assertBudget`` context manager"""
+
+    def tearDown(self):
+        # 큐에 남은 활동 로그를 이 테스트의 트랜잭션 안에서 기록
+        get_writer().flush()
+
+    @contextmanager
+    def assertBudget(self, max_queries, max_seconds):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            yield queries
+            elapsed = time.perf_counter() - started
+
+        executed = '\n'.join(f"{i}. {query['sql']}" for i, query in enumerate(queries.captured_queries, 1))
+        self.assertLessEqual(
+            len(queries), max_queries,
+            f'{len(queries)} queries exceed the budget of {max_queries}:\n{executed}'
+        )
+        self.assertLessEqual(
+            elapsed, max_seconds * TIME_FACTOR,
+            f'{elapsed:.3f}s exceeds the budget of {max_seconds * TIME_FACTOR:.3f}s'
+        )
+
+
+class LargeProjectTestCase(BudgetTestCase):
+    """Seeds one large project shared by the tests of a class"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = factories.create_user('owner')
+        cls.project = factories.create_project(cls.owner)
+        cls.groups = factories.create_criteria_tree(cls.project)
+        cls.evaluators = factories.create_evaluators(cls.project, EVALUATORS)
+        cls.evaluations = factories.create_completed_evaluations(cls.project, cls.evaluators, cls.groups)
+        factories.create_weight_vectors(cls.project, cls.evaluations, cls.groups[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+
+class AnalysisBudgetTests(LargeProjectTestCase):
+
+    def test_calculate_individual(self):
+        evaluation = self.evaluations[0]
+        with self.assertBudget(max_queries=8, max_seconds=0.5):
+            response = self.client.post(
+                '/api/analysis/calculate/individual/', {'evaluation_id': str(evaluation.pk)}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['weights']), sum(len(group) for group in self.groups))
+
+    def test_calculate_group(self):
+        with self.assertBudget(max_queries=6, max_seconds=1.0):
+            response = self.client.post(
+                '/api/analysis/calculate/group/', {'project_id': str(self.project.pk)}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['evaluation_count'], EVALUATORS)
+
+    def test_consensus_metrics(self):
+        with self.assertBudget(max_queries=8, max_seconds=1.0):
+            response = self.client.get(f'/api/analysis/analysis/{self.project.pk}/consensus_metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('kendall_w', response.data['metrics'])
+
+
+class ProjectBudgetTests(LargeProjectTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(40):
+            project = factories.create_project(cls.owner, title=f'Other project {i}')
+            factories.create_criteria_tree(project, branching=(3, 3), alternatives=3)
+
+    def test_project_list(self):
+        with self.assertBudget(max_queries=4, max_seconds=0.5):
+            response = self.client.get('/api/projects/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], Project.objects.filter(owner=self.owner).count())
+
+    def test_project_detail(self):
+        with self.assertBudget(max_queries=10, max_seconds=0.5):
+            response = self.client.get(f'/api/projects/projects/{self.project.pk}/')
+        self.assertEqual(response.status_code, 200)
+        get_writer().flush()
+        self.assertTrue(ActivityLog.objects.filter(action='view', object_id=str(self.project.pk)).exists())
+
+
+class ProjectListScaleBudgetTests(BudgetTestCase):
+    """Project list latency with 10k projects, most of them invisible to the user"""
+
+    PROJECTS = 10_000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = factories.create_user('browser')
+        others = [factories.create_user(f'other-owner{i}') for i in range(20)]
+        projects = factories.create_projects(others, cls.PROJECTS)
+        factories.create_projects([cls.user], 100, public_every=0)
+        ProjectMember.objects.bulk_create([
+            ProjectMember(project=project, user=cls.user, role='viewer') for project in projects[1::200]
+        ])
+        cls.visible = Project.objects.filter(
+            Q(owner=cls.user) | Q(visibility='public') | Q(projectmember__user=cls.user)
+        ).distinct().count()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_first_page(self):
+        with self.assertBudget(max_queries=4, max_seconds=0.5):
+            response = self.client.get('/api/projects/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], self.visible)
+
+    def test_last_page(self):
+        last = -(-self.visible // 20)
+        with self.assertBudget(max_queries=4, max_seconds=0.5):
+            response = self.client.get(f'/api/projects/projects/?page={last}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), self.visible - (last - 1) * 20)
+
+
+class EvaluationBudgetTests(LargeProjectTestCase):
+
+    def setUp(self):
+        self.evaluation = self.evaluations[0]
+        self.evaluation.status = 'in_progress'
+        self.evaluation.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.evaluation.evaluator)
+
+    def test_update_progress(self):
+        comparisons = list(self.evaluation.pairwise_comparisons.all())
+        payload = {'comparisons': [
+            {
+                'criteria_a': comparison.criteria_a_id,
+                'criteria_b': comparison.criteria_b_id,
+                'value': 3,
+            }
+            for comparison in comparisons
+        ]}
+        with self.assertBudget(max_queries=15, max_seconds=0.5):
+            response = self.client.patch(
+                f'/api/evaluations/evaluations/{self.evaluation.pk}/update_progress/', payload, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.evaluation.pairwise_comparisons.filter(value=3).count(), len(comparisons))
+
+    def test_update_progress_matrix(self):
+        matrices = []
+        for group in self.groups:
+            ids = [criteria.pk for criteria in group]
+            matrix = [[3.0] * len(ids) for _ in ids]
+            matrices.append({'parent': group[0].parent_id, 'criteria': ids, 'values': pack_upper_triangle(matrix)})
+
+        with self.assertBudget(max_queries=15, max_seconds=0.5):
+            response = self.client.patch(
+                f'/api/evaluations/evaluations/{self.evaluation.pk}/update_progress/',
+                json.dumps({'dtype': 'float32', 'matrices': matrices}),
+                content_type=MATRIX_MEDIA_TYPE,
+            )
+        self.assertEqual(response.status_code, 200)
+
+
+class ExportBudgetTests(LargeProjectTestCase):
+
+    def test_excel_export(self):
+        with self.assertBudget(max_queries=6, max_seconds=1.0) as queries:
+            response = self.client.get('/api/exports/excel/', {'project': str(self.project.pk)})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('activity_logs' in query['sql'] for query in queries.captured_queries))
+        get_writer().flush()
+        self.assertEqual(ActivityLog.objects.filter(action='export', user=self.owner).count(), 1)
+
+
+class SubscriptionLimitBudgetTests(BudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = factories.create_user('subscriber')
+        factories.create_project(cls.owner)
+        factories.create_subscription(cls.owner, max_projects_per_admin=2)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def check_limit(self):
+        return self.client.post('/api/subscriptions/check-limits/', {'resource_type': 'projects'}, format='json')
+
+    def test_limit_check_warm_cache(self):
+        self.check_limit()
+        with self.assertBudget(max_queries=0, max_seconds=0.1):
+            response = self.check_limit()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['current_usage'], 1)
+        self.assertEqual(response.data['limit'], 2)
+
+    def test_project_limit_enforced(self):
+        payload = {'title': 'New', 'description': 'd', 'objective': 'o'}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post('/api/projects/projects/', payload, format='json').status_code, 201)
+        self.assertEqual(SubscriptionUsage.objects.get(subscription__user=self.owner).current_projects, 2)
+
+        with self.assertBudget(max_queries=0, max_seconds=0.1):
+            response = self.client.post('/api/projects/projects/', payload, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['limit'], 2)
+        self.assertFalse(self.check_limit().data['allowed'])
+
+
+class SubscriptionStatsBudgetTests(BudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = factories.create_user('stats-admin', is_superuser=True, is_staff=True)
+        subscription = factories.create_subscription(factories.create_user('payer'))
+        factories.create_payments(subscription, 500)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_subscription_stats(self):
+        with self.assertBudget(max_queries=4, max_seconds=0.5):
+            response = self.client.get('/api/subscriptions/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['revenue_by_month']), 12)
+        self.assertEqual(response.data['total_active_subscriptions'], 1)
+
+        with self.assertBudget(max_queries=0, max_seconds=0.1):
+            self.client.get('/api/subscriptions/stats/')
@@ -0,0 +1,3 @@
+"""
+Projects app behaviour (criteria hierarchy)
+"""
@@ -0,0 +1,47 @@
+"""
+Criteria subtrees for rows saved before the materialized path existed
+
+    python manage.py test tests.projects --settings=tests.settings
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+
+from apps.projects.models import Criteria
+from tests.perf import factories
+
+
+class LegacyPathTests(TestCase):
+
+    def setUp(self):
+        self.project = factories.create_project(factories.create_user('owner'))
+        self.cost = Criteria.objects.create(project=self.project, name='Cost', type='criteria')
+        self.capex = Criteria.objects.create(project=self.project, name='Capex', type='criteria', parent=self.cost)
+        self.land = Criteria.objects.create(project=self.project, name='Land', type='criteria', parent=self.capex)
+        self.quality = Criteria.objects.create(project=self.project, name='Quality', type='criteria')
+        # 경로 필드 추가 이전에 저장된 행
+        Criteria.objects.filter(project=self.project).update(path='')
+
+    def test_descendants_without_paths_stay_in_the_subtree(self):
+        cost = Criteria.objects.get(pk=self.cost.pk)
+        self.assertEqual(set(cost.get_descendants().values_list('pk', flat=True)), {self.capex.pk, self.land.pk})
+        self.assertEqual(
+            set(cost.get_descendants(include_self=True).values_list('pk', flat=True)),
+            {self.cost.pk, self.capex.pk, self.land.pk},
+        )
+
+    def test_admin_delete_with_children_keeps_other_criteria(self):
+        admin = Client()
+        admin.force_login(factories.create_user('admin', is_staff=True, is_superuser=True))
+        admin.post('/admin/projects/criteria/', {
+            'action': 'delete_selected_criteria', '_selected_action': [str(self.cost.pk)],
+        })
+        self.assertEqual(list(Criteria.objects.filter(project=self.project).values_list('pk', flat=True)),
+                         [self.quality.pk])
+
+    def test_backfill_missing_only(self):
+        call_command('backfill_criteria_paths', '--missing-only', stdout=StringIO())
+        land = Criteria.objects.get(pk=self.land.pk)
+        self.assertEqual(land.path, f'{self.cost.pk}/{self.capex.pk}/{self.land.pk}/')
+        self.assertEqual(list(Criteria.objects.get(pk=self.capex.pk).get_descendants()), [land])
@@ -0,0 +1,3 @@
+"""
+Subscription entitlement, usage counter and revenue rollup behaviour
+"""
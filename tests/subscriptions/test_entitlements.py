@@ -0,0 +1,234 @@
+"""
+Usage counters and limit enforcement driven by the subscriptions signals
+
+    python manage.py test tests.subscriptions --settings=tests.settings
+"""
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.common.models import FileUpload
+from apps.evaluations.importers import ComparisonImporter
+from apps.evaluations.models import Evaluation
+from apps.projects.models import Criteria
+from apps.subscriptions.entitlements import get_entitlements, usage_counter_key
+from apps.subscriptions.models import SubscriptionUsage, UserSubscription
+from tests.perf import factories
+
+
+class EntitlementTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.owner = factories.create_user('owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def subscribe(self, **plan_fields):
+        self.subscription = factories.create_subscription(self.owner, **plan_fields)
+
+    def usage(self):
+        return SubscriptionUsage.objects.get(subscription__user=self.owner)
+
+    def add_evaluation(self, project, evaluator):
+        return self.client.post('/api/evaluations/evaluations/', {
+            'project': str(project.pk), 'evaluator': evaluator.pk, 'title': 'Evaluation',
+        }, format='json')
+
+
+class ProjectUsageTests(EntitlementTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.existing = factories.create_project(self.owner, title='Existing')
+        self.subscribe(max_projects_per_admin=3)
+
+    def create_project(self, title='New'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/projects/projects/', {
+                'title': title, 'description': 'd', 'objective': 'o',
+            }, format='json')
+
+    def test_usage_row_starts_from_existing_projects(self):
+        usage = self.usage()
+        self.assertEqual(usage.current_projects, 1)
+        self.assertEqual(usage.total_projects_created, 0)
+
+    def test_soft_delete_and_restore_move_the_count(self):
+        project_id = self.create_project().data['id']
+        self.assertEqual(self.usage().current_projects, 2)
+        self.assertEqual(self.usage().total_projects_created, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f'/api/projects/projects/{project_id}/soft_delete/').status_code, 200)
+        self.assertEqual(self.usage().current_projects, 1)
+        self.assertEqual(get_entitlements(self.owner.pk).current('projects'), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post(f'/api/projects/projects/{project_id}/restore/').status_code, 200)
+        usage = self.usage()
+        self.assertEqual(usage.current_projects, 2)
+        self.assertEqual(usage.total_projects_created, 1)  # 복원은 새 프로젝트가 아님
+        self.assertEqual(get_entitlements(self.owner.pk).current('projects'), 2)
+
+    def test_cache_counter_follows_commit(self):
+        get_entitlements(self.owner.pk)
+        key = usage_counter_key(self.owner.pk, 'projects')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post('/api/projects/projects/', {'title': 'New', 'description': 'd', 'objective': 'o'},
+                             format='json')
+            # 커밋 전에는 캐시 카운터가 바뀌지 않음 (롤백 시 어긋나지 않도록)
+            self.assertEqual(cache.get(key), 1)
+        self.assertEqual(cache.get(key), 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(cache.get(key), 2)
+
+    def test_project_limit_response(self):
+        self.create_project('Second')
+        self.create_project('Third')
+        response = self.create_project('Fourth')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, {
+            'detail': '구독 플랜의 사용 한도를 초과했습니다.',
+            'resource_type': 'projects',
+            'current_usage': 3,
+            'limit': 3,
+        })
+        self.assertEqual(self.owner.owned_projects.count(), 3)
+
+    def test_hard_delete_recounts_once(self):
+        evaluators = [factories.create_user(f'evaluator{i}') for i in range(5)]
+        for evaluator in evaluators:
+            Evaluation.objects.create(project=self.existing, evaluator=evaluator)
+        other = factories.create_project(self.owner, title='Other')
+        Evaluation.objects.create(project=other, evaluator=evaluators[0])
+        self.assertEqual(self.usage().current_evaluators, 5)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.existing.delete()
+        usage_updates = [q for q in queries.captured_queries
+                         if q['sql'].startswith('UPDATE') and 'subscription_usage' in q['sql']]
+        # 연쇄 삭제되는 평가마다 갱신하지 않고 프로젝트 삭제 시 한 번만 재집계
+        self.assertEqual(len(usage_updates), 1)
+        usage = self.usage()
+        self.assertEqual(usage.current_projects, 1)
+        self.assertEqual(usage.current_evaluators, 1)
+
+    def test_admin_soft_delete_recounts_usage(self):
+        get_entitlements(self.owner.pk)
+        client = Client()
+        client.force_login(factories.create_user('admin', is_staff=True, is_superuser=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/admin/projects/project/', {
+                'action': 'soft_delete_projects', '_selected_action': [str(self.existing.pk)],
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.usage().current_projects, 0)
+        self.assertEqual(get_entitlements(self.owner.pk).current('projects'), 0)
+
+    def test_admin_actions_invalidate_entitlements(self):
+        self.assertTrue(get_entitlements(self.owner.pk).is_active)
+        admin_user = factories.create_user('admin', is_staff=True, is_superuser=True)
+        client = Client()
+        client.force_login(admin_user)
+        response = client.post('/admin/subscriptions/usersubscription/', {
+            'action': 'cancel_subscriptions', '_selected_action': [str(self.subscription.pk)],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(UserSubscription.objects.get(pk=self.subscription.pk).status, 'cancelled')
+        self.assertFalse(get_entitlements(self.owner.pk).is_active)
+
+
+class EvaluatorLimitTests(EntitlementTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.first = factories.create_project(self.owner, title='First')
+        self.second = factories.create_project(self.owner, title='Second')
+        self.evaluators = [factories.create_user(f'evaluator{i}') for i in range(3)]
+        self.subscribe(max_evaluators_per_project=2)
+
+    def test_limit_applies_per_project(self):
+        for evaluator in self.evaluators[:2]:
+            self.assertEqual(self.add_evaluation(self.first, evaluator).status_code, 201)
+        # 다른 프로젝트의 평가자 수는 새 프로젝트의 한도에 영향을 주지 않음
+        for evaluator in self.evaluators[1:]:
+            self.assertEqual(self.add_evaluation(self.second, evaluator).status_code, 201)
+
+        response = self.add_evaluation(self.first, self.evaluators[2])
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, {
+            'detail': '구독 플랜의 사용 한도를 초과했습니다.',
+            'resource_type': 'evaluators',
+            'current_usage': 2,
+            'limit': 2,
+        })
+        self.assertFalse(Evaluation.objects.filter(project=self.first, evaluator=self.evaluators[2]).exists())
+
+    def test_current_evaluators_counts_distinct_evaluators(self):
+        self.add_evaluation(self.first, self.evaluators[0])
+        self.add_evaluation(self.second, self.evaluators[0])
+        self.add_evaluation(self.second, self.evaluators[1])
+        self.assertEqual(self.usage().current_evaluators, 2)
+
+        Evaluation.objects.filter(project=self.second, evaluator=self.evaluators[1]).delete()
+        self.assertEqual(self.usage().current_evaluators, 1)
+
+    def test_limit_check_reports_the_project(self):
+        self.add_evaluation(self.first, self.evaluators[0])
+        response = self.client.post('/api/subscriptions/check-limits/', {
+            'resource_type': 'evaluators', 'required_amount': 2, 'project': str(self.first.pk),
+        }, format='json')
+        self.assertEqual(response.data['current_usage'], 1)
+        self.assertEqual(response.data['limit'], 2)
+        self.assertFalse(response.data['allowed'])
+
+        response = self.client.post('/api/subscriptions/check-limits/', {
+            'resource_type': 'evaluators', 'required_amount': 2,
+        }, format='json')
+        self.assertTrue(response.data['allowed'])
+
+    def test_duplicate_with_evaluations_checks_the_limit(self):
+        # 구독 이전에 만들어진 평가: 원본은 한도를 넘지만 복제본은 한도를 지켜야 함
+        for evaluator in self.evaluators:
+            Evaluation.objects.create(project=self.first, evaluator=evaluator)
+
+        response = self.client.post(
+            f'/api/projects/projects/{self.first.pk}/duplicate/', {'include_evaluations': 'true'}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['resource_type'], 'evaluators')
+
+        response = self.client.post(f'/api/projects/projects/{self.first.pk}/duplicate/', {}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_import_skips_respondents_over_the_limit(self):
+        Criteria.objects.bulk_create([
+            Criteria(project=self.first, name=name, type='criteria', order=i)
+            for i, name in enumerate(['Cost', 'Quality'])
+        ])
+        rows = ['respondent,criteria_a,criteria_b,value']
+        rows += [f'{user.email},Cost,Quality,3' for user in self.evaluators]
+        rows += ['new.person@example.com,Cost,Quality,5']
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False)
+        handle.write('\n'.join(rows))
+        handle.close()
+        self.addCleanup(os.unlink, handle.name)
+        upload = FileUpload.objects.create(
+            original_name='comparisons.csv', file_path=handle.name, file_size=1,
+            mime_type='text/csv', uploaded_by=self.owner, upload_type='comparison_import',
+        )
+
+        summary = ComparisonImporter(upload, self.first, create_respondents=True).run()
+        self.assertEqual(summary['evaluations_created'], 2)
+        self.assertEqual(summary['error_count'], 2)
+        self.assertIn('Evaluator limit', summary['errors'][0]['error'])
+        self.assertEqual(Evaluation.objects.filter(project=self.first).count(), 2)
+        # 한도를 넘은 응답자의 플레이스홀더 사용자는 만들지 않음
+        self.assertFalse(factories.User.objects.filter(email='new.person@example.com').exists())
@@ -0,0 +1,84 @@
+"""
+Monthly revenue rollup kept by payment signals and admin actions
+
+    python manage.py test tests.subscriptions --settings=tests.settings
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from apps.subscriptions.models import MonthlyRevenue, PaymentRecord
+from apps.subscriptions.stats import (
+    SUBSCRIPTION_STATS_CACHE_KEY, compute_subscription_stats, month_start, rebuild_revenue_rollup,
+)
+from tests.perf import factories
+
+
+@override_settings(SUBSCRIPTION_REVENUE_ROLLUP=True)
+class RevenueRollupTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.subscription = factories.create_subscription(factories.create_user('payer'))
+        self.month = month_start(timezone.now()).date()
+        self.admin = Client()
+        self.admin.force_login(factories.create_user('admin', is_staff=True, is_superuser=True))
+
+    def payment(self, amount, status='completed'):
+        return PaymentRecord.objects.create(
+            subscription=self.subscription, payment_type='subscription', amount=Decimal(amount),
+            status=status, paid_at=timezone.now() if status == 'completed' else None,
+        )
+
+    def rollup(self):
+        row = MonthlyRevenue.objects.filter(month=self.month).first()
+        return (row.revenue, row.payment_count) if row else (Decimal('0'), 0)
+
+    def admin_action(self, action, *payments):
+        return self.admin.post('/admin/subscriptions/paymentrecord/', {
+            'action': action, '_selected_action': [str(payment.pk) for payment in payments],
+        })
+
+    def test_signals_follow_completion_refund_and_delete(self):
+        self.payment('1000')
+        pending = self.payment('500', status='pending')
+        self.assertEqual(self.rollup(), (Decimal('1000'), 1))
+
+        pending.status, pending.paid_at = 'completed', timezone.now()
+        pending.save()
+        self.assertEqual(self.rollup(), (Decimal('1500'), 2))
+
+        pending.status = 'refunded'
+        pending.save()
+        self.assertEqual(self.rollup(), (Decimal('1000'), 1))
+
+        PaymentRecord.objects.get(status='completed').delete()
+        self.assertEqual(self.rollup(), (Decimal('0'), 0))
+
+    def test_admin_actions_update_the_rollup(self):
+        first, second = self.payment('300', status='pending'), self.payment('700', status='pending')
+        cache.set(SUBSCRIPTION_STATS_CACHE_KEY, {'stale': True})
+
+        self.assertEqual(self.admin_action('mark_as_completed', first, second).status_code, 302)
+        self.assertEqual(self.rollup(), (Decimal('1000'), 2))
+        self.assertIsNone(cache.get(SUBSCRIPTION_STATS_CACHE_KEY))
+
+        self.admin_action('process_refund', first)
+        self.assertEqual(self.rollup(), (Decimal('700'), 1))
+        self.assertEqual(PaymentRecord.objects.get(pk=first.pk).status, 'refunded')
+
+    def test_rollup_matches_live_aggregation(self):
+        self.payment('1000')
+        self.payment('250')
+        self.payment('99', status='failed')
+        from_rollup = compute_subscription_stats()
+        with override_settings(SUBSCRIPTION_REVENUE_ROLLUP=False):
+            live = compute_subscription_stats()
+        self.assertEqual(from_rollup['revenue_by_month'], live['revenue_by_month'])
+        self.assertEqual(from_rollup['total_revenue'], live['total_revenue'])
+
+        MonthlyRevenue.objects.all().delete()
+        self.assertEqual(rebuild_revenue_rollup(), 1)
+        self.assertEqual(self.rollup(), (Decimal('1250'), 2))
@@ -0,0 +1,3 @@
+"""
+Workshop app behaviour (consensus clustering)
+"""
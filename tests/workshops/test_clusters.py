@@ -0,0 +1,59 @@
+"""
+Evaluator clustering of a workshop's consensus result
+
+    python manage.py test tests.workshops --settings=tests.settings
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.workshops.models import GroupConsensusResult, WorkshopSession
+from tests.perf import factories
+
+
+class ClustersTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        facilitator = factories.create_user('facilitator')
+        workshop = WorkshopSession.objects.create(
+            project=factories.create_project(facilitator), title='Workshop', description='',
+            facilitator=facilitator, workshop_code='WS0001', scheduled_at=timezone.now(),
+        )
+        weights = {
+            f'p{i}': {'cost': 0.7 - i * 0.01, 'quality': 0.3 + i * 0.01} if i < 4
+            else {'cost': 0.2 + i * 0.01, 'quality': 0.8 - i * 0.01}
+            for i in range(8)
+        }
+        self.result = GroupConsensusResult.objects.create(
+            workshop=workshop, aggregated_weights={}, individual_weights=weights,
+            mean_weights={}, std_deviation={}, confidence_intervals={},
+        )
+        self.url = f'/api/workshops/consensus/{self.result.pk}/clusters/'
+        self.client = APIClient()
+        self.client.force_authenticate(facilitator)
+
+    def test_get_does_not_persist(self):
+        response = self.client.get(self.url, {'max_clusters': 3})
+        self.assertEqual(response.status_code, 200)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.consensus_clusters, {})
+
+    def test_post_persists(self):
+        response = self.client.post(self.url, {'max_clusters': 3}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.consensus_clusters, response.data)
+
+    def test_invalid_max_clusters(self):
+        for value in ('abc', '0', '-2', '21', '2.5'):
+            response = self.client.get(self.url, {'max_clusters': value})
+            self.assertEqual(response.status_code, 400, value)
+        self.assertEqual(self.client.post(self.url, {'max_clusters': None}, format='json').status_code, 400)
+
+    def test_malformed_individual_weights(self):
+        for weights in ({'p0': [0.5, 0.5], 'p1': [1.0]}, {'p0': {'cost': 'high'}}, [[0.5, 0.5], 'x'], {'p0': 0.5}):
+            GroupConsensusResult.objects.filter(pk=self.result.pk).update(individual_weights=weights)
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 400, weights)